@@ -6,11 +6,22 @@ It loads settings from environment variables and provides typed access.
 """
 
 import os
+from functools import cached_property, lru_cache
 from pathlib import Path
-from typing import Optional
-from pydantic import Field
+from pydantic import Field, model_validator
+from dotenv import load_dotenv
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+ENV_FILE = ".env"
+
+# Shared by every settings section. The .env file is loaded into os.environ
+# once when Config is built, so sections only read from the environment
+# instead of each re-opening and re-parsing the file. Validation errors
+# leave out the values, which may be secrets.
+SETTINGS_CONFIG = SettingsConfigDict(extra="ignore", hide_input_in_errors=True)
+
+SECTIONS = ("database", "llm", "services", "processing", "search", "app")
+
 
 class DatabaseSettings(BaseSettings):
     """Database configuration"""
@@ -18,18 +29,19 @@ class DatabaseSettings(BaseSettings):
     pool_size: int = Field(default=10, alias="DB_POOL_SIZE")
     max_overflow: int = Field(default=20, alias="DB_MAX_OVERFLOW")
     
-    model_config = SettingsConfigDict(env_file=".env", extra="ignore")
+    model_config = SETTINGS_CONFIG
 
 
 class LLMSettings(BaseSettings):
     """LLM service configuration"""
-    api_base: str = Field(alias="LLM_API_BASE")
+    # Same defaults as enrichment_service.dspy_setup.configure_dspy_from_env
+    api_base: str = Field(default="http://localhost:1234/v1", alias="LLM_API_BASE")
     api_key: str = Field(default="dummy_key", alias="LLM_API_KEY")
-    model_name: str = Field(alias="LLM_MODEL_NAME")
+    model_name: str = Field(default="llama-3.1-8b-instruct", alias="LLM_MODEL_NAME")
     timeout: int = Field(default=60, alias="LLM_TIMEOUT")
     max_retries: int = Field(default=3, alias="MAX_RETRIES")
     
-    model_config = SettingsConfigDict(env_file=".env", extra="ignore")
+    model_config = SETTINGS_CONFIG
 
 
 class ServiceSettings(BaseSettings):
@@ -38,7 +50,7 @@ class ServiceSettings(BaseSettings):
     enrichment_url: str = Field(alias="ENRICHMENT_SERVICE_URL")
     web_ui_url: str = Field(alias="WEB_UI_URL")
     
-    model_config = SettingsConfigDict(env_file=".env", extra="ignore")
+    model_config = SETTINGS_CONFIG
 
 
 class ProcessingSettings(BaseSettings):
@@ -48,7 +60,7 @@ class ProcessingSettings(BaseSettings):
     fetch_timeout: int = Field(default=30, alias="FETCH_TIMEOUT")
     retry_delay: int = Field(default=5, alias="RETRY_DELAY")
     
-    model_config = SettingsConfigDict(env_file=".env", extra="ignore")
+    model_config = SETTINGS_CONFIG
 
 
 class SearchSettings(BaseSettings):
@@ -60,7 +72,7 @@ class SearchSettings(BaseSettings):
     embedding_dimension: int = Field(default=384, alias="EMBEDDING_DIMENSION")
     similarity_threshold: float = Field(default=0.3, alias="SIMILARITY_THRESHOLD")
     
-    model_config = SettingsConfigDict(env_file=".env", extra="ignore")
+    model_config = SETTINGS_CONFIG
 
 
 class AppSettings(BaseSettings):
@@ -72,20 +84,94 @@ class AppSettings(BaseSettings):
     log_level: str = Field(default="INFO", alias="LOG_LEVEL")
     log_format: str = Field(default="text", alias="LOG_FORMAT")
     
-    model_config = SettingsConfigDict(env_file=".env", extra="ignore")
+    model_config = SETTINGS_CONFIG
+
+
+class Settings(BaseSettings):
+    """
+    All settings sections validated together in a single pass.
+
+    Sections read the usual flat variables (DATABASE_URL, LLM_API_BASE, ...)
+    and can also be set with nested names such as DATABASE__URL. Missing or
+    invalid values across every section are reported in one error.
+    """
+    database: DatabaseSettings
+    llm: LLMSettings
+    services: ServiceSettings
+    processing: ProcessingSettings
+    search: SearchSettings
+    app: AppSettings
+
+    model_config = SettingsConfigDict(
+        env_nested_delimiter="__", extra="ignore", hide_input_in_errors=True
+    )
+
+    @model_validator(mode="before")
+    @classmethod
+    def _fill_sections_from_env(cls, data):
+        # Each section gets only its own variables, matched by alias and
+        # case-insensitively like a standalone section would read them.
+        # Nested DATABASE__URL style values (keyed by field name) win over
+        # the flat variables.
+        env = {name.upper(): value for name, value in os.environ.items()}
+        for section in SECTIONS:
+            fields = cls.model_fields[section].annotation.model_fields
+            values = {
+                field.alias: env[field.alias.upper()]
+                for field in fields.values()
+                if field.alias.upper() in env
+            }
+            nested = data.get(section)
+            if isinstance(nested, dict):
+                values.update(
+                    (fields[name].alias, value)
+                    for name, value in nested.items()
+                    if name in fields
+                )
+            data[section] = values
+        return data
 
 
 class Config:
-    """Main configuration class that combines all settings"""
-    
-    def __init__(self):
-        self.database = DatabaseSettings()
-        self.llm = LLMSettings()
-        self.services = ServiceSettings()
-        self.processing = ProcessingSettings()
-        self.search = SearchSettings()
-        self.app = AppSettings()
-    
+    """
+    Main configuration class that combines all settings.
+
+    Settings are validated on first access to any section, in one pass
+    over the environment via the combined Settings model.
+    """
+
+    def __init__(self, env_file: str = ENV_FILE):
+        # Read .env once; existing environment variables take precedence
+        load_dotenv(env_file)
+
+    @cached_property
+    def settings(self) -> Settings:
+        return Settings()
+
+    @property
+    def database(self) -> DatabaseSettings:
+        return self.settings.database
+
+    @property
+    def llm(self) -> LLMSettings:
+        return self.settings.llm
+
+    @property
+    def services(self) -> ServiceSettings:
+        return self.settings.services
+
+    @property
+    def processing(self) -> ProcessingSettings:
+        return self.settings.processing
+
+    @property
+    def search(self) -> SearchSettings:
+        return self.settings.search
+
+    @property
+    def app(self) -> AppSettings:
+        return self.settings.app
+
     @property
     def is_development(self) -> bool:
         return self.app.env == "development"
@@ -95,20 +181,21 @@ class Config:
         return self.app.env == "production"
 
 
-# Global config instance
-config = Config()
-
-
 # Helper function to get config
+@lru_cache(maxsize=1)
 def get_config() -> Config:
-    """Get the global configuration instance"""
-    return config
+    """
+    Get the global configuration instance.
+
+    The instance is built lazily on first call and cached, so importing this
+    module does not parse .env or validate settings.
+    """
+    return Config()
 
 
 # Helper function to load environment from file
-def load_env(env_file: str = ".env") -> None:
+def load_env(env_file: str = ENV_FILE) -> None:
     """Load environment variables from file"""
-    from dotenv import load_dotenv
     env_path = Path(env_file)
     if env_path.exists():
         load_dotenv(env_path)
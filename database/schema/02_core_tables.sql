@@ -30,7 +30,20 @@ CREATE TABLE tab_item (
   -- Standard fields
   created_at     timestamptz NOT NULL DEFAULT now(),
   updated_at     timestamptz NOT NULL DEFAULT now(),
-  deleted_at     timestamptz
+  deleted_at     timestamptz,
+
+  -- tab_enrichment.summary, copied by the sync_tab_search_summary trigger
+  -- so search_tsv can cover it
+  search_summary text,
+
+  -- Full-text search document for the web UI search box: title, URL and
+  -- summary in one tsvector, so a query's words can match across them
+  search_tsv     tsvector GENERATED ALWAYS AS (
+    to_tsvector(
+      'english',
+      coalesce(page_title, '') || ' ' || url || ' ' || coalesce(search_summary, '')
+    )
+  ) STORED
 );
 
 -- Unique constraint on user_id + url (only active records)
@@ -62,6 +75,17 @@ CREATE INDEX idx_tab_parsed_site_kind ON tab_parsed(site_kind);
 
 -- ============================================================================
 
+-- Text elements of a JSON array, or an empty array for anything else.
+-- IMMUTABLE so it can back generated columns.
+CREATE OR REPLACE FUNCTION jsonb_text_array(value jsonb)
+RETURNS text[] AS $$
+  SELECT CASE
+    WHEN jsonb_typeof(value) = 'array'
+      THEN ARRAY(SELECT jsonb_array_elements_text(value))
+    ELSE '{}'::text[]
+  END
+$$ LANGUAGE sql IMMUTABLE;
+
 -- LLM-generated enrichments (current version)
 CREATE TABLE tab_enrichment (
   tab_id         bigint PRIMARY KEY REFERENCES tab_item(id) ON DELETE CASCADE,
@@ -74,7 +98,15 @@ CREATE TABLE tab_enrichment (
   raw_meta       jsonb NOT NULL DEFAULT '{}',
   model_name     text,
   created_at     timestamptz NOT NULL DEFAULT now(),
-  updated_at     timestamptz NOT NULL DEFAULT now()
+  updated_at     timestamptz NOT NULL DEFAULT now(),
+
+  -- raw_meta's tags/projects arrays as columns, so readers skip JSON decoding.
+  -- Existing databases: create jsonb_text_array above, then
+  --   ALTER TABLE tab_enrichment ADD COLUMN tags text[]
+  --     GENERATED ALWAYS AS (jsonb_text_array(raw_meta->'tags')) STORED;
+  -- and the same for projects.
+  tags           text[] GENERATED ALWAYS AS (jsonb_text_array(raw_meta->'tags')) STORED,
+  projects       text[] GENERATED ALWAYS AS (jsonb_text_array(raw_meta->'projects')) STORED
 );
 
 -- Index for filtering by content type
@@ -144,10 +176,14 @@ CREATE TABLE tab_embedding (
   updated_at  timestamptz NOT NULL DEFAULT now()
 );
 
--- Vector similarity index (requires pgvector extension)
+-- Vector similarity index (requires pgvector extension). HNSW rather than
+-- IVFFlat: it needs no training data, so it works on a table that starts
+-- empty, and it keeps recall as rows are added. Semantic search raises
+-- hnsw.ef_search (default 40) to its result limit for each query, and
+-- turns on hnsw.iterative_scan on pgvector 0.8+.
 CREATE INDEX idx_tab_embedding_vector ON tab_embedding
-  USING ivfflat (embedding vector_cosine_ops)
-  WITH (lists = 100);
+  USING hnsw (embedding vector_cosine_ops)
+  WITH (m = 16, ef_construction = 64);
 
 -- ============================================================================
 
@@ -205,3 +241,22 @@ CREATE TRIGGER update_tab_embedding_updated_at
     BEFORE UPDATE ON tab_embedding
     FOR EACH ROW
     EXECUTE FUNCTION update_updated_at_column();
+
+-- Keep tab_item.search_summary in step with the enrichment summary
+CREATE OR REPLACE FUNCTION sync_tab_search_summary()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        UPDATE tab_item SET search_summary = NULL WHERE id = OLD.tab_id;
+        RETURN OLD;
+    END IF;
+    UPDATE tab_item SET search_summary = NEW.summary
+    WHERE id = NEW.tab_id AND search_summary IS DISTINCT FROM NEW.summary;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER sync_tab_enrichment_search_summary
+    AFTER INSERT OR UPDATE OF summary OR DELETE ON tab_enrichment
+    FOR EACH ROW
+    EXECUTE FUNCTION sync_tab_search_summary();
@@ -32,11 +32,48 @@ CREATE INDEX idx_tab_item_url_trgm
 CREATE INDEX idx_tab_enrichment_summary_trgm
   ON tab_enrichment USING gin (summary gin_trgm_ops);
 
+-- Index on the projects array (as text) for the web UI's project filter,
+-- which matches raw_meta->>'projects' ILIKE '%name%'
+CREATE INDEX idx_tab_enrichment_projects_trgm
+  ON tab_enrichment USING gin ((raw_meta->>'projects') gin_trgm_ops);
+
 -- Index on tab_parsed.text_full for fuzzy search (optional - can be large)
 -- Uncomment if you want to search full text
 -- CREATE INDEX idx_tab_parsed_text_trgm
 --   ON tab_parsed USING gin (text_full gin_trgm_ops);
 
+-- ============================================================================
+-- Full-Text Search Indexes
+-- ============================================================================
+
+-- The web UI search box matches search_tsquery() against tab_item.search_tsv
+-- (see 02_core_tables.sql), which covers the title, URL and enrichment
+-- summary. To add it to an existing database, create
+-- sync_tab_search_summary() and its trigger from 02_core_tables.sql, then:
+--   ALTER TABLE tab_enrichment DROP COLUMN IF EXISTS search_tsv;
+--   ALTER TABLE tab_item DROP COLUMN IF EXISTS search_tsv;
+--   ALTER TABLE tab_item ADD COLUMN search_summary text;
+--   UPDATE tab_item t SET search_summary = e.summary
+--     FROM tab_enrichment e WHERE e.tab_id = t.id;
+--   ALTER TABLE tab_item ADD COLUMN search_tsv tsvector GENERATED ALWAYS AS
+--     (to_tsvector('english', coalesce(page_title, '') || ' ' || url
+--       || ' ' || coalesce(search_summary, ''))) STORED;
+CREATE INDEX idx_tab_item_search_tsv
+  ON tab_item USING gin (search_tsv)
+  WHERE deleted_at IS NULL;
+
+-- websearch_to_tsquery() with every term matched as a prefix, so partial
+-- words typed into the search box ("pyth") still find "python"
+CREATE OR REPLACE FUNCTION search_tsquery(query text)
+RETURNS tsquery AS $$
+  SELECT regexp_replace(
+    websearch_to_tsquery('english', query)::text,
+    '''((?:[^'']|'''')*)''',
+    '''\1'':*',
+    'g'
+  )::tsquery
+$$ LANGUAGE sql STABLE;
+
 -- ============================================================================
 -- Additional Performance Indexes
 -- ============================================================================
@@ -49,6 +86,22 @@ CREATE INDEX idx_tab_item_user_status_processed
   ON tab_item(user_id, status, is_processed) 
   WHERE deleted_at IS NULL;
 
+-- Index for the web UI tab list: WHERE user_id = ? ORDER BY created_at DESC, id DESC.
+-- Rows come out already ordered (no sort) and the status/is_processed filters
+-- are checked in the index. Titles and URLs are left out of INCLUDE because
+-- btree entries are capped at ~2.7kB and a long page title would fail the insert.
+-- On an existing database, create it with CREATE INDEX CONCURRENTLY and then
+-- run ANALYZE tab_item so the planner picks it up.
+CREATE INDEX idx_tab_item_user_created
+  ON tab_item(user_id, created_at DESC, id DESC)
+  INCLUDE (status, is_processed)
+  WHERE deleted_at IS NULL;
+
+-- Covering index so the tab list's join to tab_parsed is an index-only scan
+-- (run VACUUM ANALYZE tab_parsed after creating it to set the visibility map)
+CREATE INDEX idx_tab_parsed_tab_covering
+  ON tab_parsed(tab_id) INCLUDE (site_kind, word_count, video_seconds);
+
 -- Index for tag-based filtering
 CREATE INDEX idx_tag_kind ON tag(kind) WHERE deleted_at IS NULL;
 
@@ -147,6 +200,44 @@ JOIN tab_enrichment te ON ti.id = te.tab_id
 WHERE ti.deleted_at IS NULL
 GROUP BY ti.user_id, te.content_type;
 
+-- Per-user tab counts for the web UI stats page. Refreshed every few minutes
+-- by the web UI (STATS_REFRESH_SECONDS) and after each ingest run, so /stats
+-- reads a handful of precomputed rows instead of grouping every tab. The
+-- unique indexes let REFRESH MATERIALIZED VIEW CONCURRENTLY run without
+-- blocking readers.
+CREATE MATERIALIZED VIEW mv_tab_status_counts AS
+SELECT user_id, status, COUNT(*) AS count
+FROM tab_item
+WHERE deleted_at IS NULL
+GROUP BY user_id, status;
+
+CREATE UNIQUE INDEX idx_mv_tab_status_counts
+  ON mv_tab_status_counts(user_id, status);
+
+CREATE MATERIALIZED VIEW mv_tab_content_type_counts AS
+SELECT ti.user_id, te.content_type, COUNT(*) AS count
+FROM tab_item ti
+JOIN tab_enrichment te ON ti.id = te.tab_id
+WHERE ti.deleted_at IS NULL AND te.content_type IS NOT NULL
+GROUP BY ti.user_id, te.content_type;
+
+CREATE UNIQUE INDEX idx_mv_tab_content_type_counts
+  ON mv_tab_content_type_counts(user_id, content_type);
+
+-- Refresh the stats views. Returns false without waiting if another session
+-- is already refreshing. With pg_cron installed it can also be scheduled:
+--   SELECT cron.schedule('*/5 * * * *', 'SELECT refresh_tab_stats()');
+CREATE OR REPLACE FUNCTION refresh_tab_stats() RETURNS boolean AS $$
+BEGIN
+  IF NOT pg_try_advisory_xact_lock(hashtext('refresh_tab_stats')) THEN
+    RETURN false;
+  END IF;
+  REFRESH MATERIALIZED VIEW CONCURRENTLY mv_tab_status_counts;
+  REFRESH MATERIALIZED VIEW CONCURRENTLY mv_tab_content_type_counts;
+  RETURN true;
+END;
+$$ LANGUAGE plpgsql;
+
 -- View for error tracking
 CREATE OR REPLACE VIEW v_error_summary AS
 SELECT 
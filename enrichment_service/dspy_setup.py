@@ -6,13 +6,38 @@ Sets up DSPy with OpenAI-compatible API and defines the enrichment signature.
 
 import logging
 import os
+import time
+from functools import lru_cache
 from typing import Literal, Optional
 
 import dspy
+import httpx
+import tiktoken
 from pydantic import BaseModel, Field
 
 logger = logging.getLogger(__name__)
 
+# Completion budget passed to the LM
+LLM_MAX_TOKENS = 1024
+
+# Token budget for page text in the prompt, leaving room for the
+# instructions, other fields and the LLM_MAX_TOKENS completion
+MAX_TEXT_TOKENS = 1500
+
+# Shared tokenizer used to truncate text; encoding is thread-safe
+_encoding = tiktoken.get_encoding("cl100k_base")
+
+# How long a connection check result is reused before probing again
+LLM_CHECK_TTL_SECONDS = 10.0
+LLM_CHECK_TIMEOUT_SECONDS = 2.0
+
+# Endpoint recorded by configure_dspy, used for connection checks
+_llm_api_base: Optional[str] = None
+_llm_api_key: Optional[str] = None
+
+# Last connection check as (monotonic timestamp, result)
+_llm_check: Optional[tuple[float, bool]] = None
+
 
 # Project categories that the LLM should classify into
 PROJECT_CATEGORIES = [
@@ -74,12 +99,29 @@ class EnrichTabSignature(dspy.Signature):
     )
 
 
+# Built once at import so the signature's output schema is only
+# reflected over a single time per process
+_PREDICTOR = dspy.Predict(EnrichTabSignature)
+
+
+def truncate_text(text: str) -> str:
+    """
+    Truncate text to MAX_TEXT_TOKENS tokens, so the prompt stays within
+    budget regardless of script or how code-heavy the text is.
+    """
+    if text:
+        token_ids = _encoding.encode(text, disallowed_special=())
+        if len(token_ids) > MAX_TEXT_TOKENS:
+            return _encoding.decode(token_ids[:MAX_TEXT_TOKENS]) + "... [truncated]"
+    return text
+
+
 class TabEnricher(dspy.Module):
     """DSPy module for enriching tab content."""
 
     def __init__(self):
         super().__init__()
-        self.enrich = dspy.Predict(EnrichTabSignature)
+        self.enrich = _PREDICTOR
 
     def forward(
         self,
@@ -104,10 +146,7 @@ class TabEnricher(dspy.Module):
         Returns:
             EnrichmentOutput with structured metadata
         """
-        # Truncate text if too long (keep under token limits)
-        max_text_chars = 4000
-        if len(text) > max_text_chars:
-            text = text[:max_text_chars] + "... [truncated]"
+        text = truncate_text(text)
 
         result = self.enrich(
             url=url,
@@ -138,6 +177,8 @@ def configure_dspy(
         timeout: Request timeout in seconds
         temperature: Sampling temperature (0.0-1.0, higher = more creative)
     """
+    global _llm_api_base, _llm_api_key
+
     logger.info(f"Configuring DSPy with model: {model_name} at {api_base}")
 
     lm = dspy.LM(
@@ -145,11 +186,13 @@ def configure_dspy(
         api_base=api_base,
         api_key=api_key,
         temperature=temperature,
-        max_tokens=1024,
+        max_tokens=LLM_MAX_TOKENS,
         timeout=timeout,
     )
 
     dspy.configure(lm=lm)
+    _llm_api_base = api_base
+    _llm_api_key = api_key
     logger.info("DSPy configured successfully")
 
 
@@ -177,8 +220,14 @@ def configure_dspy_from_env() -> str:
     return model_name
 
 
+@lru_cache(maxsize=1)
 def get_enricher() -> TabEnricher:
-    """Get a configured TabEnricher instance."""
+    """
+    Get the shared TabEnricher instance.
+
+    The module is built once on first call and reused by every request
+    and health check afterwards.
+    """
     return TabEnricher()
 
 
@@ -186,25 +235,45 @@ async def test_llm_connection() -> bool:
     """
     Test if the LLM is reachable and responding.
 
-    Performs a lightweight check by verifying DSPy configuration
-    rather than making an actual LLM call.
+    Performs a lightweight GET {api_base}/models against the configured
+    backend rather than making an actual LLM call. The result is cached
+    for LLM_CHECK_TTL_SECONDS so frequent health probes don't hammer
+    the backend.
 
     Returns:
         True if connection successful, False otherwise
     """
+    global _llm_check
+
+    now = time.monotonic()
+    if _llm_check is not None and now - _llm_check[0] < LLM_CHECK_TTL_SECONDS:
+        return _llm_check[1]
+
+    result = await _ping_llm()
+    _llm_check = (now, result)
+    return result
+
+
+async def _ping_llm() -> bool:
+    """Check DSPy configuration and that the LLM backend answers over HTTP."""
     try:
         # Check if DSPy is configured
-        if dspy.settings.lm is None:
+        if dspy.settings.lm is None or _llm_api_base is None:
             logger.warning("DSPy LM not configured")
             return False
-        
-        # Verify we can create an enricher instance
+
+        # Verify the shared enricher instance is available
         enricher = get_enricher()
         if enricher is None or enricher.enrich is None:
-            logger.warning("Failed to create enricher instance")
+            logger.warning("Enricher instance not available")
             return False
-        
-        return True
+
+        async with httpx.AsyncClient(timeout=LLM_CHECK_TIMEOUT_SECONDS) as client:
+            response = await client.get(
+                f"{_llm_api_base.rstrip('/')}/models",
+                headers={"Authorization": f"Bearer {_llm_api_key}"},
+            )
+        return response.status_code < 500
     except Exception as e:
         logger.warning(f"LLM connection test failed: {e}")
         return False
@@ -5,14 +5,26 @@ FastAPI service for LLM-based content enrichment using DSPy.
 Generates summaries, classifications, and metadata for tabs.
 """
 
+import asyncio
+import hashlib
 import logging
 import os
+import threading
 from contextlib import asynccontextmanager
 from typing import Optional
 
+from cachetools import TTLCache
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
+from fastapi.responses import ORJSONResponse
+from pydantic import ValidationError
+from tenacity import (
+    Retrying,
+    before_sleep_log,
+    retry_if_exception_type,
+    stop_after_attempt,
+    wait_exponential,
+)
 
 # Phoenix observability imports
 from openinference.instrumentation.dspy import DSPyInstrumentor
@@ -22,6 +34,8 @@ from opentelemetry.sdk import trace as trace_sdk
 from opentelemetry.sdk.trace.export import SimpleSpanProcessor
 from opentelemetry.sdk.resources import Resource
 
+from config import LLMSettings, ProcessingSettings
+
 from . import __version__
 from .models import (
     EnrichmentRequest,
@@ -34,6 +48,7 @@ from .dspy_setup import (
     configure_dspy_from_env,
     get_enricher,
     test_llm_connection,
+    truncate_text,
     TabEnricher,
 )
 
@@ -47,6 +62,14 @@ logger = logging.getLogger(__name__)
 # Global state
 _model_name: str = ""
 _enricher: Optional[TabEnricher] = None
+_max_retries: int = 3
+_max_concurrent: int = 2
+
+# Enrichments keyed by request content hash, so re-ingested tabs skip the LLM
+ENRICH_CACHE_MAXSIZE = 10_000
+ENRICH_CACHE_TTL_SECONDS = 86400
+_enrich_cache: TTLCache = TTLCache(maxsize=ENRICH_CACHE_MAXSIZE, ttl=ENRICH_CACHE_TTL_SECONDS)
+_enrich_cache_lock = threading.Lock()
 
 
 def setup_phoenix_tracing():
@@ -98,7 +121,7 @@ def setup_phoenix_tracing():
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan handler."""
-    global _model_name, _enricher
+    global _model_name, _enricher, _max_retries, _max_concurrent
 
     # Configure Phoenix tracing
     setup_phoenix_tracing()
@@ -108,6 +131,8 @@ async def lifespan(app: FastAPI):
     try:
         _model_name = configure_dspy_from_env()
         _enricher = get_enricher()
+        _max_retries = get_max_retries()
+        _max_concurrent = get_max_concurrent()
         logger.info(f"Enrichment service ready with model: {_model_name}")
     except Exception as e:
         logger.error(f"Failed to configure DSPy: {e}")
@@ -123,6 +148,7 @@ app = FastAPI(
     description="LLM-based content enrichment for tab metadata generation",
     version=__version__,
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # Add CORS middleware
@@ -136,8 +162,13 @@ app.add_middleware(
 
 
 def get_max_retries() -> int:
-    """Get max retries from environment."""
-    return int(os.environ.get("MAX_RETRIES", "3"))
+    """Get max retries from the LLM settings (read once at startup)."""
+    return LLMSettings().max_retries
+
+
+def get_max_concurrent() -> int:
+    """Get max concurrent enrichments per batch from the processing settings."""
+    return max(1, ProcessingSettings().max_concurrent)
 
 
 class EnrichmentError(Exception):
@@ -147,9 +178,55 @@ class EnrichmentError(Exception):
         self.raw_output = raw_output
 
 
+# Timeouts and malformed LLM output are worth another attempt; anything
+# else (auth failures, bad configuration, bugs) fails straight away
+RETRYABLE_ERRORS = (TimeoutError, ValidationError)
+
+
+def _do_enrich(request: EnrichmentRequest) -> Enrichment:
+    """Run a single enrichment attempt; retried by enrich_with_retry."""
+    result = _enricher(
+        url=request.url,
+        title=request.title or "Untitled",
+        site_kind=request.site_kind,
+        text=request.text or "",
+        word_count=request.word_count or 0,
+        video_seconds=request.video_seconds or 0,
+    )
+
+    # Convert DSPy output to our Pydantic model
+    return Enrichment(
+        summary=result.summary,
+        content_type=result.content_type,
+        tags=result.tags[:10] if result.tags else [],  # Limit tags
+        projects=result.projects[:5] if result.projects else [],  # Limit projects
+        est_read_min=result.est_read_min,
+        priority=result.priority,
+    )
+
+
+def _cache_key(request: EnrichmentRequest) -> str:
+    """
+    Hash every field passed to the enricher, with the text truncated the
+    same way TabEnricher truncates it.
+    """
+    content = repr((
+        request.url,
+        request.title or "Untitled",
+        request.site_kind,
+        truncate_text(request.text or ""),
+        request.word_count or 0,
+        request.video_seconds or 0,
+    ))
+    return hashlib.blake2b(content.encode(), digest_size=16).hexdigest()
+
+
 def enrich_with_retry(request: EnrichmentRequest) -> Enrichment:
     """
-    Attempt enrichment with retries on validation failure.
+    Attempt enrichment with exponential backoff on failure.
+
+    Results are cached by content hash, so identical requests only
+    hit the LLM once per cache TTL.
 
     Args:
         request: The enrichment request
@@ -160,47 +237,38 @@ def enrich_with_retry(request: EnrichmentRequest) -> Enrichment:
     Raises:
         EnrichmentError: If all retries fail
     """
-    max_retries = get_max_retries()
-    last_error = None
-    raw_output = None
+    key = _cache_key(request)
+    with _enrich_cache_lock:
+        cached = _enrich_cache.get(key)
+    if cached is not None:
+        logger.info(f"Using cached enrichment for {request.url}")
+        return cached
+
+    max_retries = _max_retries
+    logger.info(f"Enriching {request.url} (up to {max_retries} attempts)")
+
+    retrying = Retrying(
+        stop=stop_after_attempt(max_retries),
+        wait=wait_exponential(multiplier=0.5, max=8),
+        retry=retry_if_exception_type(RETRYABLE_ERRORS),
+        before_sleep=before_sleep_log(logger, logging.WARNING),
+        reraise=True,
+    )
+    try:
+        enrichment = retrying(_do_enrich, request)
+    except Exception as e:
+        attempts = retrying.statistics.get("attempt_number", 1)
+        raise EnrichmentError(
+            f"Enrichment failed after {attempts} attempt(s): {e}",
+            # Capture raw output if the final error carries it
+            raw_output=getattr(e, "raw_output", None),
+        ) from e
 
-    for attempt in range(1, max_retries + 1):
-        try:
-            logger.info(f"Enrichment attempt {attempt}/{max_retries} for {request.url}")
+    with _enrich_cache_lock:
+        _enrich_cache[key] = enrichment
 
-            result = _enricher(
-                url=request.url,
-                title=request.title or "Untitled",
-                site_kind=request.site_kind,
-                text=request.text or "",
-                word_count=request.word_count or 0,
-                video_seconds=request.video_seconds or 0,
-            )
-
-            # Convert DSPy output to our Pydantic model
-            enrichment = Enrichment(
-                summary=result.summary,
-                content_type=result.content_type,
-                tags=result.tags[:10] if result.tags else [],  # Limit tags
-                projects=result.projects[:5] if result.projects else [],  # Limit projects
-                est_read_min=result.est_read_min,
-                priority=result.priority,
-            )
-
-            logger.info(f"Successfully enriched {request.url} on attempt {attempt}")
-            return enrichment
-
-        except Exception as e:
-            last_error = str(e)
-            # Try to capture raw output if available
-            if hasattr(e, 'raw_output'):
-                raw_output = e.raw_output
-            logger.warning(f"Enrichment attempt {attempt} failed: {e}")
-
-    raise EnrichmentError(
-        f"Enrichment failed after {max_retries} attempts: {last_error}",
-        raw_output=raw_output,
-    )
+    logger.info(f"Successfully enriched {request.url}")
+    return enrichment
 
 
 @app.get("/health", response_model=HealthResponse, tags=["Health"])
@@ -219,6 +287,7 @@ async def health_check():
 @app.post(
     "/enrich_tab",
     response_model=EnrichmentResponse,
+    response_model_exclude_none=True,
     responses={
         400: {"model": EnrichmentErrorResponse, "description": "Invalid request"},
         500: {"model": EnrichmentErrorResponse, "description": "Enrichment failed"},
@@ -237,7 +306,8 @@ async def enrich_tab(request: EnrichmentRequest):
     - Estimated read time: In minutes
     - Priority: high, medium, or low
 
-    Automatically retries on validation failures (up to 3 attempts).
+    Retries timeouts and validation failures with exponential backoff, up
+    to MAX_RETRIES attempts.
     """
     logger.info(f"Enrichment request for: {request.url}")
 
@@ -252,7 +322,8 @@ async def enrich_tab(request: EnrichmentRequest):
         )
 
     try:
-        enrichment = enrich_with_retry(request)
+        # LLM calls (and retry backoff) block, so run them off the event loop
+        enrichment = await asyncio.to_thread(enrich_with_retry, request)
 
         return EnrichmentResponse(
             url=request.url,
@@ -269,7 +340,7 @@ async def enrich_tab(request: EnrichmentRequest):
                 detail=str(e),
                 url=request.url,
                 raw_output=e.raw_output,
-                attempts=get_max_retries(),
+                attempts=_max_retries,
             ).model_dump(),
         )
 
@@ -287,31 +358,42 @@ async def enrich_tab(request: EnrichmentRequest):
 
 @app.post(
     "/enrich_batch",
-    response_model=list[EnrichmentResponse],
+    responses={200: {"model": list[EnrichmentResponse]}},
     tags=["Enrichment"],
 )
 async def enrich_batch(requests: list[EnrichmentRequest]):
     """
     Enrich multiple tabs in a single request.
 
-    Processes each tab sequentially. Failed enrichments are skipped
-    and not included in the response (check response length vs input).
+    Tabs are enriched concurrently, up to MAX_CONCURRENT_REQUESTS at a
+    time. Failed enrichments are skipped and not included in the response
+    (check response length vs input).
     """
-    results = []
+    semaphore = asyncio.Semaphore(_max_concurrent)
 
-    for request in requests:
-        try:
-            enrichment = enrich_with_retry(request)
-            results.append(EnrichmentResponse(
-                url=request.url,
-                enrichment=enrichment,
-                model_name=_model_name,
-            ))
-        except Exception as e:
-            logger.warning(f"Skipping failed enrichment for {request.url}: {e}")
+    async def enrich_one(request: EnrichmentRequest) -> Enrichment:
+        async with semaphore:
+            # LLM calls block, so run them off the event loop
+            return await asyncio.to_thread(enrich_with_retry, request)
+
+    outcomes = await asyncio.gather(
+        *(enrich_one(request) for request in requests),
+        return_exceptions=True,
+    )
+
+    results = []
+    for request, outcome in zip(requests, outcomes):
+        if isinstance(outcome, Exception):
+            logger.warning(f"Skipping failed enrichment for {request.url}: {outcome}")
             continue
+        results.append(EnrichmentResponse(
+            url=request.url,
+            enrichment=outcome,
+            model_name=_model_name,
+        ).model_dump(mode="json"))
 
-    return results
+    # Already validated models, so skip FastAPI's response_model pass
+    return ORJSONResponse(results)
 
 
 @app.get("/model", tags=["Info"])
@@ -319,7 +401,7 @@ async def get_model_info():
     """Get information about the configured LLM model."""
     return {
         "model_name": _model_name,
-        "max_retries": get_max_retries(),
+        "max_retries": _max_retries,
     }
 
 
@@ -9,7 +9,9 @@ Usage:
 """
 
 import os
+import queue
 import sys
+import threading
 from pathlib import Path
 
 import click
@@ -17,8 +19,8 @@ from rich.console import Console
 from rich.table import Table
 from rich.progress import Progress, SpinnerColumn, TextColumn
 
-from .firefox_parser import FirefoxParser
-from .db import IngestDB
+from .firefox_parser import BookmarkItem, FirefoxParser
+from .db import IngestDB, IngestResult
 
 console = Console()
 
@@ -33,6 +35,91 @@ def get_database_url() -> str:
     return url
 
 
+def ingest_streaming(
+    parser: FirefoxParser,
+    db: IngestDB,
+    user_id: str,
+    batch_size: int,
+) -> IngestResult:
+    """
+    Parse and ingest concurrently.
+
+    A background thread streams bookmarks from the parser into a bounded
+    queue while this thread writes them to the database batch by batch,
+    so parsing overlaps with database round trips. psycopg releases the
+    GIL while waiting on the server, so a thread is enough.
+    """
+    items: queue.Queue = queue.Queue(maxsize=2 * batch_size)
+    parse_errors: list[Exception] = []
+
+    def produce() -> None:
+        try:
+            for bookmark in parser.iter_bookmarks():
+                items.put(bookmark)
+        except Exception as e:
+            parse_errors.append(e)
+        finally:
+            items.put(None)  # Sentinel: parsing finished
+
+    producer = threading.Thread(target=produce, name="bookmark-parser", daemon=True)
+    producer.start()
+
+    result = IngestResult()
+    # url -> (has title, has window label) for URLs already sent
+    seen: dict[str, tuple[bool, bool]] = {}
+    batch: list[BookmarkItem] = []
+
+    while (bookmark := items.get()) is not None:
+        has_title = bookmark.page_title is not None
+        has_label = bookmark.window_label is not None
+        known = seen.get(bookmark.url)
+        if known is not None:
+            if (known[0] or not has_title) and (known[1] or not has_label):
+                # Repeat that adds nothing ON CONFLICT would keep
+                result.total_processed += 1
+                result.skipped_duplicates += 1
+                continue
+            # Sent again; ingest_batch merges it if still in the same batch
+            has_title, has_label = has_title or known[0], has_label or known[1]
+        seen[bookmark.url] = (has_title, has_label)
+
+        batch.append(bookmark)
+        if len(batch) >= batch_size:
+            result.add(db.ingest_batch(batch, user_id))
+            batch = []
+
+    result.add(db.ingest_batch(batch, user_id))
+    producer.join()
+
+    if parse_errors:
+        raise parse_errors[0]
+    return result
+
+
+def print_parse_stats(stats: dict) -> None:
+    """Print the Session- folder counts found in a bookmarks file"""
+    console.print(f"[green]Parsed successfully![/green]")
+    console.print(f"  Session folders found: {stats['total_session_folders']}")
+    console.print(f"  Total bookmarks: {stats['total_bookmarks']}")
+    console.print()
+
+    # Show folder breakdown
+    if stats['session_folders']:
+        table = Table(title="Session Folders")
+        table.add_column("Window Label", style="cyan")
+        table.add_column("Bookmark Count", justify="right", style="green")
+
+        for folder in stats['session_folders']:
+            table.add_row(folder['label'], str(folder['count']))
+
+        console.print(table)
+        console.print()
+
+    if not stats['total_bookmarks']:
+        console.print("[yellow]No bookmarks found in Session-* folders.[/yellow]")
+        console.print("Make sure your bookmarks are organized in folders with 'Session-' prefix.")
+
+
 @click.group()
 @click.version_option(version="1.0.0")
 def cli():
@@ -63,64 +150,47 @@ def cli():
     is_flag=True,
     help="Parse and show stats without writing to database"
 )
-def ingest(file: Path, user_id: str, batch_size: int, dry_run: bool):
+@click.option(
+    "--no-copy",
+    is_flag=True,
+    help="Insert rows with pipelined statements instead of COPY"
+)
+def ingest(file: Path, user_id: str, batch_size: int, dry_run: bool, no_copy: bool):
     """
     Ingest Firefox bookmarks into the database.
 
     Parses the Firefox bookmarks HTML export and inserts tabs from
-    Session-* folders into the database.
+    Session-* folders into the database. The file is parsed once: folder
+    counts are collected while streaming and shown after the ingest.
     """
     console.print(f"\n[bold blue]TabBacklog Ingest[/bold blue]")
     console.print(f"File: {file}")
     console.print(f"User ID: {user_id}")
     console.print()
 
-    # Parse the bookmarks file
-    with Progress(
-        SpinnerColumn(),
-        TextColumn("[progress.description]{task.description}"),
-        console=console,
-    ) as progress:
-        task = progress.add_task("Parsing bookmarks file...", total=None)
-
-        try:
-            parser = FirefoxParser(file)
-            stats = parser.get_stats()
-            bookmarks = parser.parse()
-        except Exception as e:
-            console.print(f"[red]Error parsing file:[/red] {e}")
-            sys.exit(1)
-
-        progress.update(task, completed=True)
-
-    # Display parsing results
-    console.print(f"[green]Parsed successfully![/green]")
-    console.print(f"  Session folders found: {stats['total_session_folders']}")
-    console.print(f"  Total bookmarks: {stats['total_bookmarks']}")
-    console.print()
-
-    # Show folder breakdown
-    if stats['session_folders']:
-        table = Table(title="Session Folders")
-        table.add_column("Window Label", style="cyan")
-        table.add_column("Bookmark Count", justify="right", style="green")
-
-        for folder in stats['session_folders']:
-            table.add_row(folder['label'], str(folder['count']))
-
-        console.print(table)
-        console.print()
-
-    if not bookmarks:
-        console.print("[yellow]No bookmarks found in Session-* folders.[/yellow]")
-        console.print("Make sure your bookmarks are organized in folders with 'Session-' prefix.")
-        return
-
     if dry_run:
-        console.print("[yellow]Dry run mode - no changes written to database[/yellow]")
+        with Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            console=console,
+        ) as progress:
+            task = progress.add_task("Parsing bookmarks file...", total=None)
+
+            try:
+                with FirefoxParser(file) as parser:
+                    stats = parser.get_stats()
+            except Exception as e:
+                console.print(f"[red]Error parsing file:[/red] {e}")
+                sys.exit(1)
+
+            progress.update(task, completed=True)
+
+        print_parse_stats(stats)
+        if stats['total_bookmarks']:
+            console.print("[yellow]Dry run mode - no changes written to database[/yellow]")
         return
 
-    # Ingest into database
+    # Parse and ingest into database in one pass
     database_url = get_database_url()
 
     with Progress(
@@ -128,22 +198,26 @@ def ingest(file: Path, user_id: str, batch_size: int, dry_run: bool):
         TextColumn("[progress.description]{task.description}"),
         console=console,
     ) as progress:
-        task = progress.add_task(
-            f"Ingesting {len(bookmarks)} bookmarks...",
-            total=None
-        )
+        task = progress.add_task("Ingesting bookmarks...", total=None)
 
+        db = IngestDB(database_url, use_copy=not no_copy)
         try:
-            db = IngestDB(database_url)
-            result = db.ingest_bookmarks(bookmarks, user_id, batch_size)
+            with FirefoxParser(file) as parser:
+                result = ingest_streaming(parser, db, user_id, batch_size)
         except Exception as e:
-            console.print(f"[red]Database error:[/red] {e}")
+            db.close()
+            console.print(f"[red]Ingest error:[/red] {e}")
             sys.exit(1)
 
         progress.update(task, completed=True)
 
+    # Display parsing results, counted during the ingest
+    print_parse_stats(parser.get_stats())
+    if not result.total_processed:
+        db.close()
+        return
+
     # Display results
-    console.print()
     console.print("[bold green]Ingest Complete![/bold green]")
 
     results_table = Table(title="Results")
@@ -167,6 +241,7 @@ def ingest(file: Path, user_id: str, batch_size: int, dry_run: bool):
 
     # Show current totals
     try:
+        db.refresh_stats()
         total_tabs = db.get_user_tab_count(user_id)
         summary = db.get_ingest_summary(user_id)
 
@@ -184,6 +259,8 @@ def ingest(file: Path, user_id: str, batch_size: int, dry_run: bool):
             console.print(status_table)
     except Exception:
         pass  # Non-critical, just skip the summary
+    finally:
+        db.close()
 
 
 @cli.command()
@@ -204,8 +281,8 @@ def stats(file: Path):
     console.print()
 
     try:
-        parser = FirefoxParser(file)
-        stats = parser.get_stats()
+        with FirefoxParser(file) as parser:
+            stats = parser.get_stats()
     except Exception as e:
         console.print(f"[red]Error parsing file:[/red] {e}")
         sys.exit(1)
@@ -247,9 +324,9 @@ def status(user_id: str):
     database_url = get_database_url()
 
     try:
-        db = IngestDB(database_url)
-        total = db.get_user_tab_count(user_id)
-        summary = db.get_ingest_summary(user_id)
+        with IngestDB(database_url) as db:
+            total = db.get_user_tab_count(user_id)
+            summary = db.get_ingest_summary(user_id)
     except Exception as e:
         console.print(f"[red]Database error:[/red] {e}")
         sys.exit(1)
@@ -5,20 +5,19 @@ Provides database operations for ingesting parsed bookmarks into the database.
 Handles upserts, deduplication, and event logging.
 """
 
-import json
 from contextlib import contextmanager
-from dataclasses import dataclass
-from datetime import datetime
+from dataclasses import dataclass, replace
+from datetime import datetime, timezone
 from typing import Iterator
 from uuid import UUID
 
 import psycopg
-from psycopg.rows import dict_row
+from psycopg.rows import dict_row, scalar_row
 
 from .firefox_parser import BookmarkItem
 
 
-@dataclass
+@dataclass(slots=True)
 class IngestResult:
     """Result of an ingest operation"""
     total_processed: int = 0
@@ -31,6 +30,50 @@ class IngestResult:
         if self.error_messages is None:
             self.error_messages = []
 
+    def add(self, other: "IngestResult") -> None:
+        """Accumulate another result (e.g. one batch) into this one"""
+        self.total_processed += other.total_processed
+        self.inserted += other.inserted
+        self.skipped_duplicates += other.skipped_duplicates
+        self.errors += other.errors
+        if other.error_messages:
+            self.error_messages.extend(other.error_messages)
+
+
+def epoch_seconds(value: datetime | int) -> float:
+    """Convert a BookmarkItem.collected_at value to Unix epoch seconds"""
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            # BookmarkItem datetimes are naive UTC
+            value = value.replace(tzinfo=timezone.utc)
+        return value.timestamp()
+    return float(value)
+
+
+def dedupe_bookmarks(bookmarks: list[BookmarkItem]) -> list[BookmarkItem]:
+    """
+    Drop repeated URLs, merging each repeat into the first entry.
+
+    Order follows the first occurrence of each URL. Like the ON CONFLICT
+    update, a repeat only fills in a title or label the first entry is
+    missing; values already set are kept.
+    """
+    unique: dict[str, BookmarkItem] = {}
+    for bookmark in bookmarks:
+        existing = unique.get(bookmark.url)
+        if existing is None:
+            unique[bookmark.url] = bookmark
+        elif (existing.page_title is None and bookmark.page_title) or (
+            existing.window_label is None and bookmark.window_label
+        ):
+            # Merge in place so the URL keeps its original position
+            unique[bookmark.url] = replace(
+                existing,
+                page_title=existing.page_title or bookmark.page_title,
+                window_label=existing.window_label or bookmark.window_label,
+            )
+    return list(unique.values())
+
 
 class IngestDB:
     """
@@ -40,24 +83,58 @@ class IngestDB:
     and event logging.
     """
 
-    def __init__(self, database_url: str):
+    def __init__(self, database_url: str, use_copy: bool = True):
         """
         Initialize the database connection.
 
         Args:
             database_url: PostgreSQL connection string
+            use_copy: Bulk-load batches with COPY. When False (e.g. behind
+                a proxy that does not support COPY), batches are sent as
+                pipelined executemany() calls instead.
         """
         self.database_url = database_url
+        self.use_copy = use_copy
         self._conn: psycopg.Connection | None = None
 
+    def __enter__(self) -> "IngestDB":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the shared connection, if open"""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
     @contextmanager
     def connection(self) -> Iterator[psycopg.Connection]:
-        """Context manager for database connections"""
-        conn = psycopg.connect(self.database_url, row_factory=dict_row)
+        """
+        Context manager yielding the shared database connection.
+
+        The connection is opened on first use and kept for the lifetime of
+        this IngestDB, so back-to-back calls skip the connect handshake.
+        Any transaction left open by the block is committed on exit, or
+        rolled back if the block raised.
+        """
+        if self._conn is None or self._conn.closed:
+            # prepare_threshold=0 makes psycopg prepare every statement on
+            # first use, so the upserts repeated for each batch (and each
+            # row of an executemany) are parsed and planned only once
+            self._conn = psycopg.connect(
+                self.database_url, row_factory=dict_row, prepare_threshold=0
+            )
+
+        conn = self._conn
         try:
             yield conn
-        finally:
-            conn.close()
+        except Exception:
+            conn.rollback()
+            raise
+        else:
+            conn.commit()
 
     def ingest_bookmarks(
         self,
@@ -69,7 +146,8 @@ class IngestDB:
         Ingest a list of bookmarks into the database.
 
         Performs upsert operations, deduplicating on (user_id, url).
-        Logs events for each operation.
+        URLs repeated within the input are collapsed in memory first and
+        counted as skipped duplicates. Logs events for each upsert.
 
         Args:
             bookmarks: List of BookmarkItem objects to ingest
@@ -79,22 +157,56 @@ class IngestDB:
         Returns:
             IngestResult with counts of processed, inserted, skipped records
         """
-        user_id_str = str(user_id)
+        # Validate up front so a malformed id fails once, not once per batch
+        user_id_str = str(UUID(str(user_id)))
         result = IngestResult()
 
+        # URLs repeated across Session folders would only come back from
+        # ON CONFLICT as duplicates, so drop them before the round trip
+        unique = dedupe_bookmarks(bookmarks)
+        result.total_processed = len(bookmarks) - len(unique)
+        result.skipped_duplicates = result.total_processed
+        bookmarks = unique
+
         with self.connection() as conn:
             # Process in batches
             for i in range(0, len(bookmarks), batch_size):
                 batch = bookmarks[i : i + batch_size]
-                batch_result = self._process_batch(conn, batch, user_id_str)
+                result.add(self._process_batch(conn, batch, user_id_str))
+
+        return result
+
+    def ingest_batch(
+        self,
+        bookmarks: list[BookmarkItem],
+        user_id: str | UUID,
+    ) -> IngestResult:
+        """
+        Ingest a single batch of bookmarks in one transaction.
+
+        URLs repeated within the batch are collapsed with dedupe_bookmarks
+        and counted as skipped duplicates, as in ingest_bookmarks. Repeats
+        across batches are left to the ON CONFLICT update.
 
-                result.total_processed += batch_result.total_processed
-                result.inserted += batch_result.inserted
-                result.skipped_duplicates += batch_result.skipped_duplicates
-                result.errors += batch_result.errors
-                if batch_result.error_messages:
-                    result.error_messages.extend(batch_result.error_messages)
+        Args:
+            bookmarks: BookmarkItem objects to ingest
+            user_id: UUID of the user owning these tabs
 
+        Returns:
+            IngestResult with counts for this batch
+        """
+        if not bookmarks:
+            return IngestResult()
+
+        user_id_str = str(UUID(str(user_id)))
+        unique = dedupe_bookmarks(bookmarks)
+        result = IngestResult(
+            total_processed=len(bookmarks) - len(unique),
+            skipped_duplicates=len(bookmarks) - len(unique),
+        )
+
+        with self.connection() as conn:
+            result.add(self._process_batch(conn, unique, user_id_str))
         return result
 
     def _process_batch(
@@ -103,118 +215,169 @@ class IngestDB:
         bookmarks: list[BookmarkItem],
         user_id: str,
     ) -> IngestResult:
-        """Process a batch of bookmarks in a single transaction"""
-        result = IngestResult()
+        """
+        Process a batch of bookmarks in a single transaction.
 
-        with conn.cursor() as cur:
-            for bookmark in bookmarks:
-                result.total_processed += 1
+        The success path uses no savepoints; if anything in the batch
+        fails, it is rolled back and retried row by row.
+
+        Rows are COPYed into a temporary staging table, then one statement
+        merges them into tab_item and writes the matching event_log rows,
+        instead of two statements per row. Without COPY, the per-row
+        upsert+log statements are pipelined so the batch still only waits
+        on the server once.
+        """
+        result = IngestResult(total_processed=len(bookmarks))
+
+        try:
+            # The upserts only return event types, so skip building dicts
+            with conn.transaction(), conn.cursor(row_factory=scalar_row) as cur:
+                self._relax_durability(cur)
+                if self.use_copy:
+                    self._stage_batch(cur, bookmarks)
+                    event_types = self._merge_staged(cur, user_id)
+                else:
+                    event_types = self._upsert_rows(conn, cur, bookmarks, user_id)
+        except Exception:
+            # Only pay for per-row savepoints once the batch has failed
+            return self._process_rows(conn, bookmarks, user_id)
+
+        result.inserted = event_types.count("tab_created")
+        result.skipped_duplicates = len(event_types) - result.inserted
+        return result
+
+    def _process_rows(
+        self,
+        conn: psycopg.Connection,
+        bookmarks: list[BookmarkItem],
+        user_id: str,
+    ) -> IngestResult:
+        """
+        Retry a failed batch one row at a time.
+
+        Each row runs in its own savepoint so a bad row is reported and
+        skipped without losing the rest of the batch.
+        """
+        result = IngestResult(total_processed=len(bookmarks))
 
+        with conn.transaction(), conn.cursor(row_factory=scalar_row) as cur:
+            self._relax_durability(cur)
+            for bookmark in bookmarks:
                 try:
-                    inserted = self._upsert_tab(cur, bookmark, user_id)
-                    if inserted:
-                        result.inserted += 1
-                        self._log_event(
-                            cur,
-                            user_id=user_id,
-                            event_type="tab_created",
-                            entity_type="tab_item",
-                            details={
-                                "url": bookmark.url,
-                                "source": "firefox_bookmarks_import",
-                            },
-                        )
-                    else:
-                        result.skipped_duplicates += 1
-                        self._log_event(
-                            cur,
-                            user_id=user_id,
-                            event_type="tab_duplicate_skipped",
-                            entity_type="tab_item",
-                            details={
-                                "url": bookmark.url,
-                                "source": "firefox_bookmarks_import",
-                            },
-                        )
+                    with conn.transaction():
+                        event_types = self._upsert_rows(conn, cur, [bookmark], user_id)
                 except Exception as e:
                     result.errors += 1
                     result.error_messages.append(f"Error processing {bookmark.url}: {e}")
                     # Continue processing other bookmarks
                     continue
 
-            conn.commit()
+                if event_types == ["tab_created"]:
+                    result.inserted += 1
+                else:
+                    result.skipped_duplicates += 1
 
         return result
 
-    def _upsert_tab(
-        self,
-        cur: psycopg.Cursor,
-        bookmark: BookmarkItem,
-        user_id: str,
-    ) -> bool:
+    def _relax_durability(self, cur: psycopg.Cursor) -> None:
         """
-        Upsert a single tab item.
+        Skip waiting for the WAL flush when the current transaction commits.
 
-        Returns True if a new record was inserted, False if it was a duplicate.
+        An import can simply be re-run if the server crashes, so losing
+        the last few batches is acceptable; data stays consistent either
+        way. The staging table needs nothing extra: temp tables are
+        never WAL-logged.
         """
-        # Use INSERT ... ON CONFLICT to handle duplicates
-        # Only insert if no existing active record (deleted_at IS NULL)
-        query = """
-            INSERT INTO tab_item (
-                user_id,
-                url,
-                page_title,
-                window_label,
-                collected_at,
-                status,
-                created_at,
-                updated_at
-            )
-            VALUES (
-                %(user_id)s,
-                %(url)s,
-                %(page_title)s,
-                %(window_label)s,
-                %(collected_at)s,
-                'new',
-                now(),
-                now()
-            )
-            ON CONFLICT (user_id, url) WHERE deleted_at IS NULL
-            DO UPDATE SET
-                -- Only update if the existing record has less info
-                page_title = COALESCE(tab_item.page_title, EXCLUDED.page_title),
-                window_label = COALESCE(tab_item.window_label, EXCLUDED.window_label),
-                updated_at = now()
-            RETURNING (xmax = 0) AS inserted
+        cur.execute("SET LOCAL synchronous_commit = off")
+
+    def _stage_batch(
+        self,
+        cur: psycopg.Cursor,
+        bookmarks: list[BookmarkItem],
+    ) -> None:
         """
+        COPY a batch into the session's temporary staging table.
 
+        The table is created by the first batch and emptied on every
+        commit. Keeping it for the whole session, rather than dropping it
+        each time, keeps _merge_staged's prepared statement valid.
+        """
         cur.execute(
-            query,
-            {
-                "user_id": user_id,
-                "url": bookmark.url,
-                "page_title": bookmark.page_title,
-                "window_label": bookmark.window_label,
-                "collected_at": bookmark.collected_at,
-            },
+            """
+            CREATE TEMP TABLE IF NOT EXISTS tab_item_stage (
+                ord          integer,
+                url          text,
+                page_title   text,
+                window_label text,
+                collected_epoch double precision
+            ) ON COMMIT DELETE ROWS
+            """
         )
 
-        row = cur.fetchone()
-        # xmax = 0 means it was an INSERT, not an UPDATE
-        return row["inserted"] if row else False
-
-    def _log_event(
+        with cur.copy(
+            """
+            COPY tab_item_stage (ord, url, page_title, window_label, collected_epoch)
+            FROM STDIN
+            """
+        ) as copy:
+            for ord_, bookmark in enumerate(bookmarks):
+                copy.write_row((
+                    ord_,
+                    bookmark.url,
+                    bookmark.page_title,
+                    bookmark.window_label,
+                    epoch_seconds(bookmark.collected_at),
+                ))
+
+    def _merge_staged(
         self,
         cur: psycopg.Cursor,
         user_id: str,
-        event_type: str,
-        entity_type: str | None = None,
-        entity_id: int | None = None,
-        details: dict | None = None,
-    ) -> None:
-        """Log an event to the event_log table"""
-        query = """
+    ) -> list[str]:
+        """
+        Upsert the staged rows into tab_item and log an event for each.
+
+        Returns the logged event type for every staged row: tab_created,
+        or tab_duplicate_skipped for URLs that already had an active
+        record or were repeated within the batch.
+        """
+        # Use INSERT ... ON CONFLICT to handle duplicates
+        # Only insert if no existing active record (deleted_at IS NULL).
+        # DISTINCT ON keeps the first occurrence of a URL repeated within
+        # the batch, since ON CONFLICT cannot touch the same row twice.
+        # xmax = 0 means it was an INSERT, not an UPDATE.
+        cur.execute(
+            """
+            WITH upsert AS (
+                INSERT INTO tab_item (
+                    user_id,
+                    url,
+                    page_title,
+                    window_label,
+                    collected_at,
+                    status,
+                    created_at,
+                    updated_at
+                )
+                SELECT DISTINCT ON (url)
+                    %(user_id)s::uuid,
+                    url,
+                    page_title,
+                    window_label,
+                    to_timestamp(collected_epoch),
+                    'new',
+                    now(),
+                    now()
+                FROM tab_item_stage
+                ORDER BY url, ord
+                ON CONFLICT (user_id, url) WHERE deleted_at IS NULL
+                DO UPDATE SET
+                    -- Only update if the existing record has less info
+                    page_title = COALESCE(tab_item.page_title, EXCLUDED.page_title),
+                    window_label = COALESCE(tab_item.window_label, EXCLUDED.window_label),
+                    updated_at = now()
+                RETURNING id, url, (xmax = 0) AS inserted
+            )
             INSERT INTO event_log (
                 user_id,
                 event_type,
@@ -223,26 +386,123 @@ class IngestDB:
                 details,
                 created_at
             )
-            VALUES (
-                %(user_id)s,
-                %(event_type)s,
-                %(entity_type)s,
-                %(entity_id)s,
-                %(details)s,
+            SELECT
+                %(user_id)s::uuid,
+                CASE WHEN upsert.inserted AND stage.first_seen
+                    THEN 'tab_created'
+                    ELSE 'tab_duplicate_skipped'
+                END,
+                'tab_item',
+                upsert.id,
+                jsonb_build_object(
+                    'url', stage.url,
+                    'source', 'firefox_bookmarks_import'
+                ),
                 now()
-            )
+            FROM (
+                SELECT url, ord = min(ord) OVER (PARTITION BY url) AS first_seen
+                FROM tab_item_stage
+            ) AS stage
+            JOIN upsert USING (url)
+            RETURNING event_type
+            """,
+            {"user_id": user_id},
+            prepare=True,
+        )
+
+        return cur.fetchall()
+
+    def _upsert_rows(
+        self,
+        conn: psycopg.Connection,
+        cur: psycopg.Cursor,
+        bookmarks: list[BookmarkItem],
+        user_id: str,
+    ) -> list[str]:
         """
+        Upsert a batch row by row in pipeline mode, logging each row.
 
-        cur.execute(
-            query,
+        Each row is a single statement: a writable CTE upserts the tab and
+        the outer INSERT logs the event. Returns the logged event types,
+        as _merge_staged does.
+        """
+        params = [
             {
                 "user_id": user_id,
-                "event_type": event_type,
-                "entity_type": entity_type,
-                "entity_id": entity_id,
-                "details": json.dumps(details or {}),
-            },
-        )
+                "url": bookmark.url,
+                "page_title": bookmark.page_title,
+                "window_label": bookmark.window_label,
+                "collected_at": epoch_seconds(bookmark.collected_at),
+            }
+            for bookmark in bookmarks
+        ]
+
+        with conn.pipeline():
+            cur.executemany(
+                """
+                WITH upsert AS (
+                    INSERT INTO tab_item (
+                        user_id,
+                        url,
+                        page_title,
+                        window_label,
+                        collected_at,
+                        status,
+                        created_at,
+                        updated_at
+                    )
+                    VALUES (
+                        %(user_id)s,
+                        %(url)s,
+                        %(page_title)s,
+                        %(window_label)s,
+                        to_timestamp(%(collected_at)s),
+                        'new',
+                        now(),
+                        now()
+                    )
+                    ON CONFLICT (user_id, url) WHERE deleted_at IS NULL
+                    DO UPDATE SET
+                        page_title = COALESCE(tab_item.page_title, EXCLUDED.page_title),
+                        window_label = COALESCE(tab_item.window_label, EXCLUDED.window_label),
+                        updated_at = now()
+                    RETURNING id, (xmax = 0) AS inserted
+                )
+                INSERT INTO event_log (
+                    user_id,
+                    event_type,
+                    entity_type,
+                    entity_id,
+                    details,
+                    created_at
+                )
+                SELECT
+                    %(user_id)s::uuid,
+                    CASE WHEN inserted THEN 'tab_created' ELSE 'tab_duplicate_skipped' END,
+                    'tab_item',
+                    id,
+                    jsonb_build_object(
+                        'url', %(url)s::text,
+                        'source', 'firefox_bookmarks_import'
+                    ),
+                    now()
+                FROM upsert
+                RETURNING event_type
+                """,
+                params,
+                returning=True,
+            )
+
+            # One result set per row
+            event_types = []
+            while True:
+                event_type = cur.fetchone()
+                if event_type:
+                    event_types.append(event_type)
+                if not cur.nextset():
+                    break
+
+        return event_types
 
     def get_user_tab_count(self, user_id: str | UUID) -> int:
         """Get the total count of active tabs for a user"""
@@ -259,6 +519,11 @@ class IngestDB:
                 row = cur.fetchone()
                 return row["count"] if row else 0
 
+    def refresh_stats(self) -> None:
+        """Refresh the web UI's stats views so new tabs show up right away"""
+        with self.connection() as conn:
+            conn.execute("SELECT refresh_tab_stats()")
+
     def get_ingest_summary(self, user_id: str | UUID) -> dict:
         """Get a summary of tabs for a user grouped by status"""
         with self.connection() as conn:
@@ -5,20 +5,41 @@ Parses Firefox bookmarks HTML export files to extract tab information.
 Specifically looks for "Session-" prefixed folders which contain saved browser tabs.
 """
 
+import mmap
+import re
+import time
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
 from typing import Iterator
-from bs4 import BeautifulSoup, Tag
 
+from lxml import etree
 
-@dataclass
+# Matches http(s) URLs, allowing the leading whitespace some exports contain
+_is_http_url = re.compile(r"\s*https?://").match
+
+
+def _element_text(elem: etree._Element) -> str:
+    """
+    Stripped text of a folder header or bookmark link.
+
+    Firefox writes these as plain text leaves, so the direct text node is
+    read; descendant text is only joined for the rare element with markup
+    inside it.
+    """
+    if len(elem):
+        return "".join(elem.itertext()).strip()
+    return (elem.text or "").strip()
+
+
+@dataclass(slots=True)
 class BookmarkItem:
     """Represents a single bookmark/tab extracted from Firefox export"""
     url: str
     page_title: str | None
     window_label: str | None
-    collected_at: datetime = field(default_factory=datetime.utcnow)
+    # Naive UTC datetime, or Unix epoch seconds as read from the export
+    collected_at: datetime | int = field(default_factory=datetime.utcnow)
 
     def __post_init__(self):
         # Normalize URL by stripping whitespace
@@ -41,6 +62,9 @@ class FirefoxParser:
             - bookmark2
         Session-Work
             - bookmark3
+
+    The file is stream-parsed, so memory use is bounded by the current
+    folder rather than the size of the export.
     """
 
     SESSION_PREFIX = "Session-"
@@ -49,6 +73,38 @@ class FirefoxParser:
         self.file_path = Path(file_path)
         if not self.file_path.exists():
             raise FileNotFoundError(f"Bookmarks file not found: {self.file_path}")
+        self._mmap: mmap.mmap | None = None
+        # Filled by the first get_stats() call or complete iter_bookmarks() pass
+        self._stats: dict | None = None
+        # Fallback timestamp for bookmarks without a usable add_date
+        self._now = int(time.time())
+
+    def __enter__(self) -> "FirefoxParser":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Release the memory-mapped file"""
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def _open_mmap(self) -> mmap.mmap:
+        """
+        Map the file read-only, rewound to the start.
+
+        The mapping is kept between passes, so get_stats() followed by
+        parse() reads the file through the page cache without copying it
+        into a Python string. Only one pass may be in progress at a time.
+        """
+        if self._mmap is None:
+            with open(self.file_path, "rb") as f:
+                # The mapping stays valid after the descriptor is closed
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._mmap.seek(0)
+        return self._mmap
 
     def parse(self) -> list[BookmarkItem]:
         """
@@ -57,138 +113,183 @@ class FirefoxParser:
         Returns:
             List of BookmarkItem objects
         """
-        return list(self._iter_bookmarks())
+        return list(self.iter_bookmarks())
 
-    def _iter_bookmarks(self) -> Iterator[BookmarkItem]:
+    def iter_bookmarks(self) -> Iterator[BookmarkItem]:
         """
-        Iterate over all bookmarks in Session- folders.
+        Iterate over all bookmarks in Session- folders as they are parsed.
+
+        A complete pass also counts the folders, so get_stats() afterwards
+        doesn't parse the file again.
 
         Yields:
             BookmarkItem objects for each bookmark found
         """
-        html_content = self.file_path.read_text(encoding="utf-8")
-        soup = BeautifulSoup(html_content, "html.parser")
-
-        # Find all H3 tags (folder headers)
-        for h3 in soup.find_all("h3"):
-            folder_name = h3.get_text(strip=True)
-
-            # Check if this is a Session- folder
-            if not folder_name.startswith(self.SESSION_PREFIX):
-                continue
-
-            # Extract window label (everything after "Session-")
-            window_label = folder_name[len(self.SESSION_PREFIX):]
-            if not window_label:
-                window_label = "default"
+        folders: dict[int, dict] = {}
+        total = 0
 
-            # Find the DL element that follows this H3 (contains bookmarks)
-            dl = self._find_folder_contents(h3)
-            if dl is None:
+        for folder_id, window_label, a_tag in self._iter_session_links():
+            folder = folders.setdefault(folder_id, {"label": window_label, "count": 0})
+            if a_tag is None:
                 continue
+            bookmark = self._bookmark_from_anchor(a_tag, window_label)
+            if bookmark is not None:
+                folder["count"] += 1
+                total += 1
+                yield bookmark
 
-            # Extract all bookmarks from this folder
-            yield from self._extract_bookmarks_from_dl(dl, window_label)
+        self._stats = self._build_stats(folders, total)
 
-    def _find_folder_contents(self, h3_tag: Tag) -> Tag | None:
+    def _iter_session_links(
+        self,
+    ) -> Iterator[tuple[int, str, etree._Element | None]]:
         """
-        Find the DL element containing bookmarks for a folder.
+        Stream the anchors found inside Session- folders.
 
         In Firefox bookmark HTML format:
-        <DT>
-            <H3>Folder Name</H3>
-            <DL><p>
-                ... bookmarks ...
-            </DL>
-        </DT>
-        """
-        # The H3 is inside a DT, and the DL follows it
-        dt_parent = h3_tag.find_parent("dt")
-        if dt_parent is None:
-            return None
+        <DT><H3>Folder Name</H3>
+        <DL><p>
+            ... bookmarks ...
+        </DL><p>
 
-        # Find the DL that is a sibling after the H3
-        for sibling in h3_tag.find_next_siblings():
-            if sibling.name == "dl":
-                return sibling
+        A folder's H3 is immediately followed by its DL, so the last H3
+        seen when a DL opens names that folder; matching is constant time
+        per element, with no sibling scans. Nested folders inherit the
+        label of the enclosing Session- folder.
 
-        return None
+        Yields:
+            (folder_id, window_label, anchor) tuples, where folder_id
+            identifies the Session- folder the anchor belongs to. Each
+            folder is announced once with anchor set to None when it opens.
+        """
+        # One entry per open DL: (folder_id, window_label) or None
+        stack: list[tuple[int, str] | None] = []
+        pending_label: str | None = None
+        folder_count = 0
+
+        for event, elem in etree.iterparse(
+            self._open_mmap(),
+            events=("start", "end"),
+            tag=("h3", "dl", "dt", "a"),
+            html=True,
+            encoding="utf-8",
+        ):
+            if event == "start":
+                if elem.tag == "dl":
+                    if pending_label is not None:
+                        stack.append((folder_count, pending_label))
+                        yield folder_count, pending_label, None
+                        folder_count += 1
+                    else:
+                        stack.append(stack[-1] if stack else None)
+                    pending_label = None
+                continue
 
-    def _extract_bookmarks_from_dl(
+            if elem.tag == "h3":
+                folder_name = _element_text(elem)
+                pending_label = None
+                if folder_name.startswith(self.SESSION_PREFIX):
+                    # Extract window label (everything after "Session-")
+                    pending_label = folder_name[len(self.SESSION_PREFIX):] or "default"
+            elif elem.tag == "a":
+                # A bookmark before any DL means the last H3 was an empty
+                # folder, so it can't name a later DL
+                pending_label = None
+                folder = stack[-1] if stack else None
+                if folder is not None:
+                    yield folder[0], folder[1], elem
+                continue
+            elif elem.tag == "dl":
+                if stack:
+                    stack.pop()
+
+            # Release finished elements so the tree never grows past the
+            # current folder
+            elem.clear()
+            parent = elem.getparent()
+            if parent is not None:
+                while elem.getprevious() is not None:
+                    del parent[0]
+
+    def _bookmark_from_anchor(
         self,
-        dl: Tag,
-        window_label: str
-    ) -> Iterator[BookmarkItem]:
+        a_tag: etree._Element,
+        window_label: str,
+    ) -> BookmarkItem | None:
         """
-        Extract all bookmark links from a DL element.
+        Build a BookmarkItem from an anchor element.
 
         Args:
-            dl: The DL tag containing bookmarks
-            window_label: The window/session label for these bookmarks
+            a_tag: The A element for the bookmark
+            window_label: The window/session label for this bookmark
 
-        Yields:
-            BookmarkItem objects
+        Returns:
+            BookmarkItem, or None for empty and non-http(s) URLs
         """
-        # Find all anchor tags with href
-        for a_tag in dl.find_all("a", href=True):
-            url = a_tag.get("href", "").strip()
+        url = a_tag.get("href")
 
-            # Skip empty URLs and non-http(s) URLs
-            if not url or not url.startswith(("http://", "https://")):
-                continue
+        # Skip empty URLs and non-http(s) URLs
+        if not url or not _is_http_url(url):
+            return None
 
-            title = a_tag.get_text(strip=True) or None
-
-            # Try to get add_date attribute if present
-            add_date_str = a_tag.get("add_date")
-            if add_date_str:
-                try:
-                    # Firefox stores timestamps in seconds since epoch
-                    timestamp = int(add_date_str)
-                    collected_at = datetime.utcfromtimestamp(timestamp)
-                except (ValueError, OSError):
-                    collected_at = datetime.utcnow()
-            else:
-                collected_at = datetime.utcnow()
-
-            yield BookmarkItem(
-                url=url,
-                page_title=title,
-                window_label=window_label,
-                collected_at=collected_at,
-            )
+        title = _element_text(a_tag) or None
+
+        # Try to get add_date attribute if present
+        # Firefox stores timestamps in seconds since epoch; they are kept
+        # as ints and converted to timestamps by Postgres on insert
+        add_date_str = a_tag.get("add_date")
+        collected_at = self._now
+        if add_date_str:
+            try:
+                collected_at = int(add_date_str)
+            except ValueError:
+                pass
+
+        return BookmarkItem(
+            url=url,
+            page_title=title,
+            window_label=window_label,
+            collected_at=collected_at,
+        )
 
     def get_stats(self) -> dict:
         """
-        Get statistics about the bookmarks file without fully parsing.
+        Get statistics about the bookmarks file.
+
+        The stats pass only counts bookmarks, so it holds no more in memory
+        than iter_bookmarks() does; the result is kept for later calls, and
+        a complete iter_bookmarks() pass fills it too. Counts use the same
+        URL check as iter_bookmarks(), so stats and ingest always agree.
 
         Returns:
             Dictionary with stats like total_bookmarks, session_folders, etc.
         """
-        html_content = self.file_path.read_text(encoding="utf-8")
-        soup = BeautifulSoup(html_content, "html.parser")
-
-        session_folders = []
-        total_bookmarks = 0
-
-        for h3 in soup.find_all("h3"):
-            folder_name = h3.get_text(strip=True)
-            if folder_name.startswith(self.SESSION_PREFIX):
-                window_label = folder_name[len(self.SESSION_PREFIX):] or "default"
-                dl = self._find_folder_contents(h3)
-                if dl:
-                    count = len([
-                        a for a in dl.find_all("a", href=True)
-                        if a.get("href", "").startswith(("http://", "https://"))
-                    ])
-                    session_folders.append({"label": window_label, "count": count})
-                    total_bookmarks += count
+        if self._stats is not None:
+            return self._stats
+
+        folders: dict[int, dict] = {}
+        total = 0
+
+        for folder_id, window_label, a_tag in self._iter_session_links():
+            folder = folders.setdefault(folder_id, {"label": window_label, "count": 0})
+            if a_tag is None:
+                continue
+            url = a_tag.get("href")
+            if url and _is_http_url(url):
+                folder["count"] += 1
+                total += 1
+
+        self._stats = self._build_stats(folders, total)
+        return self._stats
 
+    def _build_stats(self, folders: dict[int, dict], total: int) -> dict:
+        """Assemble get_stats()' result from per-folder counts"""
+        session_folders = list(folders.values())
         return {
             "file_path": str(self.file_path),
             "session_folders": session_folders,
             "total_session_folders": len(session_folders),
-            "total_bookmarks": total_bookmarks,
+            "total_bookmarks": total,
         }
 
 
@@ -202,5 +303,5 @@ def parse_bookmarks_file(file_path: str | Path) -> list[BookmarkItem]:
     Returns:
         List of BookmarkItem objects from Session- folders
     """
-    parser = FirefoxParser(file_path)
-    return parser.parse()
+    with FirefoxParser(file_path) as parser:
+        return parser.parse()
@@ -5,23 +5,35 @@ FastAPI service for fetching and parsing web pages.
 Provides endpoints for parsing URLs with site-specific handlers.
 """
 
+import asyncio
 import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
 from contextlib import asynccontextmanager
+from typing import Union
 
-import httpx
+import aiohttp
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
 from . import __version__
 from .models import (
     FetchParseRequest,
+    FetchParseBatchRequest,
     ParseHtmlRequest,
     ParsedPageResponse,
     ErrorResponse,
     HealthResponse,
 )
 from .parsers import get_default_registry, parse_url as do_parse_url
-from .parsers.registry import parse_html, get_registry
+from .parsers.registry import (
+    create_http_session,
+    get_registry,
+    parse_batch,
+    parse_html,
+    prewarm_connections,
+)
 
 # Configure logging
 logging.basicConfig(
@@ -30,6 +42,20 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Most URLs fetched at once by a single /fetch_parse_batch request
+MAX_BATCH_CONCURRENCY = 32
+
+
+def get_prewarm_domains() -> list[str]:
+    """Get the comma-separated domains to open connections to at startup."""
+    domains = os.environ.get("PREWARM_DOMAINS", "")
+    return [domain.strip() for domain in domains.split(",") if domain.strip()]
+
+
+def get_parse_workers() -> int:
+    """Get the number of parser worker processes from environment."""
+    return max(1, int(os.environ.get("PARSE_WORKERS", os.cpu_count() or 1)))
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -37,8 +63,23 @@ async def lifespan(app: FastAPI):
     # Initialize the parser registry on startup
     registry = get_registry()
     logger.info(f"Parser service starting with parsers: {registry.list_parsers()}")
+
+    # One pooled session shared by every fetch
+    app.state.http_session = create_http_session()
+    prewarm_domains = get_prewarm_domains()
+    if prewarm_domains:
+        logger.info(f"Prewarming connections to {len(prewarm_domains)} domains")
+        await prewarm_connections(app.state.http_session, prewarm_domains)
+
+    # HTML parsing (and yt-dlp calls) run in worker processes so they
+    # don't block the event loop
+    app.state.parse_pool = ProcessPoolExecutor(max_workers=get_parse_workers())
+
     yield
+
     logger.info("Parser service shutting down")
+    await app.state.http_session.close()
+    app.state.parse_pool.shutdown(cancel_futures=True)
 
 
 app = FastAPI(
@@ -46,6 +87,7 @@ app = FastAPI(
     description="Fetches and parses web pages to extract structured content",
     version=__version__,
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # Add CORS middleware
@@ -71,8 +113,8 @@ async def health_check():
 
 @app.post(
     "/fetch_parse",
-    response_model=ParsedPageResponse,
     responses={
+        200: {"model": ParsedPageResponse},
         400: {"model": ErrorResponse, "description": "Invalid request"},
         500: {"model": ErrorResponse, "description": "Parsing or fetch error"},
     },
@@ -92,82 +134,131 @@ async def fetch_and_parse(request: FetchParseRequest):
     logger.info(f"Fetching and parsing URL: {request.url}")
 
     try:
-        parsed = await do_parse_url(request.url, timeout=request.timeout)
+        parsed = await do_parse_url(
+            request.url,
+            timeout=request.timeout,
+            session=app.state.http_session,
+            executor=app.state.parse_pool,
+        )
 
         logger.info(
             f"Successfully parsed {request.url} as {parsed.site_kind}, "
             f"word_count={parsed.word_count}"
         )
 
-        return ParsedPageResponse(
-            site_kind=parsed.site_kind,
-            title=parsed.title,
-            text_full=parsed.text_full,
-            word_count=parsed.word_count,
-            video_seconds=parsed.video_seconds,
-            metadata=parsed.metadata,
-        )
+        # ParsedPage already has the response shape, so skip Pydantic
+        return ORJSONResponse(parsed.to_dict())
 
-    except httpx.TimeoutException:
-        logger.warning(f"Timeout fetching URL: {request.url}")
-        raise HTTPException(
-            status_code=500,
-            detail=ErrorResponse(
-                error="Fetch timeout",
-                detail=f"Request timed out after {request.timeout} seconds",
-                url=request.url,
-            ).model_dump(),
-        )
+    except Exception as e:
+        status_code, error = _fetch_parse_error(e, request.url, request.timeout)
+        raise HTTPException(status_code=status_code, detail=error.model_dump())
 
-    except httpx.HTTPStatusError as e:
-        logger.warning(f"HTTP error fetching URL {request.url}: {e.response.status_code}")
-        raise HTTPException(
-            status_code=500,
-            detail=ErrorResponse(
-                error="HTTP error",
-                detail=f"Received status {e.response.status_code}",
-                url=request.url,
-            ).model_dump(),
+
+@app.post(
+    "/fetch_parse_batch",
+    responses={
+        200: {"model": list[Union[ParsedPageResponse, ErrorResponse]]},
+    },
+    tags=["Parsing"],
+)
+async def fetch_and_parse_batch(request: FetchParseBatchRequest):
+    """
+    Fetch and parse multiple URLs in a single request.
+
+    URLs are fetched concurrently over the shared HTTP session, up to
+    MAX_BATCH_CONCURRENCY at a time. YouTube videos are extracted together
+    by a single yt-dlp run while the other URLs are fetched. Results are returned in input order; a URL that
+    fails gets an error entry instead of failing the batch.
+    """
+    logger.info(f"Fetching and parsing batch of {len(request.urls)} URLs")
+    semaphore = asyncio.Semaphore(MAX_BATCH_CONCURRENCY)
+
+    # Parsers that extract content themselves (YouTube via yt-dlp) handle
+    # their URLs in one call, which runs while everything else is fetched
+    # individually; only URLs in the batch wait for it
+    batch_urls = [
+        url for _, group in get_registry().batch_groups(request.urls) for url in group
+    ]
+
+    async def run_batch() -> dict:
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(app.state.parse_pool, parse_batch, batch_urls)
+        except Exception as e:
+            logger.warning(f"Batch parsing failed, parsing URLs individually: {e}")
+            return {}
+
+    batch = asyncio.ensure_future(run_batch()) if batch_urls else None
+    in_batch = set(batch_urls)
+
+    async def parse_one(url: str) -> dict:
+        if url in in_batch:
+            batched = await batch
+            if url in batched:
+                return batched[url].to_dict()
+        async with semaphore:
+            try:
+                parsed = await do_parse_url(
+                    url,
+                    timeout=request.timeout,
+                    session=app.state.http_session,
+                    executor=app.state.parse_pool,
+                )
+            except Exception as e:
+                _, error = _fetch_parse_error(e, url, request.timeout)
+                return error.model_dump()
+            return parsed.to_dict()
+
+    results = await asyncio.gather(*(parse_one(url) for url in request.urls))
+    return ORJSONResponse(results)
+
+
+def _fetch_parse_error(e: Exception, url: str, timeout: float) -> tuple[int, ErrorResponse]:
+    """Log a fetch/parse failure and map it to a status code and error body."""
+    if isinstance(e, asyncio.TimeoutError):
+        logger.warning(f"Timeout fetching URL: {url}")
+        return 500, ErrorResponse(
+            error="Fetch timeout",
+            detail=f"Request timed out after {timeout} seconds",
+            url=url,
         )
 
-    except httpx.RequestError as e:
-        logger.warning(f"Request error fetching URL {request.url}: {e}")
-        raise HTTPException(
-            status_code=500,
-            detail=ErrorResponse(
-                error="Request failed",
-                detail=str(e),
-                url=request.url,
-            ).model_dump(),
+    if isinstance(e, aiohttp.ClientResponseError):
+        logger.warning(f"HTTP error fetching URL {url}: {e.status}")
+        return 500, ErrorResponse(
+            error="HTTP error",
+            detail=f"Received status {e.status}",
+            url=url,
         )
 
-    except ValueError as e:
-        logger.warning(f"Parse error for URL {request.url}: {e}")
-        raise HTTPException(
-            status_code=400,
-            detail=ErrorResponse(
-                error="Parse error",
-                detail=str(e),
-                url=request.url,
-            ).model_dump(),
+    if isinstance(e, aiohttp.ClientError):
+        logger.warning(f"Request error fetching URL {url}: {e}")
+        return 500, ErrorResponse(
+            error="Request failed",
+            detail=str(e),
+            url=url,
         )
 
-    except Exception as e:
-        logger.exception(f"Unexpected error parsing URL {request.url}")
-        raise HTTPException(
-            status_code=500,
-            detail=ErrorResponse(
-                error="Internal error",
-                detail=str(e),
-                url=request.url,
-            ).model_dump(),
+    if isinstance(e, ValueError):
+        logger.warning(f"Parse error for URL {url}: {e}")
+        return 400, ErrorResponse(
+            error="Parse error",
+            detail=str(e),
+            url=url,
         )
 
+    logger.error(f"Unexpected error parsing URL {url}", exc_info=e)
+    return 500, ErrorResponse(
+        error="Internal error",
+        detail=str(e),
+        url=url,
+    )
+
 
 @app.post(
     "/parse_html",
-    response_model=ParsedPageResponse,
     responses={
+        200: {"model": ParsedPageResponse},
         400: {"model": ErrorResponse, "description": "Invalid request"},
         500: {"model": ErrorResponse, "description": "Parsing error"},
     },
@@ -184,21 +275,18 @@ async def parse_html_content(request: ParseHtmlRequest):
     logger.info(f"Parsing HTML for URL: {request.url}")
 
     try:
-        parsed = parse_html(request.url, request.html_content)
+        loop = asyncio.get_running_loop()
+        parsed = await loop.run_in_executor(
+            app.state.parse_pool, parse_html, request.url, request.html_content
+        )
 
         logger.info(
             f"Successfully parsed HTML for {request.url} as {parsed.site_kind}, "
             f"word_count={parsed.word_count}"
         )
 
-        return ParsedPageResponse(
-            site_kind=parsed.site_kind,
-            title=parsed.title,
-            text_full=parsed.text_full,
-            word_count=parsed.word_count,
-            video_seconds=parsed.video_seconds,
-            metadata=parsed.metadata,
-        )
+        # ParsedPage already has the response shape, so skip Pydantic
+        return ORJSONResponse(parsed.to_dict())
 
     except ValueError as e:
         logger.warning(f"Parse error for URL {request.url}: {e}")
@@ -5,7 +5,10 @@ API request/response models for the parser service.
 """
 
 from typing import Optional
-from pydantic import BaseModel, Field, HttpUrl
+from pydantic import BaseModel, ConfigDict, Field, HttpUrl
+
+# Request bodies are JSON from our own services, so skip type coercion
+STRICT_REQUEST_CONFIG = ConfigDict(strict=True)
 
 
 class FetchParseRequest(BaseModel):
@@ -18,12 +21,29 @@ class FetchParseRequest(BaseModel):
         description="Request timeout in seconds"
     )
 
+    model_config = STRICT_REQUEST_CONFIG
+
+
+class FetchParseBatchRequest(BaseModel):
+    """Request model for /fetch_parse_batch endpoint"""
+    urls: list[str] = Field(..., description="URLs to fetch and parse")
+    timeout: float = Field(
+        default=30.0,
+        ge=1.0,
+        le=120.0,
+        description="Per-URL request timeout in seconds"
+    )
+
+    model_config = STRICT_REQUEST_CONFIG
+
 
 class ParseHtmlRequest(BaseModel):
     """Request model for /parse_html endpoint (parse pre-fetched HTML)"""
     url: str = Field(..., description="Original URL (for parser selection)")
     html_content: str = Field(..., description="HTML content to parse")
 
+    model_config = STRICT_REQUEST_CONFIG
+
 
 class ParsedPageResponse(BaseModel):
     """Response model for parsed page content"""
@@ -2,14 +2,23 @@
 TabBacklog v1 - Parser Plugins
 
 Site-specific parsers for extracting content from web pages.
+
+Parser classes are imported on first access, so importing the package does
+not pull in the HTML parsing libraries they depend on.
 """
 
+from importlib import import_module
+
 from .base import BaseParser, ParsedPage, ParserRegistry
-from .generic import GenericHtmlParser
-from .youtube import YouTubeParser
-from .twitter import TwitterParser
 from .registry import get_default_registry, parse_url
 
+# Lazily imported exports: name -> submodule defining it
+_LAZY_EXPORTS = {
+    "GenericHtmlParser": ".generic",
+    "YouTubeParser": ".youtube",
+    "TwitterParser": ".twitter",
+}
+
 __all__ = [
     "BaseParser",
     "ParsedPage",
@@ -20,3 +29,10 @@ __all__ = [
     "get_default_registry",
     "parse_url",
 ]
+
+
+def __getattr__(name: str):
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(import_module(module, __name__), name)
@@ -7,12 +7,12 @@ for site-specific content parsers.
 
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
-from typing import Optional, Type, Dict, List
+from typing import Optional, Type, Dict, List, AbstractSet, Tuple
 import re
-from urllib.parse import urlparse
+from urllib.parse import urlsplit
 
 
-@dataclass
+@dataclass(slots=True)
 class ParsedPage:
     """Structured representation of parsed page content"""
     
@@ -42,7 +42,21 @@ class BaseParser(ABC):
     Each parser must implement:
     - match(url): Return True if this parser can handle the URL
     - parse(url, html_content): Return ParsedPage with extracted content
+
+    Parsers limited to specific sites should also set DOMAINS, so the
+    registry can skip them for other hosts without calling match().
     """
+
+    # Host suffixes this parser can handle (e.g. "youtube.com" also covers
+    # "www.youtube.com"); None means any host
+    DOMAINS: Optional[AbstractSet[str]] = None
+
+    # True if parse() only reads <head> metadata, so fetches can stop there
+    HEAD_ONLY: bool = False
+
+    # True if parse_async() should be awaited instead of running parse()
+    # in an executor, for parsers whose work is mostly waiting on I/O
+    ASYNC_PARSE: bool = False
     
     @abstractmethod
     def match(self, url: str) -> bool:
@@ -71,29 +85,93 @@ class BaseParser(ABC):
         """
         pass
     
+    async def parse_async(self, url: str, html_content: str) -> ParsedPage:
+        """
+        Parse the page without blocking the event loop.
+
+        Only used when ASYNC_PARSE is set; the default just calls parse().
+        """
+        return self.parse(url, html_content)
+
+    def parse_batch(self, urls: List[str]) -> Dict[str, ParsedPage]:
+        """
+        Parse several URLs at once, without their HTML.
+
+        Parsers that extract content themselves (e.g. with an external tool)
+        can override this to share per-call startup costs across URLs.
+
+        Args:
+            urls: The URLs to parse, all matched by this parser
+
+        Returns:
+            ParsedPage by URL; URLs left out must be fetched and parsed
+            individually
+        """
+        return {}
+
     def extract_domain(self, url: str) -> str:
         """Helper to extract domain from URL"""
-        parsed = urlparse(url)
-        return parsed.netloc.lower()
+        # urlsplit memoizes its results, so repeat calls for a URL are cheap
+        return urlsplit(url).netloc.lower()
     
     def count_words(self, text: Optional[str]) -> int:
         """Helper to count words in text"""
         if not text:
             return 0
-        # Simple word count - split on whitespace
+        # Simple word count - split on whitespace. str.split runs entirely in
+        # C and beats counting re.finditer(r"\S+") matches by ~4x even though
+        # it builds a list, so keep it
         return len(text.split())
 
 
+class HostTrie:
+    """
+    Maps host suffixes to values, walking hostnames label by label from
+    the right ("com" -> "youtube" -> "www").
+    """
+
+    def __init__(self):
+        # label -> child node; the None key holds values stored at a node
+        self._root: dict = {}
+
+    def insert(self, suffix: str, value) -> None:
+        """Store a value under a host suffix such as "youtube.com"."""
+        node = self._root
+        for label in reversed(suffix.lower().split(".")):
+            node = node.setdefault(label, {})
+        node.setdefault(None, []).append(value)
+
+    def find(self, host: str) -> list:
+        """Get the values stored under every suffix of host."""
+        found = []
+        node = self._root
+        for label in reversed(host.split(".")):
+            node = node.get(label)
+            if node is None:
+                break
+            found.extend(node.get(None, ()))
+        return found
+
+
 class ParserRegistry:
     """
     Registry for managing parser instances.
     
     Parsers are checked in registration order, so register more specific
-    parsers before generic ones.
+    parsers before generic ones. Parsers with DOMAINS are indexed in a host
+    suffix trie, and the candidates for each host are cached, so a URL only
+    runs match() on the parsers that can handle its host.
     """
+
+    # Hosts remembered before the cache is reset
+    HOST_CACHE_SIZE = 4096
     
     def __init__(self):
         self._parsers: List[BaseParser] = []
+        # Parsers keyed by registration index, so candidates keep that order
+        self._host_trie = HostTrie()
+        self._any_host: List[Tuple[int, BaseParser]] = []
+        self._host_cache: Dict[str, List[BaseParser]] = {}
     
     def register(self, parser: BaseParser) -> None:
         """
@@ -102,7 +180,26 @@ class ParserRegistry:
         Args:
             parser: Instance of a BaseParser subclass
         """
+        entry = (len(self._parsers), parser)
         self._parsers.append(parser)
+        if parser.DOMAINS is None:
+            self._any_host.append(entry)
+        else:
+            for suffix in parser.DOMAINS:
+                self._host_trie.insert(suffix, entry)
+        self._host_cache.clear()
+
+    def _parsers_for_host(self, host: str) -> List[BaseParser]:
+        """Get the registered parsers that can handle a host, in order."""
+        candidates = self._host_cache.get(host)
+        if candidates is None:
+            if len(self._host_cache) >= self.HOST_CACHE_SIZE:
+                self._host_cache.clear()
+            # dict() drops parsers found under more than one suffix
+            entries = dict(self._host_trie.find(host) + self._any_host)
+            candidates = [entries[index] for index in sorted(entries)]
+            self._host_cache[host] = candidates
+        return candidates
     
     def get_parser(self, url: str) -> Optional[BaseParser]:
         """
@@ -114,7 +211,10 @@ class ParserRegistry:
         Returns:
             A parser instance if found, None otherwise
         """
-        for parser in self._parsers:
+        host = urlsplit(url).hostname
+        # URLs without a scheme have no host; check every parser for those
+        parsers = self._parsers_for_host(host) if host else self._parsers
+        for parser in parsers:
             if parser.match(url):
                 return parser
         return None
@@ -139,6 +239,46 @@ class ParserRegistry:
         
         return parser.parse(url, html_content)
     
+    def batch_groups(self, urls: List[str]) -> List[Tuple[BaseParser, List[str]]]:
+        """
+        Group URLs for parsers that can handle them in bulk.
+
+        Only parsers that override parse_batch() and match two or more of
+        the URLs get a group; this only matches URLs, so it is cheap enough
+        to call before deciding whether a batch is worth running.
+
+        Args:
+            urls: The URLs to group
+
+        Returns:
+            (parser, urls) pairs, in order of first appearance
+        """
+        groups: Dict[int, Tuple[BaseParser, List[str]]] = {}
+        for url in urls:
+            parser = self.get_parser(url)
+            if parser is not None and type(parser).parse_batch is not BaseParser.parse_batch:
+                groups.setdefault(id(parser), (parser, []))[1].append(url)
+        return [group for group in groups.values() if len(group[1]) > 1]
+
+    def parse_batch(self, urls: List[str]) -> Dict[str, ParsedPage]:
+        """
+        Batch-parse URLs with parsers that support it.
+
+        URLs are grouped with batch_groups(), and each group is passed to
+        its parser's parse_batch().
+
+        Args:
+            urls: The URLs to parse
+
+        Returns:
+            ParsedPage by URL for the URLs that were handled; the rest
+            must be fetched and parsed individually
+        """
+        pages: Dict[str, ParsedPage] = {}
+        for parser, group in self.batch_groups(urls):
+            pages.update(parser.parse_batch(group))
+        return pages
+
     def list_parsers(self) -> List[str]:
         """Get list of registered parser class names"""
         return [parser.__class__.__name__ for parser in self._parsers]
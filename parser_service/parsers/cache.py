@@ -0,0 +1,32 @@
+"""
+TabBacklog v1 - Parse Result Cache
+
+In-process TTL cache for parser results that are expensive to recompute,
+such as yt-dlp metadata lookups. Each worker process keeps its own cache.
+"""
+
+import threading
+from typing import Any, Hashable, Optional
+
+from cachetools import TTLCache
+
+CACHE_MAXSIZE = 4096
+CACHE_TTL_SECONDS = 4 * 3600
+
+
+class ParseCache:
+    """Thread-safe LRU cache whose entries expire after a TTL"""
+
+    def __init__(self, maxsize: int = CACHE_MAXSIZE, ttl: float = CACHE_TTL_SECONDS):
+        self._cache: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Get a cached value, or None if missing or expired."""
+        with self._lock:
+            return self._cache.get(key)
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Cache a value until the TTL runs out."""
+        with self._lock:
+            self._cache[key] = value
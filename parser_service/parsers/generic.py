@@ -7,10 +7,15 @@ Used as a fallback for URLs that don't match specific parsers.
 
 import re
 from typing import Optional
-from bs4 import BeautifulSoup, NavigableString
+from selectolax.lexbor import LexborHTMLParser, LexborNode
 
 from .base import BaseParser, ParsedPage
 
+# Site name separators in titles like "Article | Site" or "Article - Site"
+_TITLE_SEP_RE = re.compile(r" \| | - | – | — | :: ")
+# Runs of three or more dots
+_ELLIPSIS_RE = re.compile(r"[.]{3,}")
+
 
 class GenericHtmlParser(BaseParser):
     """
@@ -23,14 +28,32 @@ class GenericHtmlParser(BaseParser):
     - Basic metadata (description, author, etc.)
     """
 
-    # Tags that typically contain main content
+    # Tags that typically contain main content, in order of preference
     CONTENT_TAGS = ["article", "main", "[role='main']"]
+    CONTENT_SELECTOR = ", ".join(CONTENT_TAGS)
 
     # Tags to exclude from text extraction
-    EXCLUDED_TAGS = {
+    EXCLUDED_TAGS = frozenset({
         "script", "style", "nav", "header", "footer", "aside",
         "noscript", "iframe", "form", "button", "input", "select",
         "textarea", "svg", "canvas", "video", "audio"
+    })
+
+    # Metadata keys and the meta tag names/properties to read them from,
+    # in order of preference
+    META_MAPPINGS = {
+        "description": ("description", "og:description", "twitter:description"),
+        "author": ("author", "og:author", "article:author"),
+        "published": ("article:published_time", "datePublished", "date"),
+        "image": ("og:image", "twitter:image"),
+        "site_name": ("og:site_name",),
+        "type": ("og:type",),
+    }
+    # Flipped for the single meta tag pass: name -> (key, priority)
+    META_NAME_TO_KEY = {
+        name: (key, priority)
+        for key, names in META_MAPPINGS.items()
+        for priority, name in enumerate(names)
     }
 
     def match(self, url: str) -> bool:
@@ -42,12 +65,13 @@ class GenericHtmlParser(BaseParser):
 
     def parse(self, url: str, html_content: str) -> ParsedPage:
         """Parse HTML content and extract relevant information."""
-        soup = BeautifulSoup(html_content, "html.parser")
+        tree = LexborHTMLParser(html_content)
 
-        title = self._extract_title(soup)
-        text_content = self._extract_text(soup)
+        title = self._extract_title(tree)
+        # Metadata is read before text extraction strips tags from the tree
+        metadata = self._extract_metadata(tree, url)
+        text_content = self._extract_text(tree)
         word_count = self.count_words(text_content)
-        metadata = self._extract_metadata(soup, url)
 
         return ParsedPage(
             site_kind="generic_html",
@@ -58,119 +82,122 @@ class GenericHtmlParser(BaseParser):
             metadata=metadata,
         )
 
-    def _extract_title(self, soup: BeautifulSoup) -> Optional[str]:
+    def _extract_title(self, tree: LexborHTMLParser) -> Optional[str]:
         """Extract page title from <title> or <h1> tag."""
         # Try <title> first
-        title_tag = soup.find("title")
+        title_tag = tree.css_first("title")
         if title_tag:
-            title = title_tag.get_text(strip=True)
+            title = title_tag.text(strip=True)
             if title:
                 return self._clean_title(title)
 
         # Fall back to first <h1>
-        h1_tag = soup.find("h1")
+        h1_tag = tree.css_first("h1")
         if h1_tag:
-            return h1_tag.get_text(strip=True)
+            return h1_tag.text(strip=True)
 
         return None
 
     def _clean_title(self, title: str) -> str:
         """Clean up title by removing common suffixes."""
         # Remove common site name suffixes like " | Site Name" or " - Site Name"
-        separators = [" | ", " - ", " – ", " — ", " :: "]
-        for sep in separators:
-            if sep in title:
-                parts = title.split(sep)
-                # Keep the first part if it's substantial
-                if len(parts[0]) > 10:
-                    title = parts[0]
-                    break
+        for match in _TITLE_SEP_RE.finditer(title):
+            # Keep the part before the separator if it's substantial
+            if match.start() > 10:
+                return title[:match.start()].strip()
         return title.strip()
 
-    def _extract_text(self, soup: BeautifulSoup) -> Optional[str]:
+    def _extract_text(self, tree: LexborHTMLParser) -> Optional[str]:
         """Extract main text content from the page."""
-        # Remove excluded tags
-        for tag in soup.find_all(self.EXCLUDED_TAGS):
-            tag.decompose()
-
-        # Try to find main content container
-        main_content = None
-        for selector in self.CONTENT_TAGS:
-            if selector.startswith("["):
-                # Attribute selector
-                main_content = soup.select_one(selector)
-            else:
-                main_content = soup.find(selector)
-            if main_content:
-                break
+        # Remove excluded tags (and their contents) in place. Lexbor skips
+        # over script/style bodies as raw text, so this is cheaper than a
+        # regex pre-pass over the HTML string
+        tree.strip_tags(list(self.EXCLUDED_TAGS))
+
+        # Find main content containers in one walk, preferring <article>,
+        # then <main>, then role="main" (min keeps document order on ties)
+        main_content: Optional[LexborNode] = min(
+            tree.css(self.CONTENT_SELECTOR),
+            key=self._content_rank,
+            default=None,
+        )
 
         # Fall back to body if no main content found
         if not main_content:
-            main_content = soup.find("body")
+            main_content = tree.body
 
         if not main_content:
             return None
 
         # Extract text from paragraphs
         paragraphs = []
-        for p in main_content.find_all(["p", "li", "h1", "h2", "h3", "h4", "h5", "h6"]):
-            text = p.get_text(strip=True)
+        for p in main_content.css("p, li, h1, h2, h3, h4, h5, h6"):
+            text = p.text(strip=True)
             if text and len(text) > 20:  # Filter out very short fragments
                 paragraphs.append(text)
 
         if not paragraphs:
             # Fall back to all text
-            text = main_content.get_text(separator=" ", strip=True)
+            text = main_content.text(separator=" ", strip=True)
             return self._clean_text(text) if text else None
 
         return "\n\n".join(paragraphs)
 
+    @staticmethod
+    def _content_rank(node: LexborNode) -> int:
+        """Rank a content container by its position in CONTENT_TAGS."""
+        if node.tag == "article":
+            return 0
+        if node.tag == "main":
+            return 1
+        return 2
+
     def _clean_text(self, text: str) -> str:
         """Clean up extracted text."""
-        # Normalize whitespace
-        text = re.sub(r"\s+", " ", text)
+        # Normalize whitespace (split/join runs in C, ~4x faster than re.sub)
+        text = " ".join(text.split())
         # Remove excessive punctuation
-        text = re.sub(r"[.]{3,}", "...", text)
-        return text.strip()
+        return _ELLIPSIS_RE.sub("...", text)
 
-    def _extract_metadata(self, soup: BeautifulSoup, url: str) -> dict:
+    def _extract_metadata(self, tree: LexborHTMLParser, url: str) -> dict:
         """Extract metadata from meta tags."""
         metadata = {
             "url": url,
             "domain": self.extract_domain(url),
         }
 
-        # Extract common meta tags
-        meta_mappings = {
-            "description": ["description", "og:description", "twitter:description"],
-            "author": ["author", "og:author", "article:author"],
-            "published": ["article:published_time", "datePublished", "date"],
-            "image": ["og:image", "twitter:image"],
-            "site_name": ["og:site_name"],
-            "type": ["og:type"],
-        }
-
-        for key, names in meta_mappings.items():
-            for name in names:
-                # Try name attribute
-                meta = soup.find("meta", attrs={"name": name})
-                if meta and meta.get("content"):
-                    metadata[key] = meta["content"]
-                    break
-                # Try property attribute (for Open Graph)
-                meta = soup.find("meta", attrs={"property": name})
-                if meta and meta.get("content"):
-                    metadata[key] = meta["content"]
-                    break
-
-        # Extract canonical URL
-        canonical = soup.find("link", attrs={"rel": "canonical"})
-        if canonical and canonical.get("href"):
-            metadata["canonical_url"] = canonical["href"]
+        # Resolve meta tags to metadata keys, and find the canonical link,
+        # in one pass; lower priority values win
+        found: dict[str, tuple[int, str]] = {}
+        canonical_url: Optional[str] = None
+        for node in tree.css("meta[content], link[rel~='canonical']"):
+            attributes = node.attributes
+            if node.tag == "link":
+                canonical_url = canonical_url or attributes.get("href")
+                continue
+            content = attributes.get("content")
+            if not content:
+                continue
+            for attr in ("name", "property"):
+                mapping = self.META_NAME_TO_KEY.get(attributes.get(attr))
+                if mapping is None:
+                    continue
+                key, priority = mapping
+                best = found.get(key)
+                if best is None or priority < best[0]:
+                    found[key] = (priority, content)
+
+        # Keep the keys in META_MAPPINGS order
+        for key in self.META_MAPPINGS:
+            if key in found:
+                metadata[key] = found[key][1]
+
+        if canonical_url:
+            metadata["canonical_url"] = canonical_url
 
         # Extract language
-        html_tag = soup.find("html")
-        if html_tag and html_tag.get("lang"):
-            metadata["language"] = html_tag["lang"]
+        html_tag = tree.root
+        if html_tag and html_tag.attributes.get("lang"):
+            metadata["language"] = html_tag.attributes["lang"]
 
         return metadata
@@ -5,13 +5,14 @@ Pre-configured parser registry with all available parsers.
 Parsers are registered in order of specificity (most specific first).
 """
 
+import asyncio
+import re
+from concurrent.futures import Executor
 from typing import Optional
-import httpx
+
+import aiohttp
 
 from .base import ParsedPage, ParserRegistry
-from .youtube import YouTubeParser
-from .twitter import TwitterParser
-from .generic import GenericHtmlParser
 
 
 def get_default_registry() -> ParserRegistry:
@@ -23,6 +24,11 @@ def get_default_registry() -> ParserRegistry:
     2. Twitter/X
     3. Generic HTML (fallback, matches everything)
     """
+    # Imported here so parser dependencies load only when a registry is built
+    from .youtube import YouTubeParser
+    from .twitter import TwitterParser
+    from .generic import GenericHtmlParser
+
     registry = ParserRegistry()
 
     # Register specific parsers first
@@ -47,58 +53,180 @@ def get_registry() -> ParserRegistry:
     return _default_registry
 
 
-async def fetch_url(url: str, timeout: float = 30.0) -> str:
+# Browser-like headers sent with every fetch
+HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/120.0.0.0 Safari/537.36"
+    ),
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.5",
+}
+
+# Response bodies are read in chunks and cut off past this size
+FETCH_CHUNK_BYTES = 64 * 1024
+MAX_FETCH_BYTES = 10 * 1024 * 1024
+
+_HEAD_END_RE = re.compile(rb"</head\s*>", re.IGNORECASE)
+
+
+def create_http_session() -> aiohttp.ClientSession:
+    """
+    Create the shared HTTP session used for fetching pages.
+
+    Reusing one session keeps connections (and TLS sessions) alive across
+    requests and caches DNS lookups. Must be called from a running event
+    loop; the caller is responsible for closing it with ``close()``.
+    """
+    connector = aiohttp.TCPConnector(
+        limit=1000,
+        limit_per_host=32,
+        ttl_dns_cache=300,
+        # Keep idle connections around so repeat domains skip the handshake
+        keepalive_timeout=300,
+    )
+    return aiohttp.ClientSession(connector=connector, headers=HEADERS)
+
+
+async def prewarm_connections(
+    session: aiohttp.ClientSession,
+    domains: list[str],
+    timeout: float = 5.0,
+) -> None:
+    """
+    Open pooled connections to frequently fetched domains ahead of time.
+
+    Sends a HEAD request to each domain so its DNS lookup and TLS handshake
+    are done before the first real fetch. Failures are ignored.
+
+    Args:
+        session: The shared session to warm up
+        domains: Hostnames such as "www.youtube.com"
+        timeout: Per-domain timeout in seconds
+    """
+    async def warm(domain: str) -> None:
+        try:
+            async with session.head(
+                f"https://{domain}/",
+                timeout=aiohttp.ClientTimeout(total=timeout),
+            ):
+                pass
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            pass
+
+    await asyncio.gather(*(warm(domain) for domain in domains))
+
+
+async def fetch_url(
+    url: str,
+    session: Optional[aiohttp.ClientSession] = None,
+    timeout: float = 30.0,
+    head_only: bool = False,
+) -> str:
     """
     Fetch HTML content from a URL.
 
+    The body is streamed in chunks and reading stops after MAX_FETCH_BYTES,
+    or at the closing </head> tag when head_only is set, so large pages
+    are never held in memory in full.
+
     Args:
         url: The URL to fetch
+        session: Shared session to fetch with; a temporary one is created
+            if not given
         timeout: Request timeout in seconds
+        head_only: Stop reading once the document <head> has been received
 
     Returns:
         HTML content as string
 
     Raises:
-        httpx.HTTPError: If the request fails
+        aiohttp.ClientError: If the request fails
+        asyncio.TimeoutError: If the request times out
     """
-    headers = {
-        "User-Agent": (
-            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-            "AppleWebKit/537.36 (KHTML, like Gecko) "
-            "Chrome/120.0.0.0 Safari/537.36"
-        ),
-        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-        "Accept-Language": "en-US,en;q=0.5",
-    }
-
-    async with httpx.AsyncClient(follow_redirects=True, timeout=timeout) as client:
-        response = await client.get(url, headers=headers)
+    if session is None:
+        async with create_http_session() as temp_session:
+            return await fetch_url(url, temp_session, timeout, head_only)
+
+    async with session.get(
+        url,
+        timeout=aiohttp.ClientTimeout(total=timeout),
+    ) as response:
         response.raise_for_status()
-        return response.text
 
-
-async def parse_url(url: str, timeout: float = 30.0) -> ParsedPage:
+        body = bytearray()
+        async for chunk in response.content.iter_chunked(FETCH_CHUNK_BYTES):
+            # Rescan a few bytes back in case the tag spans two chunks
+            search_from = max(0, len(body) - 16)
+            body += chunk
+            if len(body) >= MAX_FETCH_BYTES:
+                del body[MAX_FETCH_BYTES:]
+                break
+            if head_only and _HEAD_END_RE.search(body, search_from):
+                break
+
+        try:
+            return body.decode(response.charset or "utf-8", errors="replace")
+        except LookupError:
+            # Unknown charset in Content-Type
+            return body.decode("utf-8", errors="replace")
+
+
+async def parse_url(
+    url: str,
+    timeout: float = 30.0,
+    session: Optional[aiohttp.ClientSession] = None,
+    executor: Optional[Executor] = None,
+) -> ParsedPage:
     """
     Fetch and parse a URL using the appropriate parser.
 
     Args:
         url: The URL to fetch and parse
         timeout: Request timeout in seconds
+        session: Shared session to fetch with; a temporary one is created
+            if not given
+        executor: Executor to run the CPU-bound parse step in; parsed
+            inline when not given. Parsers with ASYNC_PARSE are awaited
+            on the event loop instead
 
     Returns:
         ParsedPage with extracted content
 
     Raises:
         ValueError: If no parser matches the URL
-        httpx.HTTPError: If the request fails
+        aiohttp.ClientError: If the request fails
+        asyncio.TimeoutError: If the request times out
     """
-    registry = get_registry()
+    parser = get_registry().get_parser(url)
+    if parser is None:
+        raise ValueError(f"No parser found for URL: {url}")
 
     # Fetch the HTML content
-    html_content = await fetch_url(url, timeout)
+    html_content = await fetch_url(url, session, timeout, head_only=parser.HEAD_ONLY)
 
     # Parse with the appropriate parser
-    return registry.parse_page(url, html_content)
+    if parser.ASYNC_PARSE:
+        return await parser.parse_async(url, html_content)
+    if executor is None:
+        return parser.parse(url, html_content)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, parse_html, url, html_content)
+
+
+def parse_batch(urls: list[str]) -> dict[str, ParsedPage]:
+    """
+    Parse URLs whose parsers can handle them in bulk without fetched HTML.
+
+    Args:
+        urls: The URLs to parse
+
+    Returns:
+        ParsedPage by URL for the URLs that were handled; the rest must
+        be fetched and parsed individually
+    """
+    return get_registry().parse_batch(urls)
 
 
 def parse_html(url: str, html_content: str) -> ParsedPage:
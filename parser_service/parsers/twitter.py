@@ -5,12 +5,19 @@ Parses Twitter (X) posts/tweets by extracting content from meta tags
 and structured data.
 """
 
+import hashlib
 import re
 from typing import Optional
-from urllib.parse import urlparse
-from bs4 import BeautifulSoup
+from urllib.parse import SplitResult, urlsplit
 
 from .base import BaseParser, ParsedPage
+from .cache import ParseCache
+from .meta import PageMeta, extract_meta
+
+# Title formats "Display Name on X: ..." and "Display Name (@username) / X"
+_AUTHOR_TITLE_RE = re.compile(r'^([^(@]+?)(?:\s+on\s+(?:X|Twitter):|(?:\s*\(@\w+\)\s*/\s*(?:X|Twitter)))')
+# Tweet ID in paths like /status/1234567890
+_STATUS_ID_RE = re.compile(r"/status/(\d+)")
 
 
 class TwitterParser(BaseParser):
@@ -28,41 +35,44 @@ class TwitterParser(BaseParser):
     """
 
     # Twitter/X domains
-    TWITTER_DOMAINS = {"twitter.com", "www.twitter.com", "x.com", "www.x.com", "mobile.twitter.com"}
+    TWITTER_DOMAINS = frozenset({"twitter.com", "www.twitter.com", "x.com", "www.x.com", "mobile.twitter.com"})
+    DOMAINS = TWITTER_DOMAINS
+
+    # Everything we extract comes from <title> and <meta> tags
+    HEAD_ONLY = True
 
-    # URL patterns for tweets/posts
-    TWEET_PATTERNS = [
-        r"(?:https?://)?(?:www\.|mobile\.)?(?:twitter|x)\.com/\w+/status/\d+",
-    ]
+    def __init__(self):
+        # Parsed pages by URL and HTML hash, so re-fetched tweets skip parsing
+        self._page_cache = ParseCache()
 
     def match(self, url: str) -> bool:
         """Check if URL is a Twitter/X post."""
-        domain = self.extract_domain(url)
-        if domain not in self.TWITTER_DOMAINS:
-            return False
-
-        # Check if it's a status/post URL (not profile, search, etc.)
-        for pattern in self.TWEET_PATTERNS:
-            if re.match(pattern, url):
-                return True
-
-        # Also match if path contains /status/
-        parsed = urlparse(url)
-        return "/status/" in parsed.path
+        # Only status/post URLs (not profile, search, etc.)
+        parts = urlsplit(url)
+        return parts.netloc.lower() in self.TWITTER_DOMAINS and "/status/" in parts.path
 
     def parse(self, url: str, html_content: str) -> ParsedPage:
         """Parse Twitter/X post from HTML content."""
-        soup = BeautifulSoup(html_content, "html.parser")
+        cache_key = (url, hashlib.blake2b(html_content.encode(), digest_size=16).digest())
+        cached = self._page_cache.get(cache_key)
+        if cached is not None:
+            return cached
 
-        title = self._extract_title(soup)
-        text_content = self._extract_tweet_text(soup)
-        author = self._extract_author(soup, url)
-        metadata = self._extract_metadata(soup, url, author)
+        # One pass indexes every meta tag; the _extract_* helpers only do dict lookups
+        meta = extract_meta(html_content)
+
+        # Split the URL once for the author and metadata helpers
+        parts = urlsplit(url)
+
+        title = self._extract_title(meta)
+        text_content = self._extract_tweet_text(meta)
+        author = self._extract_author(meta, parts)
+        metadata = self._extract_metadata(meta, url, parts, author)
 
         # Combine title and text for full content
         text_full = text_content or title
 
-        return ParsedPage(
+        page = ParsedPage(
             site_kind="twitter",
             title=title,
             text_full=text_full,
@@ -70,23 +80,19 @@ class TwitterParser(BaseParser):
             video_seconds=None,
             metadata=metadata,
         )
+        self._page_cache.set(cache_key, page)
+        return page
 
-    def _extract_title(self, soup: BeautifulSoup) -> Optional[str]:
+    def _extract_title(self, meta: PageMeta) -> Optional[str]:
         """Extract title from Twitter page."""
-        # Try og:title first
-        og_title = soup.find("meta", attrs={"property": "og:title"})
-        if og_title and og_title.get("content"):
-            return og_title["content"]
-
-        # Try twitter:title
-        tw_title = soup.find("meta", attrs={"name": "twitter:title"})
-        if tw_title and tw_title.get("content"):
-            return tw_title["content"]
+        # Try og:title first, then twitter:title
+        title = meta.get("og:title") or meta.get("twitter:title")
+        if title:
+            return title
 
         # Fall back to page title
-        title_tag = soup.find("title")
-        if title_tag:
-            title = title_tag.get_text(strip=True)
+        if meta.title is not None:
+            title = meta.title
             # Clean up Twitter title format
             if " / X" in title:
                 title = title.replace(" / X", "")
@@ -96,61 +102,48 @@ class TwitterParser(BaseParser):
 
         return None
 
-    def _extract_tweet_text(self, soup: BeautifulSoup) -> Optional[str]:
+    def _extract_tweet_text(self, meta: PageMeta) -> Optional[str]:
         """Extract the actual tweet text."""
         # Try og:description - usually contains the tweet
-        og_desc = soup.find("meta", attrs={"property": "og:description"})
-        if og_desc and og_desc.get("content"):
-            text = og_desc["content"]
+        text = meta.get("og:description")
+        if text:
             # Twitter often wraps text in quotes for og:description
             if text.startswith('"') and text.endswith('"'):
                 text = text[1:-1]
             return text
 
-        # Try twitter:description
-        tw_desc = soup.find("meta", attrs={"name": "twitter:description"})
-        if tw_desc and tw_desc.get("content"):
-            return tw_desc["content"]
-
-        # Try standard description
-        desc = soup.find("meta", attrs={"name": "description"})
-        if desc and desc.get("content"):
-            return desc["content"]
-
-        return None
+        # Try twitter:description, then standard description
+        return meta.get("twitter:description") or meta.get("description") or None
 
-    def _extract_author(self, soup: BeautifulSoup, url: str) -> dict:
+    def _extract_author(self, meta: PageMeta, parts: SplitResult) -> dict:
         """Extract author information."""
         author = {}
 
         # Extract username from URL
-        parsed = urlparse(url)
-        path_parts = parsed.path.strip("/").split("/")
+        path_parts = parts.path.strip("/").split("/")
         if path_parts:
             author["username"] = path_parts[0]
 
         # Try to get display name from title or meta
         # Title format is often: "Display Name on X: "tweet text""
-        title_tag = soup.find("title")
-        if title_tag:
-            title_text = title_tag.get_text(strip=True)
+        if meta.title is not None:
             # Pattern: "Display Name on X: ..." or "Display Name (@username) / X"
-            match = re.match(r'^([^(@]+?)(?:\s+on\s+(?:X|Twitter):|(?:\s*\(@\w+\)\s*/\s*(?:X|Twitter)))', title_text)
+            match = _AUTHOR_TITLE_RE.match(meta.title)
             if match:
                 author["display_name"] = match.group(1).strip()
 
         # Try twitter:creator meta tag
-        creator = soup.find("meta", attrs={"name": "twitter:creator"})
-        if creator and creator.get("content"):
-            author["twitter_handle"] = creator["content"]
+        creator = meta.get("twitter:creator")
+        if creator:
+            author["twitter_handle"] = creator
 
         return author
 
-    def _extract_metadata(self, soup: BeautifulSoup, url: str, author: dict) -> dict:
+    def _extract_metadata(self, meta: PageMeta, url: str, parts: SplitResult, author: dict) -> dict:
         """Extract metadata from the page."""
         metadata = {
             "url": url,
-            "domain": self.extract_domain(url),
+            "domain": parts.netloc.lower(),
             "platform": "twitter" if "twitter.com" in url else "x",
         }
 
@@ -163,35 +156,29 @@ class TwitterParser(BaseParser):
         if tweet_id:
             metadata["tweet_id"] = tweet_id
 
-        # Try to get image
-        og_image = soup.find("meta", attrs={"property": "og:image"})
-        if og_image and og_image.get("content"):
-            metadata["image"] = og_image["content"]
-
-        # Try to get site name
-        og_site = soup.find("meta", attrs={"property": "og:site_name"})
-        if og_site and og_site.get("content"):
-            metadata["site_name"] = og_site["content"]
-
-        # Check for media type indicators
-        og_type = soup.find("meta", attrs={"property": "og:type"})
-        if og_type and og_type.get("content"):
-            metadata["content_type"] = og_type["content"]
+        # Image, site name and media type indicators
+        for key, name in (
+            ("image", "og:image"),
+            ("site_name", "og:site_name"),
+            ("content_type", "og:type"),
+        ):
+            content = meta.get(name)
+            if content:
+                metadata[key] = content
 
         # Check for video content
-        og_video = soup.find("meta", attrs={"property": "og:video"})
-        if og_video:
+        if "og:video" in meta.tags:
             metadata["has_video"] = True
 
         # Check for card type
-        tw_card = soup.find("meta", attrs={"name": "twitter:card"})
-        if tw_card and tw_card.get("content"):
-            metadata["card_type"] = tw_card["content"]
+        card_type = meta.get("twitter:card")
+        if card_type:
+            metadata["card_type"] = card_type
 
         return metadata
 
     def _extract_tweet_id(self, url: str) -> Optional[str]:
         """Extract tweet ID from URL."""
         # Pattern: /status/1234567890
-        match = re.search(r"/status/(\d+)", url)
+        match = _STATUS_ID_RE.search(url)
         return match.group(1) if match else None
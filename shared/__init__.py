@@ -4,6 +4,16 @@ TabBacklog v1 - Shared Utilities
 Common utilities used across services.
 """
 
-from .search import EmbeddingGenerator, SearchService
+from .search import (
+    EmbeddingGenerator,
+    SearchService,
+    close_embedding_generator,
+    get_embedding_generator,
+)
 
-__all__ = ["EmbeddingGenerator", "SearchService"]
+__all__ = [
+    "EmbeddingGenerator",
+    "SearchService",
+    "close_embedding_generator",
+    "get_embedding_generator",
+]
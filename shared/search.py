@@ -4,20 +4,56 @@ TabBacklog v1 - Search Utilities
 Embedding generation and semantic search functionality.
 """
 
+import asyncio
+import hashlib
 import logging
 import os
 from typing import Optional
 
 import httpx
+import numpy as np
+import orjson
+import tiktoken
+from cachetools import TTLCache
 
 logger = logging.getLogger(__name__)
 
+# Connection pool for the embedding API; requests all go to one host
+EMBEDDING_POOL_LIMITS = httpx.Limits(max_keepalive_connections=100, max_connections=200)
+EMBEDDING_TIMEOUT = httpx.Timeout(60.0, connect=5.0)
+EMBEDDING_CONNECT_RETRIES = 2
+
+# Tokenizer used to truncate input, loaded on first use since tiktoken
+# may need to download it
+_encoding: Optional[tiktoken.Encoding] = None
+
+# Default token budget per text; override with EMBEDDING_MAX_TOKENS
+EMBEDDING_MAX_TOKENS = 2048
+
+# Concurrent generate() calls are coalesced into one request per batch
+EMBEDDING_BATCH_MAX = 64
+EMBEDDING_BATCH_WAIT_SECONDS = 0.01
+
+# Document embeddings keyed by model and content hash, so unchanged tabs
+# skip the embedding API on re-index. Vectors are stored as float16 bytes
+# (1.5 KB for 768 dims instead of ~25 KB as a list of Python floats).
+EMBEDDING_CACHE_MAXSIZE = 10_000
+EMBEDDING_CACHE_TTL_SECONDS = 7 * 86400
+_embedding_cache: TTLCache = TTLCache(maxsize=EMBEDDING_CACHE_MAXSIZE, ttl=EMBEDDING_CACHE_TTL_SECONDS)
+
 
 class EmbeddingGenerator:
     """
     Generate embeddings using an OpenAI-compatible API.
 
     Supports local models via LM Studio, Ollama, or cloud APIs.
+
+    The HTTP client keeps a pool of keep-alive connections (HTTP/2 where
+    the API supports it), so share one instance per process via
+    get_embedding_generator() rather than creating one per request.
+
+    Texts passed to generate() by concurrent callers within a short window
+    are sent to the API together as one batched request.
     """
 
     def __init__(
@@ -25,24 +61,49 @@ class EmbeddingGenerator:
         api_base: str | None = None,
         api_key: str | None = None,
         model_name: str | None = None,
+        max_tokens: int | None = None,
+        max_batch_size: int = EMBEDDING_BATCH_MAX,
+        max_wait_seconds: float = EMBEDDING_BATCH_WAIT_SECONDS,
     ):
         self.api_base = api_base or os.environ.get("EMBEDDING_API_BASE", "http://localhost:1234/v1")
         self.api_key = api_key or os.environ.get("EMBEDDING_API_KEY", "dummy_key")
         self.model_name = model_name or os.environ.get("EMBEDDING_MODEL_NAME", "text-embedding-nomic-embed-text-v1.5")
+        self.max_tokens = max_tokens or int(os.environ.get("EMBEDDING_MAX_TOKENS", EMBEDDING_MAX_TOKENS))
+        self.max_batch_size = max_batch_size
+        self.max_wait_seconds = max_wait_seconds
         self._client: Optional[httpx.AsyncClient] = None
+        # Texts waiting for the next batched request, with their callers' futures
+        self._pending: list[tuple[str, asyncio.Future]] = []
+        self._flush_task: Optional[asyncio.Task] = None
+        # Requests for full batches, kept referenced until they finish
+        self._send_tasks: set[asyncio.Task] = set()
 
     async def _get_client(self) -> httpx.AsyncClient:
-        """Get or create async HTTP client"""
+        """Get or create the pooled async HTTP client"""
         if self._client is None:
+            # Pool limits and HTTP/2 live on the transport when one is passed
+            transport = httpx.AsyncHTTPTransport(
+                http2=True,
+                limits=EMBEDDING_POOL_LIMITS,
+                retries=EMBEDDING_CONNECT_RETRIES,
+            )
             self._client = httpx.AsyncClient(
                 base_url=self.api_base,
                 headers={"Authorization": f"Bearer {self.api_key}"},
-                timeout=60.0,
+                timeout=EMBEDDING_TIMEOUT,
+                transport=transport,
             )
         return self._client
 
     async def close(self):
         """Close the HTTP client"""
+        if self._flush_task:
+            self._flush_task.cancel()
+            self._flush_task = None
+        for task in self._send_tasks:
+            task.cancel()
+        for _, future in self._take_pending():
+            future.cancel()
         if self._client:
             await self._client.aclose()
             self._client = None
@@ -51,18 +112,85 @@ class EmbeddingGenerator:
         """
         Generate an embedding for the given text.
 
+        The text is queued and sent with any other texts requested within
+        max_wait_seconds, up to max_batch_size per request.
+
         Args:
             text: Text to embed
 
         Returns:
             List of floats representing the embedding vector
         """
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((text, future))
+
+        if len(self._pending) >= self.max_batch_size:
+            # Batch is full, so send it now instead of waiting for the timer.
+            # The request runs in its own task: the batch holds other
+            # callers' texts, so cancelling this caller must not cancel it
+            task = asyncio.create_task(self._send(self._take_pending()))
+            self._send_tasks.add(task)
+            task.add_done_callback(self._send_tasks.discard)
+        elif self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_after_wait())
+
+        return await future
+
+    def _truncate(self, text: str) -> str:
+        """Truncate text to the model's token budget."""
+        # Tokens cover at least one byte each, so short texts can't be over
+        if len(text) * 4 <= self.max_tokens:
+            return text
+        global _encoding
+        if _encoding is None:
+            _encoding = tiktoken.get_encoding("cl100k_base")
+        token_ids = _encoding.encode(text, disallowed_special=())
+        if len(token_ids) > self.max_tokens:
+            text = _encoding.decode(token_ids[:self.max_tokens])
+        return text
+
+    def _take_pending(self) -> list[tuple[str, asyncio.Future]]:
+        """Remove and return the queued texts."""
+        pending, self._pending = self._pending, []
+        return pending
+
+    async def _flush_after_wait(self):
+        """Send whatever is queued once the batching window closes."""
+        await asyncio.sleep(self.max_wait_seconds)
+        self._flush_task = None
+        await self._send(self._take_pending())
+
+    async def _send(self, pending: list[tuple[str, asyncio.Future]]):
+        """Embed queued texts in one request and resolve their futures."""
+        if not pending:
+            return
+
+        try:
+            if len(pending) == 1:
+                embeddings = [await self._embed_one(pending[0][0])]
+            else:
+                embeddings = await self.generate_batch([text for text, _ in pending])
+        except asyncio.CancelledError:
+            for _, future in pending:
+                future.cancel()
+            raise
+        except Exception as e:
+            for _, future in pending:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), embedding in zip(pending, embeddings):
+            if not future.done():
+                future.set_result(embedding)
+
+    async def _embed_one(self, text: str) -> list[float]:
+        """Embed a single text in its own request."""
         client = await self._get_client()
 
-        # Truncate text if too long (most models have a limit)
-        max_chars = 8000
-        if len(text) > max_chars:
-            text = text[:max_chars]
+        # Truncate by tokens so the text fits the model's context
+        # regardless of script
+        text = self._truncate(text)
 
         response = await client.post(
             "/embeddings",
@@ -73,7 +201,7 @@ class EmbeddingGenerator:
         )
         response.raise_for_status()
 
-        data = response.json()
+        data = orjson.loads(response.content)
         return data["data"][0]["embedding"]
 
     async def generate_batch(self, texts: list[str]) -> list[list[float]]:
@@ -88,9 +216,8 @@ class EmbeddingGenerator:
         """
         client = await self._get_client()
 
-        # Truncate texts
-        max_chars = 8000
-        truncated = [t[:max_chars] if len(t) > max_chars else t for t in texts]
+        # Truncate texts to the token budget
+        truncated = [self._truncate(t) for t in texts]
 
         response = await client.post(
             "/embeddings",
@@ -101,7 +228,7 @@ class EmbeddingGenerator:
         )
         response.raise_for_status()
 
-        data = response.json()
+        data = orjson.loads(response.content)
         # Sort by index to ensure correct order
         embeddings = sorted(data["data"], key=lambda x: x["index"])
         return [e["embedding"] for e in embeddings]
@@ -136,11 +263,11 @@ class SearchService:
             parts.append(f"Summary: {summary}")
 
         if text:
-            # Use first portion of text
-            text_preview = text[:2000] if len(text) > 2000 else text
-            parts.append(f"Content: {text_preview}")
+            # Use first portion of text; slicing a shorter string returns
+            # it without copying
+            parts.append(f"Content: {text[:2000]}")
 
-        return "\n\n".join(parts) if parts else ""
+        return "\n\n".join(parts)
 
     async def generate_query_embedding(self, query: str) -> list[float]:
         """
@@ -163,6 +290,11 @@ class SearchService:
         """
         Generate an embedding for a document (tab content).
 
+        Results are cached by content hash, so documents whose title,
+        summary and text preview are unchanged only hit the API once per
+        cache TTL. Vectors are rounded to float16 precision whether or not
+        they came from the cache.
+
         Args:
             title: Document title
             summary: LLM-generated summary
@@ -175,7 +307,38 @@ class SearchService:
         if not combined_text:
             raise ValueError("No text provided for embedding")
 
-        return await self.embedding_generator.generate(combined_text)
+        model_name = self.embedding_generator.model_name
+        key = hashlib.blake2b(f"{model_name}|{combined_text}".encode(), digest_size=16).digest()
+        cached = _embedding_cache.get(key)
+        if cached is not None:
+            return np.frombuffer(cached, dtype=np.float16).astype(np.float32).tolist()
+
+        embedding = np.asarray(
+            await self.embedding_generator.generate(combined_text), dtype=np.float16
+        )
+        _embedding_cache[key] = embedding.tobytes()
+        # Return the float16-rounded vector a cache hit would, so a document
+        # gets the same embedding whether or not it was cached
+        return embedding.astype(np.float32).tolist()
+
+
+_embedding_generator: Optional[EmbeddingGenerator] = None
+
+
+def get_embedding_generator() -> EmbeddingGenerator:
+    """Get the process-wide embedding generator"""
+    global _embedding_generator
+    if _embedding_generator is None:
+        _embedding_generator = EmbeddingGenerator()
+    return _embedding_generator
+
+
+async def close_embedding_generator():
+    """Close the process-wide embedding generator's HTTP client"""
+    global _embedding_generator
+    if _embedding_generator:
+        await _embedding_generator.close()
+        _embedding_generator = None
 
 
 async def test_embedding_connection() -> bool:
@@ -0,0 +1,52 @@
+"""
+TabBacklog v1 - Batched Smoke Tests
+
+Checks the status of every read-only endpoint with a single request to
+/api/batch, which the server only serves with ENABLE_BATCH_API=1. The
+per-endpoint tests in test_api_endpoints.py cover the same endpoints in
+more detail.
+
+Run with:
+    pytest tests/e2e/test_smoke_batch.py -m smoke
+"""
+
+import httpx
+import pytest
+
+# path -> accepted status codes (500 where the database may not be set up)
+SMOKE_CHECKS = {
+    "/health": {200},
+    "/": {200},
+    "/tabs": {200, 500},
+    "/tabs?status=new&content_type=article&is_processed=false&search=test": {200, 500},
+    "/stats": {200, 500},
+    "/export/json": {405},
+    "/export/markdown": {405},
+    "/export/obsidian": {405},
+    "/search/generate-embeddings": {405},
+    "/static/css/style.css": {200},
+    "/static/nonexistent.xyz": {404},
+    "/this-page-does-not-exist": {404},
+}
+
+
+@pytest.mark.e2e
+@pytest.mark.smoke
+async def test_read_only_endpoints(base_url: str):
+    """Test every read-only endpoint's status in one batch request."""
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        response = await client.post(
+            "/api/batch",
+            json=[{"path": path, "method": "GET"} for path in SMOKE_CHECKS],
+        )
+
+    if response.status_code == 404:
+        pytest.skip("Server started without ENABLE_BATCH_API=1")
+    assert response.status_code == 200
+    results = {item["path"]: item for item in response.json()}
+
+    for path, expected in SMOKE_CHECKS.items():
+        assert results[path]["status"] in expected, path
+
+    assert "text/css" in results["/static/css/style.css"]["content_type"]
+    assert "text/html" in results["/"]["content_type"]
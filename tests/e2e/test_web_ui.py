@@ -1,11 +1,14 @@
 """
 TabBacklog v1 - Web UI End-to-End Tests
 
-Playwright-based e2e tests for the web interface.
+Playwright-based e2e tests for the web interface. They use the sync API;
+checks on several elements are batched into one browser call with
+hidden_selectors() rather than run as concurrent async expect() calls.
 
 Run with:
     pytest tests/e2e/ -m e2e --headed  # With browser visible
     pytest tests/e2e/ -m e2e           # Headless mode
+    pytest tests/e2e/ -n auto -m e2e   # One server per xdist worker
 
 Prerequisites:
     1. Install Playwright browsers: playwright install
@@ -13,32 +16,81 @@ Prerequisites:
     3. Ensure database has test data
 """
 
+from typing import Generator
+
 import pytest
-from playwright.sync_api import Page, expect
+from playwright.sync_api import BrowserContext, Page, expect
+
+
+# Returns the selectors that don't match a visible element: rendered (no
+# display:none or visibility:hidden up the tree) with a non-empty box,
+# matching what expect(...).to_be_visible() checks
+_HIDDEN_SELECTORS_JS = """
+    selectors => selectors.filter(selector => {
+        const el = document.querySelector(selector);
+        if (!el || !el.checkVisibility({visibilityProperty: true})) return true;
+        const box = el.getBoundingClientRect();
+        return box.width === 0 || box.height === 0;
+    })
+"""
+
+
+def hidden_selectors(page: Page, selectors: list[str]) -> list[str]:
+    """
+    Check several elements' visibility in one browser round trip.
+
+    Locators themselves are lazy: page.locator() doesn't talk to the
+    browser, so there is nothing to gain from caching them. Round trips
+    come from actions and expect() checks, which this batches.
+    """
+    return page.evaluate(_HIDDEN_SELECTORS_JS, selectors)
+
+
+def wait_for_tabs_loaded(page: Page) -> None:
+    """Wait for the initial HTMX load of the tab list to finish."""
+    page.wait_for_selector("#tabs-body[data-loaded]", state="attached", timeout=5000)
+
+
+@pytest.fixture(scope="module")
+def homepage(browser_context: BrowserContext, base_url: str) -> Generator[Page, None, None]:
+    """
+    Homepage loaded once and shared by tests that only read the DOM.
+
+    Tests that interact with the page (typing, toggling, HTMX requests)
+    use their own page instead.
+    """
+    page = browser_context.new_page()
+    page.goto(base_url)
+    wait_for_tabs_loaded(page)
+    yield page
+    page.close()
+
+
+@pytest.fixture(scope="module")
+def stats_page(browser_context: BrowserContext, base_url: str) -> Generator[Page, None, None]:
+    """Stats page loaded once and shared by the tests that read it."""
+    page = browser_context.new_page()
+    page.goto(f"{base_url}/stats")
+    yield page
+    page.close()
 
 
 @pytest.mark.e2e
 class TestPageLoad:
     """Tests for basic page loading and structure."""
 
-    def test_homepage_loads(self, page: Page, base_url: str):
+    def test_homepage_loads(self, homepage: Page):
         """Test that the homepage loads successfully."""
-        page.goto(base_url)
-
         # Check page title
-        expect(page).to_have_title("TabBacklog - Your Tabs")
+        expect(homepage).to_have_title("TabBacklog - Your Tabs")
 
         # Check main elements are present
-        expect(page.locator(".filters-section")).to_be_visible()
-        expect(page.locator(".tabs-table")).to_be_visible()
-        expect(page.locator(".actions-bar")).to_be_visible()
+        assert not hidden_selectors(homepage, [".filters-section", ".tabs-table", ".actions-bar"])
 
-    def test_stats_page_loads(self, page: Page, base_url: str):
+    def test_stats_page_loads(self, stats_page: Page):
         """Test that the stats page loads successfully."""
-        page.goto(f"{base_url}/stats")
-
         # Should have stats content
-        expect(page.locator("body")).to_contain_text("Total")
+        expect(stats_page.locator("body")).to_contain_text("Total")
 
     def test_health_endpoint(self, page: Page, base_url: str):
         """Test the health check endpoint."""
@@ -53,31 +105,27 @@ class TestPageLoad:
 class TestFilters:
     """Tests for filtering functionality."""
 
-    def test_filter_elements_present(self, page: Page, base_url: str):
+    def test_filter_elements_present(self, homepage: Page):
         """Test that all filter elements are present."""
-        page.goto(base_url)
-
-        expect(page.locator("#search-input")).to_be_visible()
-        expect(page.locator("#status-filter")).to_be_visible()
-        expect(page.locator("#content-type-filter")).to_be_visible()
-        expect(page.locator("#processed-filter")).to_be_visible()
-        expect(page.locator("#read-time-filter")).to_be_visible()
-
-    def test_status_filter_options(self, page: Page, base_url: str):
+        assert not hidden_selectors(homepage, [
+            "#search-input",
+            "#status-filter",
+            "#content-type-filter",
+            "#processed-filter",
+            "#read-time-filter",
+        ])
+
+    def test_status_filter_options(self, homepage: Page):
         """Test that status filter has expected options."""
-        page.goto(base_url)
-
-        status_filter = page.locator("#status-filter")
+        status_filter = homepage.locator("#status-filter")
         options = status_filter.locator("option").all_text_contents()
 
         # Should have "All Status" and various status options
         assert "All Status" in options
 
-    def test_processed_filter_options(self, page: Page, base_url: str):
+    def test_processed_filter_options(self, homepage: Page):
         """Test that processed filter has correct options."""
-        page.goto(base_url)
-
-        processed_filter = page.locator("#processed-filter")
+        processed_filter = homepage.locator("#processed-filter")
         options = processed_filter.locator("option").all_text_contents()
 
         assert "All" in options
@@ -89,62 +137,45 @@ class TestFilters:
         page.goto(base_url)
 
         # Wait for initial load
-        page.wait_for_load_state("networkidle")
-
-        # Track network requests
-        requests = []
-        page.on("request", lambda r: requests.append(r.url) if "/tabs" in r.url else None)
-
-        # Change status filter
-        page.select_option("#status-filter", index=1)
+        wait_for_tabs_loaded(page)
 
-        # Wait for HTMX request
-        page.wait_for_timeout(500)
+        # Changing the status filter should make a request to /tabs
+        with page.expect_request(lambda r: "/tabs" in r.url) as request_info:
+            page.select_option("#status-filter", index=1)
 
-        # Should have made a request to /tabs
-        assert any("/tabs" in r for r in requests)
+        assert "/tabs" in request_info.value.url
 
 
 @pytest.mark.e2e
 class TestSearch:
     """Tests for search functionality."""
 
-    def test_search_input_exists(self, page: Page, base_url: str):
+    def test_search_input_exists(self, homepage: Page):
         """Test that search input is present and functional."""
-        page.goto(base_url)
-
-        search_input = page.locator("#search-input")
+        search_input = homepage.locator("#search-input")
         expect(search_input).to_be_visible()
         expect(search_input).to_have_attribute("placeholder", "Search tabs...")
 
-    def test_semantic_search_toggle_exists(self, page: Page, base_url: str):
+    def test_semantic_search_toggle_exists(self, homepage: Page):
         """Test that semantic search toggle is present."""
-        page.goto(base_url)
-
-        toggle = page.locator("#semantic-search-toggle")
+        toggle = homepage.locator("#semantic-search-toggle")
         expect(toggle).to_be_attached()
 
     def test_search_triggers_request(self, page: Page, base_url: str):
         """Test that typing in search triggers a request."""
         page.goto(base_url)
-        page.wait_for_load_state("networkidle")
-
-        requests = []
-        page.on("request", lambda r: requests.append(r.url) if "/tabs" in r.url or "/search" in r.url else None)
+        wait_for_tabs_loaded(page)
 
-        # Type in search
-        page.fill("#search-input", "test query")
+        # Typing in search should make a (debounced) search request
+        with page.expect_request(lambda r: "/tabs" in r.url or "/search" in r.url) as request_info:
+            page.fill("#search-input", "test query")
 
-        # Wait for debounced request
-        page.wait_for_timeout(500)
-
-        # Should have made a search request
-        assert len(requests) > 0
+        assert request_info.value.url
 
     def test_semantic_search_toggle_changes_endpoint(self, page: Page, base_url: str):
         """Test that toggling semantic search changes the search endpoint."""
         page.goto(base_url)
-        page.wait_for_load_state("networkidle")
+        wait_for_tabs_loaded(page)
 
         # Enable semantic search
         page.check("#semantic-search-toggle")
@@ -164,29 +195,23 @@ class TestSearch:
 class TestTabSelection:
     """Tests for tab selection functionality."""
 
-    def test_select_all_checkbox_exists(self, page: Page, base_url: str):
+    def test_select_all_checkbox_exists(self, homepage: Page):
         """Test that select all checkbox is present."""
-        page.goto(base_url)
-
-        select_all = page.locator("#select-all")
+        select_all = homepage.locator("#select-all")
         expect(select_all).to_be_visible()
 
-    def test_selected_count_display(self, page: Page, base_url: str):
+    def test_selected_count_display(self, homepage: Page):
         """Test that selected count is displayed."""
-        page.goto(base_url)
-
-        count_display = page.locator("#selected-count")
+        count_display = homepage.locator("#selected-count")
         expect(count_display).to_be_visible()
         expect(count_display).to_have_text("0")
 
-    def test_export_buttons_disabled_when_none_selected(self, page: Page, base_url: str):
+    def test_export_buttons_disabled_when_none_selected(self, homepage: Page):
         """Test that export buttons are disabled when no tabs are selected."""
-        page.goto(base_url)
-
         # Export buttons should be disabled
-        json_btn = page.locator("button:has-text('Export JSON')")
-        markdown_btn = page.locator("button:has-text('Export Markdown')")
-        obsidian_btn = page.locator("button:has-text('Export to Obsidian')")
+        json_btn = homepage.locator("button:has-text('Export JSON')")
+        markdown_btn = homepage.locator("button:has-text('Export Markdown')")
+        obsidian_btn = homepage.locator("button:has-text('Export to Obsidian')")
 
         expect(json_btn).to_be_disabled()
         expect(markdown_btn).to_be_disabled()
@@ -197,24 +222,20 @@ class TestTabSelection:
 class TestExport:
     """Tests for export functionality."""
 
-    def test_export_buttons_present(self, page: Page, base_url: str):
+    def test_export_buttons_present(self, homepage: Page):
         """Test that all export buttons are present."""
-        page.goto(base_url)
-
-        expect(page.locator("button:has-text('Export JSON')")).to_be_visible()
-        expect(page.locator("button:has-text('Export Markdown')")).to_be_visible()
-        expect(page.locator("button:has-text('Export to Obsidian')")).to_be_visible()
+        expect(homepage.locator("button:has-text('Export JSON')")).to_be_visible()
+        expect(homepage.locator("button:has-text('Export Markdown')")).to_be_visible()
+        expect(homepage.locator("button:has-text('Export to Obsidian')")).to_be_visible()
 
 
 @pytest.mark.e2e
 class TestModal:
     """Tests for tab detail modal."""
 
-    def test_modal_hidden_by_default(self, page: Page, base_url: str):
+    def test_modal_hidden_by_default(self, homepage: Page):
         """Test that the modal is hidden by default."""
-        page.goto(base_url)
-
-        modal = page.locator("#tab-modal")
+        modal = homepage.locator("#tab-modal")
         expect(modal).to_have_css("display", "none")
 
     def test_escape_key_closes_modal(self, page: Page, base_url: str):
@@ -240,20 +261,17 @@ class TestModal:
 
 
 @pytest.mark.e2e
-class TestStatsPage:
-    """Tests for the statistics page."""
+class TestStatsPageUI:
+    """Tests for the statistics page in the browser."""
 
-    def test_stats_page_accessible(self, page: Page, base_url: str):
+    def test_stats_page_accessible(self, stats_page: Page):
         """Test that stats page is accessible."""
-        page.goto(f"{base_url}/stats")
-        expect(page.locator("body")).not_to_be_empty()
+        expect(stats_page.locator("body")).not_to_be_empty()
 
-    def test_stats_shows_totals(self, page: Page, base_url: str):
+    def test_stats_shows_totals(self, stats_page: Page):
         """Test that stats page shows total counts."""
-        page.goto(f"{base_url}/stats")
-
         # Should contain some stats information
-        body_text = page.locator("body").text_content()
+        body_text = stats_page.locator("body").text_content()
         # Stats page should have some numeric content or labels
         assert body_text is not None
 
@@ -262,10 +280,9 @@ class TestStatsPage:
 class TestResponsiveness:
     """Tests for responsive design."""
 
-    def test_mobile_viewport(self, browser, base_url: str):
+    def test_mobile_viewport(self, page: Page, base_url: str):
         """Test that the page works on mobile viewport."""
-        context = browser.new_context(viewport={"width": 375, "height": 667})
-        page = context.new_page()
+        page.set_viewport_size({"width": 375, "height": 667})
 
         page.goto(base_url)
 
@@ -273,43 +290,32 @@ class TestResponsiveness:
         expect(page.locator(".container")).to_be_visible()
         expect(page.locator(".tabs-table")).to_be_visible()
 
-        context.close()
-
-    def test_tablet_viewport(self, browser, base_url: str):
+    def test_tablet_viewport(self, page: Page, base_url: str):
         """Test that the page works on tablet viewport."""
-        context = browser.new_context(viewport={"width": 768, "height": 1024})
-        page = context.new_page()
+        page.set_viewport_size({"width": 768, "height": 1024})
 
         page.goto(base_url)
 
         expect(page.locator(".container")).to_be_visible()
         expect(page.locator(".filters-section")).to_be_visible()
 
-        context.close()
-
 
 @pytest.mark.e2e
 class TestAccessibility:
     """Basic accessibility tests."""
 
-    def test_form_labels_exist(self, page: Page, base_url: str):
+    def test_form_labels_exist(self, homepage: Page):
         """Test that form inputs have labels."""
-        page.goto(base_url)
-
-        # Search input should have a label
-        search_label = page.locator("label[for='search-input']")
-        expect(search_label).to_be_visible()
+        # Search input and filter selects should have labels
+        assert not hidden_selectors(homepage, [
+            "label[for='search-input']",
+            "label[for='status-filter']",
+        ])
 
-        # Filter selects should have labels
-        status_label = page.locator("label[for='status-filter']")
-        expect(status_label).to_be_visible()
-
-    def test_buttons_have_text(self, page: Page, base_url: str):
+    def test_buttons_have_text(self, homepage: Page):
         """Test that buttons have descriptive text."""
-        page.goto(base_url)
-
         # Export buttons should have text
-        buttons = page.locator(".export-btn").all()
+        buttons = homepage.locator(".export-btn").all()
         for button in buttons:
             text = button.text_content()
             assert text and len(text.strip()) > 0
@@ -319,24 +325,18 @@ class TestAccessibility:
 class TestHTMXIntegration:
     """Tests for HTMX integration."""
 
-    def test_htmx_loaded(self, page: Page, base_url: str):
+    def test_htmx_loaded(self, homepage: Page):
         """Test that HTMX library is loaded."""
-        page.goto(base_url)
-
-        htmx_loaded = page.evaluate("() => typeof htmx !== 'undefined'")
+        htmx_loaded = homepage.evaluate("() => typeof htmx !== 'undefined'")
         assert htmx_loaded
 
-    def test_tabs_body_has_htmx_attributes(self, page: Page, base_url: str):
+    def test_tabs_body_has_htmx_attributes(self, homepage: Page):
         """Test that tabs body has HTMX attributes for loading."""
-        page.goto(base_url)
-
-        tabs_body = page.locator("#tabs-body")
+        tabs_body = homepage.locator("#tabs-body")
         expect(tabs_body).to_have_attribute("hx-get", "/tabs")
         expect(tabs_body).to_have_attribute("hx-trigger", "load")
 
-    def test_filter_form_has_htmx_attributes(self, page: Page, base_url: str):
+    def test_filter_form_has_htmx_attributes(self, homepage: Page):
         """Test that filter form has HTMX attributes."""
-        page.goto(base_url)
-
-        form = page.locator("#filter-form")
+        form = homepage.locator("#filter-form")
         expect(form).to_have_attribute("hx-target", "#tabs-body")
@@ -0,0 +1,54 @@
+"""
+TabBacklog v1 - Unit Test Fixtures
+
+Database-backed unit tests run against TEST_DATABASE_URL (with the schema in
+database/schema applied) and are skipped when it can't be reached.
+"""
+
+import uuid
+from typing import AsyncIterator, Iterator
+
+import psycopg
+import pytest
+import pytest_asyncio
+
+from ingest.db import IngestDB
+from web_ui.db import Database
+
+from ..conftest import TEST_DB_URL
+
+
+@pytest.fixture
+def user_id() -> Iterator[str]:
+    """A fresh user, removed with all their tabs after the test."""
+    user = str(uuid.uuid4())
+    try:
+        conn = psycopg.connect(TEST_DB_URL, autocommit=True)
+    except psycopg.OperationalError as e:
+        pytest.skip(f"Test database not available: {e}")
+
+    with conn:
+        conn.execute("INSERT INTO auth.users (id) VALUES (%s)", (user,))
+        yield user
+        conn.execute("DELETE FROM event_log WHERE user_id = %s", (user,))
+        conn.execute("DELETE FROM tab_item WHERE user_id = %s", (user,))
+        conn.execute("DELETE FROM auth.users WHERE id = %s", (user,))
+
+
+@pytest.fixture
+def ingest_db(user_id: str) -> Iterator[IngestDB]:
+    """IngestDB connected to the test database."""
+    with IngestDB(TEST_DB_URL) as db:
+        yield db
+
+
+@pytest_asyncio.fixture
+async def web_db(user_id: str) -> AsyncIterator[Database]:
+    """
+    Web UI Database with a single pooled connection, so every call checks
+    out the same connection the previous one released.
+    """
+    db = Database(TEST_DB_URL, min_size=1, max_size=1)
+    await db.connect()
+    yield db
+    await db.disconnect()
@@ -0,0 +1,106 @@
+"""
+TabBacklog v1 - Ingest Database Unit Tests
+
+Run with:
+    TEST_DATABASE_URL=postgresql://... pytest tests/unit/test_ingest_db.py -m unit
+"""
+
+import psycopg
+import pytest
+
+from ingest.db import IngestDB, dedupe_bookmarks
+from ingest.firefox_parser import BookmarkItem
+
+from ..conftest import TEST_DB_URL
+
+pytestmark = pytest.mark.unit
+
+
+def test_dedupe_bookmarks_keeps_first_order():
+    """Repeats are dropped and each URL stays where it first appeared."""
+    bookmarks = [
+        BookmarkItem(url="https://a.example", page_title="A", window_label="one"),
+        BookmarkItem(url="https://b.example", page_title="B", window_label="one"),
+        BookmarkItem(url="https://a.example", page_title="A again", window_label="two"),
+    ]
+
+    unique = dedupe_bookmarks(bookmarks)
+
+    assert [b.url for b in unique] == ["https://a.example", "https://b.example"]
+    assert (unique[0].page_title, unique[0].window_label) == ("A", "one")
+
+
+def test_dedupe_bookmarks_fills_missing_fields():
+    """A repeat fills in what the first entry lacks without dropping what it has."""
+    bookmarks = [
+        BookmarkItem(url="https://a.example", page_title=None, window_label="one"),
+        BookmarkItem(url="https://a.example", page_title="A", window_label=None),
+    ]
+
+    (merged,) = dedupe_bookmarks(bookmarks)
+
+    assert (merged.page_title, merged.window_label) == ("A", "one")
+
+
+def test_ingest_batch_merges_repeat_in_batch(ingest_db: IngestDB, user_id: str):
+    """A repeat later in the same batch that adds a title is not lost."""
+    bookmarks = [
+        BookmarkItem(url="https://a.example", page_title=None, window_label="one"),
+        BookmarkItem(url="https://b.example", page_title="B", window_label="one"),
+        BookmarkItem(url="https://a.example", page_title="A", window_label="two"),
+    ]
+
+    result = ingest_db.ingest_batch(bookmarks, user_id)
+
+    assert result.total_processed == 3
+    assert result.inserted == 2
+    assert result.skipped_duplicates == 1
+
+    with psycopg.connect(TEST_DB_URL) as conn:
+        rows = conn.execute(
+            "SELECT page_title, window_label FROM tab_item WHERE user_id = %s AND url = %s",
+            (user_id, "https://a.example"),
+        ).fetchall()
+    assert rows == [("A", "one")]
+
+
+@pytest.mark.parametrize("use_copy", [True, False])
+def test_ingest_batch_merges_existing_tabs(user_id: str, use_copy: bool):
+    """Known URLs are filled in, not duplicated, and every row gets an event."""
+    with IngestDB(TEST_DB_URL, use_copy=use_copy) as db:
+        db.ingest_batch(
+            [BookmarkItem(url="https://a.example", page_title=None, window_label="one")],
+            user_id,
+        )
+        result = db.ingest_batch(
+            [
+                BookmarkItem(url="https://a.example", page_title="A", window_label="two"),
+                BookmarkItem(url="https://b.example", page_title="B", window_label="two"),
+            ],
+            user_id,
+        )
+
+    assert (result.total_processed, result.inserted, result.skipped_duplicates) == (2, 1, 1)
+    assert result.errors == 0
+
+    with psycopg.connect(TEST_DB_URL) as conn:
+        tabs = conn.execute(
+            "SELECT url, page_title, window_label FROM tab_item WHERE user_id = %s ORDER BY url",
+            (user_id,),
+        ).fetchall()
+        events = conn.execute(
+            """
+            SELECT e.event_type, t.url
+            FROM event_log e JOIN tab_item t ON t.id = e.entity_id
+            WHERE e.user_id = %s
+            ORDER BY e.id
+            """,
+            (user_id,),
+        ).fetchall()
+
+    assert tabs == [("https://a.example", "A", "one"), ("https://b.example", "B", "two")]
+    assert sorted(events) == [
+        ("tab_created", "https://a.example"),
+        ("tab_created", "https://b.example"),
+        ("tab_duplicate_skipped", "https://a.example"),
+    ]
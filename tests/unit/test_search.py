@@ -0,0 +1,44 @@
+"""
+TabBacklog v1 - Search Utilities Unit Tests
+
+Run with:
+    pytest tests/unit/test_search.py -m unit
+"""
+
+import asyncio
+
+import pytest
+
+from shared.search import EmbeddingGenerator
+
+pytestmark = [pytest.mark.unit, pytest.mark.asyncio]
+
+
+class SlowEmbeddingGenerator(EmbeddingGenerator):
+    """Embeds texts as their length once release is set, without the API."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.release = asyncio.Event()
+
+    async def generate_batch(self, texts: list[str]) -> list[list[float]]:
+        await self.release.wait()
+        return [[float(len(text))] for text in texts]
+
+
+async def test_cancelled_caller_does_not_cancel_full_batch():
+    """Other callers still get results when the one filling the batch is cancelled."""
+    generator = SlowEmbeddingGenerator(max_batch_size=2, max_wait_seconds=60)
+
+    first = asyncio.create_task(generator.generate("a"))
+    await asyncio.sleep(0)
+    second = asyncio.create_task(generator.generate("bb"))
+    await asyncio.sleep(0)
+
+    second.cancel()
+    generator.release.set()
+
+    assert await first == [1.0]
+    with pytest.raises(asyncio.CancelledError):
+        await second
+    await generator.close()
@@ -0,0 +1,209 @@
+"""
+TabBacklog v1 - Web UI Database Unit Tests
+
+Run with:
+    TEST_DATABASE_URL=postgresql://... pytest tests/unit/test_web_ui_db.py -m unit
+"""
+
+import asyncio
+import re
+
+import psycopg
+import pytest
+
+from web_ui.db import Database, _build_tabs_queries
+from web_ui.models import TabFilters
+
+from ..conftest import TEST_DB_URL
+
+pytestmark = pytest.mark.unit
+
+
+def add_tabs(user_id: str, count: int) -> None:
+    """Insert count tabs for the user."""
+    with psycopg.connect(TEST_DB_URL, autocommit=True) as conn:
+        conn.execute(
+            """
+            INSERT INTO tab_item (user_id, url, page_title)
+            SELECT %s, 'https://example.com/' || n, 'Tab ' || n
+            FROM generate_series(1, %s) AS n
+            """,
+            (user_id, count),
+        )
+
+
+async def test_statements_survive_pool_release(web_db: Database, user_id: str):
+    """Queries repeated on a connection checked out again still run."""
+    add_tabs(user_id, 3)
+
+    for _ in range(2):
+        result = await web_db.get_tabs(user_id, TabFilters())
+        assert result.total == 3
+        assert [tab.page_title for tab in result.tabs] == ["Tab 3", "Tab 2", "Tab 1"]
+
+        web_db._filter_cache.clear()
+        options = await web_db.get_filter_options(user_id)
+        assert options["total"] == 3
+
+        stats = await web_db.get_stats(user_id)
+        assert set(stats) == {"status_counts", "content_type_counts", "recent_events"}
+
+    toggled = await web_db.toggle_processed_many(user_id, [result.tabs[0].id])
+    assert toggled[0].is_processed
+    toggled = await web_db.toggle_processed_many(user_id, [result.tabs[0].id])
+    assert not toggled[0].is_processed
+
+
+
+async def test_invalidated_filter_options_not_cached(web_db: Database, user_id: str):
+    """A query started before an invalidation doesn't put its result back."""
+    add_tabs(user_id, 2)
+
+    stale = asyncio.ensure_future(web_db.get_filter_options(user_id))
+    await asyncio.sleep(0)
+    web_db._invalidate_filter_options(user_id)
+
+    assert (await stale)["total"] == 2
+    assert user_id not in web_db._filter_cache
+
+    # Later calls query again rather than joining the invalidated one
+    assert (await web_db.get_filter_options(user_id))["total"] == 2
+    assert user_id in web_db._filter_cache
+
+
+async def test_export_timestamps_match_isoformat(web_db: Database, user_id: str):
+    """Export timestamps are formatted like datetime.isoformat() was."""
+    with psycopg.connect(TEST_DB_URL, autocommit=True) as conn:
+        conn.execute(
+            """
+            INSERT INTO tab_item (user_id, url, created_at)
+            VALUES (%s, 'https://example.com/whole', '2024-03-01 12:30:45+00'),
+                   (%s, 'https://example.com/fraction', '2024-03-01 12:30:45.000123+02')
+            """,
+            (user_id, user_id),
+        )
+
+    async with web_db.connection() as conn:
+        rows = await conn.fetch(
+            "SELECT id, created_at FROM tab_item WHERE user_id = $1", user_id
+        )
+    expected = {row["created_at"].isoformat() for row in rows}
+
+    tabs = await web_db.get_tabs_for_export(user_id, [row["id"] for row in rows])
+
+    assert {tab.created_at for tab in tabs} == expected
+    assert expected == {"2024-03-01T12:30:45+00:00", "2024-03-01T10:30:45.000123+00:00"}
+
+
+def placeholders(query: str) -> list[int]:
+    """Numbers of the $n placeholders in a query, in order of appearance."""
+    return [int(n) for n in re.findall(r"\$(\d+)", query)]
+
+
+@pytest.mark.parametrize("seek", [False, True])
+def test_build_tabs_queries_numbering(seek: bool):
+    """Placeholders run user, filters, cursor pair (if seeking), LIMIT, OFFSET."""
+    signature = ("status", "search", "project")
+    page_query, count_query = _build_tabs_queries(signature, seek)
+
+    filters = [1, 2, 3, 4]
+    cursor = [5, 6] if seek else []
+    limit = 7 if seek else 5
+    assert placeholders(page_query) == [*filters, *cursor, limit, limit + 1]
+    assert f"LIMIT ${limit} OFFSET ${limit + 1}" in page_query
+    if seek:
+        assert "(t.created_at, t.id) < ($5, $6)" in page_query
+
+    # The count query takes only the user and filter parameters
+    assert placeholders(count_query) == filters
+
+
+def test_build_tabs_queries_numbering_without_filters():
+    """Without filters, the cursor pair follows the user ID directly."""
+    page_query, count_query = _build_tabs_queries((), True)
+
+    assert placeholders(page_query) == [1, 2, 3, 4, 5]
+    assert placeholders(count_query) == [1]
+    assert "tab_enrichment" not in count_query
+
+
+async def test_get_tabs_seek_with_filter(web_db: Database, user_id: str):
+    """A cursor page with a filter set binds every parameter to its placeholder."""
+    add_tabs(user_id, 5)
+    filters = TabFilters(status="new", per_page=2)
+
+    first = await web_db.get_tabs(user_id, filters)
+    cursor_created_at, cursor_id = first.next_cursor
+    second = await web_db.get_tabs(
+        user_id,
+        filters.model_copy(update={
+            "page": 2,
+            "cursor_created_at": cursor_created_at,
+            "cursor_id": cursor_id,
+        }),
+    )
+
+    assert [tab.page_title for tab in first.tabs] == ["Tab 5", "Tab 4"]
+    assert [tab.page_title for tab in second.tabs] == ["Tab 3", "Tab 2"]
+    assert second.total == 5
+
+
+async def test_filtered_total_cached_until_invalidated(web_db: Database, user_id: str):
+    """A filtered total is counted once per TTL, and recounted after a write."""
+    add_tabs(user_id, 3)
+    filters = TabFilters(status="new", per_page=2)
+
+    assert (await web_db.get_tabs(user_id, filters)).total == 3
+
+    # Tabs from ingest show up once the cached count expires or is invalidated
+    with psycopg.connect(TEST_DB_URL, autocommit=True) as conn:
+        conn.execute(
+            "INSERT INTO tab_item (user_id, url) VALUES (%s, 'https://example.org/')",
+            (user_id,),
+        )
+    assert (await web_db.get_tabs(user_id, filters)).total == 3
+    web_db._invalidate_filter_options(user_id)
+    assert (await web_db.get_tabs(user_id, filters)).total == 4
+
+
+async def test_search_matches_across_title_and_summary(web_db: Database, user_id: str):
+    """Query words can match the title and summary separately, and as prefixes."""
+    with psycopg.connect(TEST_DB_URL, autocommit=True) as conn:
+        tab_id = conn.execute(
+            """
+            INSERT INTO tab_item (user_id, url, page_title)
+            VALUES (%s, 'https://example.com/guide', 'Python guide')
+            RETURNING id
+            """,
+            (user_id,),
+        ).fetchone()[0]
+        conn.execute(
+            "INSERT INTO tab_enrichment (tab_id, summary) VALUES (%s, 'A tutorial on decorators')",
+            (tab_id,),
+        )
+    add_tabs(user_id, 2)
+
+    for query in ["python tutorial", "pyth tuto", '"python guide"']:
+        result = await web_db.get_tabs(user_id, TabFilters(search=query))
+        assert [tab.id for tab in result.tabs] == [tab_id], query
+
+    result = await web_db.get_tabs(user_id, TabFilters(search="python -tutorial"))
+    assert result.tabs == []
+
+
+async def test_semantic_search_above_default_ef_search(web_db: Database, user_id: str):
+    """A limit above hnsw.ef_search's default of 40 runs and returns every match."""
+    add_tabs(user_id, 3)
+    with psycopg.connect(TEST_DB_URL, autocommit=True) as conn:
+        conn.execute(
+            """
+            INSERT INTO tab_embedding (tab_id, embedding, model_name)
+            SELECT id, array_fill(1::real, ARRAY[768])::vector, 'test'
+            FROM tab_item WHERE user_id = %s
+            """,
+            (user_id,),
+        )
+
+    tabs = await web_db.semantic_search(user_id, [1.0] * 768, limit=60)
+
+    assert len(tabs) == 3
@@ -0,0 +1,39 @@
+"""
+TabBacklog v1 - Conditional GET Helpers
+
+Weak ETags for responses built from slow-changing aggregates, so repeat
+requests for unchanged data get a 304 without a body or template render.
+"""
+
+import hashlib
+from typing import Any, Optional
+
+import orjson
+from fastapi import Request, Response
+
+# Browsers revalidate every time; the server-side caches already decide
+# how fresh the data is, and toggling a tab must show up immediately
+CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(data: Any) -> str:
+    """Build a weak ETag from a hash of the JSON-serializable data."""
+    digest = hashlib.blake2b(orjson.dumps(data), digest_size=8).hexdigest()
+    return f'W/"{digest}"'
+
+
+def not_modified(request: Request, etag: str) -> Optional[Response]:
+    """Get a 304 response if the client already has this ETag, else None."""
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return None
+    # Weak comparison: W/ prefixes are ignored on both sides
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    if "*" in tags or etag.removeprefix("W/") in tags:
+        return Response(status_code=304, headers=cache_headers(etag))
+    return None
+
+
+def cache_headers(etag: str) -> dict[str, str]:
+    """Headers that let the client revalidate with the ETag."""
+    return {"ETag": etag, "Cache-Control": CACHE_CONTROL}
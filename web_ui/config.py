@@ -0,0 +1,27 @@
+"""
+TabBacklog v1 - Web UI Configuration
+
+Settings read once from the environment at import time.
+"""
+
+import os
+
+from fastapi import HTTPException
+
+# Owner of every tab the web UI shows (single-user deployment)
+DEFAULT_USER_ID = os.environ.get("DEFAULT_USER_ID", "")
+
+# How often the stats page's materialized views are refreshed (0 disables,
+# e.g. when pg_cron runs refresh_tab_stats() instead)
+STATS_REFRESH_SECONDS = float(os.environ.get("STATS_REFRESH_SECONDS", "300"))
+
+# Serve POST /api/batch for the test suite's smoke checks. Off by default:
+# it is unauthenticated and fans one request out to up to 50 sub-requests.
+ENABLE_BATCH_API = os.environ.get("ENABLE_BATCH_API", "").lower() in ("1", "true")
+
+
+def get_user_id() -> str:
+    """Get the default user ID from environment"""
+    if not DEFAULT_USER_ID:
+        raise HTTPException(500, "DEFAULT_USER_ID not configured")
+    return DEFAULT_USER_ID
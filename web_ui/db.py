@@ -4,35 +4,385 @@ TabBacklog v1 - Web UI Database Operations
 Database queries for the web UI.
 """
 
-import json
+import asyncio
 import logging
 import os
+import uuid
 from contextlib import asynccontextmanager
+from functools import lru_cache
 from datetime import datetime
 from typing import AsyncIterator, Optional
 
 import asyncpg
+import numpy as np
+from cachetools import TTLCache
+from pgvector.asyncpg import register_vector
 
 from .models import TabDisplay, TabFilters, TabListResponse, TabExport
 
 logger = logging.getLogger(__name__)
 
+# asyncpg's per-connection prepared statement cache. Set to 0 when connecting
+# through a transaction-pooling proxy such as pgbouncer, which cannot keep
+# named statements across transactions.
+STATEMENT_CACHE_SIZE = int(os.environ.get("DATABASE_STATEMENT_CACHE_SIZE", "1024"))
+
+# Filter options, and get_tabs totals, per user. Writes from this process
+# invalidate their user's entries; changes made by ingest or the pipeline
+# show up within the TTL.
+FILTER_CACHE_MAXSIZE = 1024
+FILTER_CACHE_TTL_SECONDS = 30
+
+# Rows fetched per round trip when streaming exports
+EXPORT_PREFETCH = 500
+
+
+# Columns every TabDisplay query selects, in the order _row_to_tab_display
+# unpacks them; t/p/e alias tab_item, tab_parsed and tab_enrichment
+TAB_COLUMNS = (
+    "t.id, t.url, t.page_title, t.window_label, t.status, t.is_processed, "
+    "t.processed_at, t.created_at, p.site_kind, p.word_count, p.video_seconds, "
+    "e.summary, e.content_type, e.est_read_min, e.priority, e.tags, e.projects"
+)
+
+# Fixed-shape queries; asyncpg's statement cache prepares each once per
+# pooled connection
+GET_TABS_BY_IDS_SQL = f"""
+    SELECT
+        {TAB_COLUMNS}
+    FROM tab_item t
+    LEFT JOIN tab_parsed p ON t.id = p.tab_id
+    LEFT JOIN tab_enrichment e ON t.id = e.tab_id
+    WHERE t.id = ANY($1::bigint[]) AND t.user_id = $2 AND t.deleted_at IS NULL
+    ORDER BY t.created_at DESC, t.id DESC
+"""
+
+# Flip the flag, log the events and return the full tabs in one statement
+TOGGLE_PROCESSED_SQL = f"""
+    WITH upd AS (
+        UPDATE tab_item
+        SET
+            is_processed = NOT is_processed,
+            processed_at = CASE WHEN is_processed THEN NULL ELSE now() END,
+            updated_at = now()
+        WHERE id = ANY($1::bigint[]) AND user_id = $2 AND deleted_at IS NULL
+        RETURNING id, url, page_title, window_label, status, is_processed,
+                  processed_at, created_at
+    ), log AS (
+        INSERT INTO event_log (user_id, event_type, entity_type, entity_id, details)
+        SELECT
+            $2,
+            CASE WHEN is_processed THEN 'tab_processed' ELSE 'tab_unprocessed' END,
+            'tab_item',
+            id,
+            '{{"source": "web_ui"}}'::jsonb
+        FROM upd
+    )
+    SELECT
+        {TAB_COLUMNS}
+    FROM upd t
+    LEFT JOIN tab_parsed p ON t.id = p.tab_id
+    LEFT JOIN tab_enrichment e ON t.id = e.tab_id
+    ORDER BY t.created_at DESC, t.id DESC
+"""
+
+# The HNSW scan returns at most hnsw.ef_search candidates (default 40), and
+# other users' tabs are only filtered out after it. Each search widens the
+# candidate list to its limit for the transaction and, on pgvector 0.8+,
+# lets the scan keep going until enough rows pass the filter.
+SEMANTIC_SEARCH_EF_SQL = "SELECT set_config('hnsw.ef_search', GREATEST($1::int, 40)::text, true)"
+SEMANTIC_SEARCH_ITERATIVE_SQL = """
+    SELECT
+        set_config('hnsw.ef_search', GREATEST($1::int, 40)::text, true),
+        set_config('hnsw.iterative_scan', 'strict_order', true)
+"""
+# First pgvector release with hnsw.iterative_scan
+PGVECTOR_ITERATIVE_SCAN_VERSION = (0, 8)
+
+# Nearest neighbours first (an HNSW index scan over tab_embedding, only
+# touching tab_item to check ownership), then the display columns for
+# just those rows
+SEMANTIC_SEARCH_SQL = f"""
+    WITH nearest AS (
+        SELECT emb.tab_id, emb.embedding <=> $2::vector AS distance
+        FROM tab_embedding emb
+        JOIN tab_item t ON t.id = emb.tab_id
+        WHERE t.user_id = $1 AND t.deleted_at IS NULL
+        ORDER BY emb.embedding <=> $2::vector
+        LIMIT $3
+    )
+    SELECT
+        {TAB_COLUMNS},
+        1 - n.distance AS similarity
+    FROM nearest n
+    JOIN tab_item t ON t.id = n.tab_id
+    LEFT JOIN tab_parsed p ON t.id = p.tab_id
+    LEFT JOIN tab_enrichment e ON t.id = e.tab_id
+    ORDER BY n.distance
+"""
+
+SAVE_EMBEDDING_SQL = """
+    INSERT INTO tab_embedding (tab_id, embedding, model_name)
+    VALUES ($1, $2::vector, $3)
+    ON CONFLICT (tab_id) DO UPDATE SET
+        embedding = EXCLUDED.embedding,
+        model_name = EXCLUDED.model_name,
+        updated_at = now()
+"""
+
+# Statuses, content types and processed counts in one pass over the user's
+# tabs; the kind column says which option each row carries
+FILTER_OPTIONS_SQL = """
+    WITH base AS MATERIALIZED (
+        SELECT id, status, is_processed
+        FROM tab_item
+        WHERE user_id = $1 AND deleted_at IS NULL
+    )
+    SELECT 'status' AS kind, status AS value, NULL::bigint AS n
+    FROM base
+    GROUP BY status
+    UNION ALL
+    SELECT 'content_type', e.content_type, NULL
+    FROM base
+    JOIN tab_enrichment e ON base.id = e.tab_id
+    WHERE e.content_type IS NOT NULL
+    GROUP BY e.content_type
+    UNION ALL
+    SELECT 'total', NULL, COUNT(*) FROM base
+    UNION ALL
+    SELECT 'processed', NULL, COUNT(*) FILTER (WHERE is_processed) FROM base
+    ORDER BY kind, value
+"""
+
+# Stats page breakdowns, keyed by the template variable they fill. The
+# counts come from materialized views (see 03_indexes_views.sql), so they
+# can lag by up to STATS_REFRESH_SECONDS.
+STATS_SQL = {
+    "status_counts": """
+        SELECT status, count
+        FROM mv_tab_status_counts
+        WHERE user_id = $1
+        ORDER BY count DESC
+    """,
+    "content_type_counts": """
+        SELECT content_type, count
+        FROM mv_tab_content_type_counts
+        WHERE user_id = $1
+        ORDER BY count DESC
+    """,
+    "recent_events": """
+        SELECT event_type, entity_type, created_at
+        FROM event_log
+        WHERE user_id = $1
+        ORDER BY created_at DESC
+        LIMIT 10
+    """,
+}
+
+
+# get_tabs filter conditions, in placeholder order. Each takes a single
+# parameter, substituted for {0}, and is only added when its filter is set.
+TAB_FILTER_CONDITIONS = {
+    "status": "t.status = {0}",
+    "is_processed": "t.is_processed = {0}",
+    "content_type": "e.content_type = {0}",
+    "read_time_max": "(e.est_read_min IS NULL OR e.est_read_min <= {0})",
+    # Full-text match against tab_item.search_tsv (title, URL and summary),
+    # backed by a GIN index. websearch syntax supports "phrases", OR and
+    # -exclusions; search_tsquery() matches every term as a prefix.
+    "search": "t.search_tsv @@ search_tsquery({0})",
+    # Substring match, served by idx_tab_enrichment_projects_trgm
+    "project": "e.raw_meta->>'projects' ILIKE {0}",
+}
+
+# Filters whose condition reads tab_enrichment columns
+ENRICHMENT_FILTERS = frozenset({"content_type", "read_time_max", "project"})
+
+
+@lru_cache(maxsize=256)
+def _build_tabs_queries(signature: tuple[str, ...], seek: bool) -> tuple[str, str]:
+    """
+    Build get_tabs' page query and fallback count query.
+
+    Args:
+        signature: Names of the active filters, in TAB_FILTER_CONDITIONS order
+        seek: Whether the page starts after a (created_at, id) cursor
+
+    Returns:
+        (page query, count query); $1 is the user ID, then one parameter per
+        filter, then the cursor pair if seeking, then LIMIT and OFFSET. The
+        count query takes only the user and filter parameters.
+    """
+    conditions = ["t.user_id = $1", "t.deleted_at IS NULL"]
+    for param_idx, name in enumerate(signature, start=2):
+        conditions.append(TAB_FILTER_CONDITIONS[name].format(f"${param_idx}"))
+    where_clause = " AND ".join(conditions)
+
+    param_idx = len(signature) + 2
+    if seek:
+        conditions.append(f"(t.created_at, t.id) < (${param_idx}, ${param_idx + 1})")
+        param_idx += 2
+    page_clause = " AND ".join(conditions)
+
+    page_query = f"""
+        SELECT
+            {TAB_COLUMNS}
+        FROM tab_item t
+        LEFT JOIN tab_parsed p ON t.id = p.tab_id
+        LEFT JOIN tab_enrichment e ON t.id = e.tab_id
+        WHERE {page_clause}
+        ORDER BY t.created_at DESC, t.id DESC
+        LIMIT ${param_idx} OFFSET ${param_idx + 1}
+    """
+    # Only join tab_enrichment when a filter reads from it
+    enrichment_join = (
+        "LEFT JOIN tab_enrichment e ON t.id = e.tab_id"
+        if ENRICHMENT_FILTERS.intersection(signature)
+        else ""
+    )
+    count_query = f"""
+        SELECT COUNT(*)
+        FROM tab_item t
+        {enrichment_join}
+        WHERE {where_clause}
+    """
+    return page_query, count_query
+
+
+def _row_to_tab_display(row: asyncpg.Record) -> TabDisplay:
+    """Build a TabDisplay from a row that starts with TAB_COLUMNS."""
+    (
+        id_, url, page_title, window_label, status, is_processed,
+        processed_at, created_at, site_kind, word_count, video_seconds,
+        summary, content_type, est_read_min, priority, tags, projects, *_,
+    ) = row
+
+    return TabDisplay(
+        id_, url, page_title, window_label, status, is_processed,
+        processed_at, created_at, site_kind, word_count, video_seconds,
+        summary, content_type, est_read_min, priority,
+        tags or [], projects or [],
+    )
+
+
+async def _init_connection(conn: asyncpg.Connection) -> None:
+    """Set up type codecs on each new pooled connection"""
+    try:
+        # Send embeddings as binary float4 arrays instead of text literals
+        await register_vector(conn)
+    except ValueError as e:
+        logger.warning(f"pgvector codec not registered: {e}")
+
 
 class Database:
     """Async database connection pool manager"""
 
-    def __init__(self, database_url: str):
+    def __init__(
+        self,
+        database_url: str,
+        min_size: Optional[int] = None,
+        max_size: Optional[int] = None,
+        command_timeout: Optional[float] = None,
+        max_inactive_connection_lifetime: Optional[float] = None,
+    ):
         self.database_url = database_url
+        # Each uvicorn worker has its own pool, so split the default
+        # connection budget across WEB_CONCURRENCY workers
+        workers = max(1, int(os.environ.get("WEB_CONCURRENCY", "1")))
+        self.max_size = max_size or int(
+            os.environ.get("DATABASE_POOL_MAX_SIZE", max(2, 10 // workers))
+        )
+        self.min_size = min(
+            self.max_size,
+            min_size if min_size is not None else int(os.environ.get("DATABASE_POOL_MIN_SIZE", "2")),
+        )
+        self.command_timeout = command_timeout or float(
+            os.environ.get("DATABASE_COMMAND_TIMEOUT", "30")
+        )
+        self.max_inactive_connection_lifetime = max_inactive_connection_lifetime or float(
+            os.environ.get("DATABASE_MAX_IDLE_SECONDS", "300")
+        )
         self._pool: Optional[asyncpg.Pool] = None
+        # Filter options are cached per worker and only eventually
+        # consistent: a toggle invalidates this worker's entry, while other
+        # workers serve theirs until the TTL runs out (invalidating them
+        # too would need LISTEN/NOTIFY)
+        self._filter_cache: TTLCache = TTLCache(
+            maxsize=FILTER_CACHE_MAXSIZE, ttl=FILTER_CACHE_TTL_SECONDS
+        )
+        self._filter_inflight: dict[str, asyncio.Future] = {}
+        # get_tabs totals per user, keyed by the filter signature and values,
+        # so paging through a filtered list counts the matches once
+        self._count_cache: TTLCache = TTLCache(
+            maxsize=FILTER_CACHE_MAXSIZE, ttl=FILTER_CACHE_TTL_SECONDS
+        )
+        # Bumped on every invalidation, so a query that started before it
+        # doesn't put its stale result back in the cache
+        self._filter_generation = 0
+        # Picked in connect() from the installed pgvector version
+        self._semantic_search_settings_sql = SEMANTIC_SEARCH_EF_SQL
 
     async def connect(self):
         """Create connection pool"""
         self._pool = await asyncpg.create_pool(
             self.database_url,
-            min_size=2,
-            max_size=10,
+            min_size=self.min_size,
+            max_size=self.max_size,
+            max_inactive_connection_lifetime=self.max_inactive_connection_lifetime,
+            command_timeout=self.command_timeout,
+            statement_cache_size=STATEMENT_CACHE_SIZE,
+            server_settings={
+                "application_name": "tabbacklog-web-ui",
+                # Tab queries are short; JIT compilation only adds latency
+                "jit": "off",
+            },
+            init=_init_connection,
         )
-        logger.info("Database pool created")
+        logger.info(f"Database pool created (size {self.min_size}-{self.max_size})")
+        await self._detect_pgvector()
+        await self._warm_up()
+
+    async def _detect_pgvector(self):
+        """Use iterative HNSW scans for semantic search where pgvector has them"""
+        try:
+            async with self.connection() as conn:
+                version = await conn.fetchval(
+                    "SELECT extversion FROM pg_extension WHERE extname = 'vector'"
+                )
+        except (asyncpg.PostgresError, OSError) as e:
+            logger.warning(f"Could not read the pgvector version: {e}")
+            return
+        if not version:
+            return
+        major_minor = tuple(int(part) for part in version.split(".")[:2])
+        if major_minor >= PGVECTOR_ITERATIVE_SCAN_VERSION:
+            self._semantic_search_settings_sql = SEMANTIC_SEARCH_ITERATIVE_SQL
+
+    async def _warm_up(self):
+        """
+        Round-trip on every idle connection and prepare the index and
+        stats pages' statements, so the first requests don't pay for it.
+        """
+        page_query, _ = _build_tabs_queries((), False)
+        # Running each statement once puts it in the connection's statement
+        # cache; a user with no tabs keeps the runs to an index probe
+        nobody = str(uuid.uuid4())
+
+        async def warm_one():
+            async with self.connection() as conn:
+                await conn.fetch(FILTER_OPTIONS_SQL, nobody)
+                await conn.fetch(page_query, nobody, 1, 0)
+                for query in STATS_SQL.values():
+                    await conn.fetch(query, nobody)
+
+        results = await asyncio.gather(
+            *(warm_one() for _ in range(self._pool.get_idle_size())),
+            return_exceptions=True,
+        )
+        errors = [r for r in results if isinstance(r, Exception)]
+        if errors:
+            # e.g. schema not applied yet; requests will surface the real error
+            logger.warning(f"Database warm-up failed: {errors[0]}")
 
     async def disconnect(self):
         """Close connection pool"""
@@ -40,6 +390,16 @@ class Database:
             await self._pool.close()
             logger.info("Database pool closed")
 
+    def stats(self) -> dict:
+        """Get connection pool usage for monitoring"""
+        if self._pool is None:
+            return {"size": 0, "idle": 0, "max": self.max_size}
+        return {
+            "size": self._pool.get_size(),
+            "idle": self._pool.get_idle_size(),
+            "max": self._pool.get_max_size(),
+        }
+
     @asynccontextmanager
     async def connection(self) -> AsyncIterator[asyncpg.Connection]:
         """Get a connection from the pool"""
@@ -53,124 +413,48 @@ class Database:
     ) -> TabListResponse:
         """
         Get filtered list of tabs with pagination.
-        """
-        # Build WHERE clauses
-        conditions = ["t.user_id = $1", "t.deleted_at IS NULL"]
-        params = [user_id]
-        param_idx = 2
-
-        if filters.status:
-            conditions.append(f"t.status = ${param_idx}")
-            params.append(filters.status)
-            param_idx += 1
-
-        if filters.is_processed is not None:
-            conditions.append(f"t.is_processed = ${param_idx}")
-            params.append(filters.is_processed)
-            param_idx += 1
-
-        if filters.content_type:
-            conditions.append(f"e.content_type = ${param_idx}")
-            params.append(filters.content_type)
-            param_idx += 1
-
-        if filters.read_time_max:
-            conditions.append(f"(e.est_read_min IS NULL OR e.est_read_min <= ${param_idx})")
-            params.append(filters.read_time_max)
-            param_idx += 1
-
-        if filters.search:
-            # Use pg_trgm similarity search for fuzzy matching
-            # Falls back to ILIKE if similarity threshold not met
-            conditions.append(f"""
-                (t.page_title % ${param_idx}
-                 OR e.summary % ${param_idx}
-                 OR t.page_title ILIKE ${param_idx + 1}
-                 OR t.url ILIKE ${param_idx + 1}
-                 OR e.summary ILIKE ${param_idx + 1})
-            """)
-            params.append(filters.search)  # For trigram similarity
-            params.append(f"%{filters.search}%")  # For ILIKE fallback
-            param_idx += 2
-
-        if filters.project:
-            conditions.append(f"e.raw_meta->>'projects' ILIKE ${param_idx}")
-            params.append(f"%{filters.project}%")
-            param_idx += 1
-
-        where_clause = " AND ".join(conditions)
-
-        # Count query
-        count_query = f"""
-            SELECT COUNT(*) as total
-            FROM tab_item t
-            LEFT JOIN tab_enrichment e ON t.id = e.tab_id
-            WHERE {where_clause}
-        """
 
-        # Main query with pagination
-        offset = (filters.page - 1) * filters.per_page
-        query = f"""
-            SELECT
-                t.id,
-                t.url,
-                t.page_title,
-                t.window_label,
-                t.status,
-                t.is_processed,
-                t.processed_at,
-                t.created_at,
-                p.site_kind,
-                p.word_count,
-                p.video_seconds,
-                e.summary,
-                e.content_type,
-                e.est_read_min,
-                e.priority,
-                e.raw_meta
-            FROM tab_item t
-            LEFT JOIN tab_parsed p ON t.id = p.tab_id
-            LEFT JOIN tab_enrichment e ON t.id = e.tab_id
-            WHERE {where_clause}
-            ORDER BY t.created_at DESC
-            LIMIT ${param_idx} OFFSET ${param_idx + 1}
+        When the filters carry a cursor (the created_at/id of the last row
+        on the previous page), rows are found by seeking past it instead of
+        skipping OFFSET rows, so deep pages cost the same as the first one.
         """
+        filter_values = {
+            "status": filters.status or None,
+            "is_processed": filters.is_processed,
+            "content_type": filters.content_type or None,
+            "read_time_max": filters.read_time_max or None,
+            "search": filters.search or None,
+            "project": f"%{filters.project}%" if filters.project else None,
+        }
+        # Same filters set -> same SQL text, so the statements are built and
+        # prepared once per combination instead of on every request
+        signature = tuple(name for name, value in filter_values.items() if value is not None)
+        filter_params = [user_id, *(filter_values[name] for name in signature)]
+
+        # Rows before this page, skipped by OFFSET or by seeking past the cursor
+        skipped = (filters.page - 1) * filters.per_page
+        seek = filters.cursor_created_at is not None and filters.cursor_id is not None
+        params = list(filter_params)
+        if seek:
+            params.extend([filters.cursor_created_at, filters.cursor_id])
+            offset = 0
+        else:
+            offset = skipped
         params.extend([filters.per_page, offset])
 
+        page_query, count_query = _build_tabs_queries(signature, seek)
+
         async with self.connection() as conn:
-            # Get total count
-            total = await conn.fetchval(count_query, *params[:-2])
-
-            # Get tabs
-            rows = await conn.fetch(query, *params)
-
-        tabs = []
-        for row in rows:
-            raw_meta = row["raw_meta"] or {}
-            if isinstance(raw_meta, str):
-                raw_meta = json.loads(raw_meta)
-
-            tabs.append(TabDisplay(
-                id=row["id"],
-                url=row["url"],
-                page_title=row["page_title"],
-                window_label=row["window_label"],
-                status=row["status"],
-                is_processed=row["is_processed"],
-                processed_at=row["processed_at"],
-                created_at=row["created_at"],
-                site_kind=row["site_kind"],
-                word_count=row["word_count"],
-                video_seconds=row["video_seconds"],
-                summary=row["summary"],
-                content_type=row["content_type"],
-                est_read_min=row["est_read_min"],
-                priority=row["priority"],
-                tags=raw_meta.get("tags", []),
-                projects=raw_meta.get("projects", []),
-            ))
+            rows = await conn.fetch(page_query, *params)
+
+        total = await self._count_tabs(user_id, signature, filter_params, count_query)
+        # A cached total can lag behind rows added since it was counted
+        total = max(total, skipped + len(rows))
+
+        tabs = [_row_to_tab_display(row) for row in rows]
 
         total_pages = (total + filters.per_page - 1) // filters.per_page
+        next_cursor = (rows[-1]["created_at"], rows[-1]["id"]) if rows else None
 
         return TabListResponse(
             tabs=tabs,
@@ -180,134 +464,131 @@ class Database:
             total_pages=total_pages,
             has_next=filters.page < total_pages,
             has_prev=filters.page > 1,
+            next_cursor=next_cursor,
         )
 
+    async def _count_tabs(
+        self,
+        user_id: str,
+        signature: tuple[str, ...],
+        filter_params: list,
+        count_query: str,
+    ) -> int:
+        """
+        Count the tabs matching get_tabs' filters.
+
+        Unfiltered and processed-only totals are read from the cached
+        filter options; other filter combinations are counted once and
+        cached for the TTL.
+        """
+        if not signature:
+            return (await self.get_filter_options(user_id))["total"]
+        if signature == ("is_processed",):
+            options = await self.get_filter_options(user_id)
+            return options["processed" if filter_params[1] else "unprocessed"]
+
+        # Taken before the query: an invalidation while it runs drops this
+        # dict, so the stale count isn't kept
+        counts = self._count_cache.setdefault(user_id, {})
+        key = (signature, *filter_params[1:])
+        total = counts.get(key)
+        if total is None:
+            async with self.connection() as conn:
+                total = await conn.fetchval(count_query, *filter_params)
+            counts[key] = total
+        return total
+
     async def toggle_processed(self, user_id: str, tab_id: int) -> Optional[TabDisplay]:
         """Toggle the is_processed flag for a tab"""
-        query = """
-            UPDATE tab_item
-            SET
-                is_processed = NOT is_processed,
-                processed_at = CASE WHEN is_processed THEN NULL ELSE now() END,
-                updated_at = now()
-            WHERE id = $1 AND user_id = $2 AND deleted_at IS NULL
-            RETURNING id, is_processed, processed_at
-        """
+        tabs = await self.toggle_processed_many(user_id, [tab_id])
+        return tabs[0] if tabs else None
 
-        log_query = """
-            INSERT INTO event_log (user_id, event_type, entity_type, entity_id, details)
-            VALUES ($1, $2, 'tab_item', $3, '{"source": "web_ui"}'::jsonb)
+    async def toggle_processed_many(self, user_id: str, tab_ids: list[int]) -> list[TabDisplay]:
         """
+        Toggle the is_processed flag for several tabs in one round trip.
 
+        Returns the updated tabs; IDs that don't exist or belong to
+        another user are left out. The full display columns are needed
+        because the caller re-renders the whole tab row (summary, tags,
+        content type, read time).
+        """
         async with self.connection() as conn:
-            row = await conn.fetchrow(query, tab_id, user_id)
-            if row:
-                event_type = "tab_processed" if row["is_processed"] else "tab_unprocessed"
-                await conn.execute(log_query, user_id, event_type, tab_id)
+            rows = await conn.fetch(TOGGLE_PROCESSED_SQL, tab_ids, user_id)
 
-                # Fetch full tab data
-                return await self.get_tab_by_id(user_id, tab_id)
+        if rows:
+            # Processed/unprocessed counts changed
+            self._invalidate_filter_options(user_id)
 
-        return None
+        return [_row_to_tab_display(row) for row in rows]
 
     async def get_tab_by_id(self, user_id: str, tab_id: int) -> Optional[TabDisplay]:
         """Get a single tab by ID"""
-        query = """
-            SELECT
-                t.id,
-                t.url,
-                t.page_title,
-                t.window_label,
-                t.status,
-                t.is_processed,
-                t.processed_at,
-                t.created_at,
-                p.site_kind,
-                p.word_count,
-                p.video_seconds,
-                e.summary,
-                e.content_type,
-                e.est_read_min,
-                e.priority,
-                e.raw_meta
-            FROM tab_item t
-            LEFT JOIN tab_parsed p ON t.id = p.tab_id
-            LEFT JOIN tab_enrichment e ON t.id = e.tab_id
-            WHERE t.id = $1 AND t.user_id = $2 AND t.deleted_at IS NULL
-        """
+        tabs = await self.get_tabs_by_ids(user_id, [tab_id])
+        return tabs[0] if tabs else None
 
+    async def get_tabs_by_ids(self, user_id: str, tab_ids: list[int]) -> list[TabDisplay]:
+        """Get several tabs by ID in one query, newest first"""
         async with self.connection() as conn:
-            row = await conn.fetchrow(query, tab_id, user_id)
-
-        if not row:
-            return None
-
-        raw_meta = row["raw_meta"] or {}
-        if isinstance(raw_meta, str):
-            raw_meta = json.loads(raw_meta)
-
-        return TabDisplay(
-            id=row["id"],
-            url=row["url"],
-            page_title=row["page_title"],
-            window_label=row["window_label"],
-            status=row["status"],
-            is_processed=row["is_processed"],
-            processed_at=row["processed_at"],
-            created_at=row["created_at"],
-            site_kind=row["site_kind"],
-            word_count=row["word_count"],
-            video_seconds=row["video_seconds"],
-            summary=row["summary"],
-            content_type=row["content_type"],
-            est_read_min=row["est_read_min"],
-            priority=row["priority"],
-            tags=raw_meta.get("tags", []),
-            projects=raw_meta.get("projects", []),
-        )
+            rows = await conn.fetch(GET_TABS_BY_IDS_SQL, tab_ids, user_id)
+
+        return [_row_to_tab_display(row) for row in rows]
 
     async def get_tabs_for_export(self, user_id: str, tab_ids: list[int]) -> list[TabExport]:
         """Get tabs for export"""
+        return [tab async for tab in self.iter_tabs_for_export(user_id, tab_ids)]
+
+    async def iter_tabs_for_export(
+        self,
+        user_id: str,
+        tab_ids: list[int],
+    ) -> AsyncIterator[TabExport]:
+        """
+        Stream tabs for export through a server-side cursor.
+
+        Rows are fetched in batches, so large exports can be written out
+        as they arrive instead of being held in memory all at once.
+        """
         query = """
             SELECT
                 t.url,
                 t.page_title,
                 t.window_label,
-                t.created_at,
+                -- Formatted by Postgres so rows skip datetime decoding; same
+                -- output as datetime.isoformat() on the UTC datetime asyncpg
+                -- returns, which leaves out zero microseconds
+                to_char(
+                    t.created_at AT TIME ZONE 'UTC',
+                    CASE WHEN date_trunc('second', t.created_at) = t.created_at
+                        THEN 'YYYY-MM-DD"T"HH24:MI:SS"+00:00"'
+                        ELSE 'YYYY-MM-DD"T"HH24:MI:SS.US"+00:00"'
+                    END
+                ) AS created_at_iso,
                 e.summary,
                 e.content_type,
                 e.est_read_min,
                 e.priority,
-                e.raw_meta
+                e.tags,
+                e.projects
             FROM tab_item t
             LEFT JOIN tab_enrichment e ON t.id = e.tab_id
             WHERE t.id = ANY($1) AND t.user_id = $2 AND t.deleted_at IS NULL
             ORDER BY t.created_at DESC
         """
 
-        async with self.connection() as conn:
-            rows = await conn.fetch(query, tab_ids, user_id)
-
-        exports = []
-        for row in rows:
-            raw_meta = row["raw_meta"] or {}
-            if isinstance(raw_meta, str):
-                raw_meta = json.loads(raw_meta)
-
-            exports.append(TabExport(
-                url=row["url"],
-                title=row["page_title"],
-                summary=row["summary"],
-                content_type=row["content_type"],
-                tags=raw_meta.get("tags", []),
-                projects=raw_meta.get("projects", []),
-                est_read_min=row["est_read_min"],
-                priority=row["priority"],
-                window_label=row["window_label"],
-                created_at=row["created_at"].isoformat() if row["created_at"] else "",
-            ))
-
-        return exports
+        async with self.connection() as conn, conn.transaction():
+            async for row in conn.cursor(query, tab_ids, user_id, prefetch=EXPORT_PREFETCH):
+                yield TabExport(
+                    url=row["url"],
+                    title=row["page_title"],
+                    summary=row["summary"],
+                    content_type=row["content_type"],
+                    tags=row["tags"] or [],
+                    projects=row["projects"] or [],
+                    est_read_min=row["est_read_min"],
+                    priority=row["priority"],
+                    window_label=row["window_label"],
+                    created_at=row["created_at_iso"] or "",
+                )
 
     async def semantic_search(
         self,
@@ -326,64 +607,12 @@ class Database:
         Returns:
             List of TabDisplay sorted by similarity
         """
-        query = """
-            SELECT
-                t.id,
-                t.url,
-                t.page_title,
-                t.window_label,
-                t.status,
-                t.is_processed,
-                t.processed_at,
-                t.created_at,
-                p.site_kind,
-                p.word_count,
-                p.video_seconds,
-                e.summary,
-                e.content_type,
-                e.est_read_min,
-                e.priority,
-                e.raw_meta,
-                1 - (emb.embedding <=> $2::vector) as similarity
-            FROM tab_item t
-            LEFT JOIN tab_parsed p ON t.id = p.tab_id
-            LEFT JOIN tab_enrichment e ON t.id = e.tab_id
-            JOIN tab_embedding emb ON t.id = emb.tab_id
-            WHERE t.user_id = $1 AND t.deleted_at IS NULL
-            ORDER BY emb.embedding <=> $2::vector
-            LIMIT $3
-        """
+        embedding = np.asarray(query_embedding, dtype=np.float32)
+        async with self.connection() as conn, conn.transaction():
+            await conn.execute(self._semantic_search_settings_sql, limit)
+            rows = await conn.fetch(SEMANTIC_SEARCH_SQL, user_id, embedding, limit)
 
-        async with self.connection() as conn:
-            # Convert embedding list to string format for pgvector
-            embedding_str = "[" + ",".join(map(str, query_embedding)) + "]"
-            rows = await conn.fetch(query, user_id, embedding_str, limit)
-
-        tabs = []
-        for row in rows:
-            raw_meta = row["raw_meta"] or {}
-            if isinstance(raw_meta, str):
-                raw_meta = json.loads(raw_meta)
-
-            tabs.append(TabDisplay(
-                id=row["id"],
-                url=row["url"],
-                page_title=row["page_title"],
-                window_label=row["window_label"],
-                status=row["status"],
-                is_processed=row["is_processed"],
-                processed_at=row["processed_at"],
-                created_at=row["created_at"],
-                site_kind=row["site_kind"],
-                word_count=row["word_count"],
-                video_seconds=row["video_seconds"],
-                summary=row["summary"],
-                content_type=row["content_type"],
-                est_read_min=row["est_read_min"],
-                priority=row["priority"],
-                tags=raw_meta.get("tags", []),
-                projects=raw_meta.get("projects", []),
-            ))
+        tabs = [_row_to_tab_display(row) for row in rows]
 
         return tabs
 
@@ -415,55 +644,97 @@ class Database:
         model_name: str,
     ) -> None:
         """Save an embedding for a tab"""
-        query = """
-            INSERT INTO tab_embedding (tab_id, embedding, model_name)
-            VALUES ($1, $2::vector, $3)
-            ON CONFLICT (tab_id) DO UPDATE SET
-                embedding = EXCLUDED.embedding,
-                model_name = EXCLUDED.model_name,
-                updated_at = now()
-        """
+        await self.save_embeddings({tab_id: embedding}, model_name)
 
+    async def save_embeddings(
+        self,
+        embeddings: dict[int, list[float]],
+        model_name: str,
+    ) -> None:
+        """Save embeddings for several tabs in one transaction and round trip"""
+        if not embeddings:
+            return
         async with self.connection() as conn:
-            embedding_str = "[" + ",".join(map(str, embedding)) + "]"
-            await conn.execute(query, tab_id, embedding_str, model_name)
+            async with conn.transaction():
+                await conn.executemany(SAVE_EMBEDDING_SQL, [
+                    (tab_id, np.asarray(embedding, dtype=np.float32), model_name)
+                    for tab_id, embedding in embeddings.items()
+                ])
 
     async def get_filter_options(self, user_id: str) -> dict:
         """Get available filter options"""
+        cached = self._filter_cache.get(user_id)
+        if cached is not None:
+            return cached
+
+        # Concurrent misses for the same user (e.g. a burst of HTMX
+        # requests after the TTL expires) share one query
+        task = self._filter_inflight.get(user_id)
+        if task is None:
+            task = asyncio.ensure_future(
+                self._fetch_filter_options(user_id, self._filter_generation)
+            )
+            self._filter_inflight[user_id] = task
+            task.add_done_callback(lambda done: self._forget_inflight(user_id, done))
+        return await asyncio.shield(task)
+
+    def _invalidate_filter_options(self, user_id: str) -> None:
+        """Drop a user's cached filter options, tab counts and any query in flight"""
+        self._filter_generation += 1
+        self._filter_cache.pop(user_id, None)
+        self._count_cache.pop(user_id, None)
+        self._filter_inflight.pop(user_id, None)
+
+    def _forget_inflight(self, user_id: str, task: asyncio.Future) -> None:
+        """Remove a finished query, unless it was already replaced"""
+        if self._filter_inflight.get(user_id) is task:
+            del self._filter_inflight[user_id]
+
+    async def get_stats(self, user_id: str) -> dict[str, list[dict]]:
+        """
+        Get the stats page breakdowns: tab counts by status and content
+        type, and the latest events.
+
+        The queries are independent, so each runs on its own pooled
+        connection and the round trips overlap.
+        """
+        async def fetch(query: str) -> list[dict]:
+            async with self.connection() as conn:
+                return [dict(r) for r in await conn.fetch(query, user_id)]
+
+        results = await asyncio.gather(*(fetch(q) for q in STATS_SQL.values()))
+        return dict(zip(STATS_SQL, results))
+
+    async def refresh_stats(self) -> bool:
+        """
+        Refresh the stats page's materialized views.
+
+        Returns False if another worker was already refreshing them.
+        """
         async with self.connection() as conn:
-            # Get distinct statuses
-            statuses = await conn.fetch("""
-                SELECT DISTINCT status FROM tab_item
-                WHERE user_id = $1 AND deleted_at IS NULL
-                ORDER BY status
-            """, user_id)
-
-            # Get distinct content types
-            content_types = await conn.fetch("""
-                SELECT DISTINCT e.content_type
-                FROM tab_item t
-                JOIN tab_enrichment e ON t.id = e.tab_id
-                WHERE t.user_id = $1 AND t.deleted_at IS NULL AND e.content_type IS NOT NULL
-                ORDER BY e.content_type
-            """, user_id)
-
-            # Get counts
-            counts = await conn.fetchrow("""
-                SELECT
-                    COUNT(*) as total,
-                    COUNT(*) FILTER (WHERE is_processed) as processed,
-                    COUNT(*) FILTER (WHERE NOT is_processed) as unprocessed
-                FROM tab_item
-                WHERE user_id = $1 AND deleted_at IS NULL
-            """, user_id)
+            return await conn.fetchval("SELECT refresh_tab_stats()")
 
-        return {
-            "statuses": [r["status"] for r in statuses],
-            "content_types": [r["content_type"] for r in content_types],
-            "total": counts["total"],
-            "processed": counts["processed"],
-            "unprocessed": counts["unprocessed"],
-        }
+    async def _fetch_filter_options(self, user_id: str, generation: int) -> dict:
+        """
+        Query filter options and cache them for the TTL, unless the cache
+        was invalidated since generation was read
+        """
+        async with self.connection() as conn:
+            rows = await conn.fetch(FILTER_OPTIONS_SQL, user_id)
+
+        options = {"statuses": [], "content_types": [], "total": 0, "processed": 0}
+        for kind, value, n in rows:
+            if kind == "status":
+                options["statuses"].append(value)
+            elif kind == "content_type":
+                options["content_types"].append(value)
+            else:
+                options[kind] = n
+        # is_processed is NOT NULL, so everything else is unprocessed
+        options["unprocessed"] = options["total"] - options["processed"]
+        if generation == self._filter_generation:
+            self._filter_cache[user_id] = options
+        return options
 
 
 # Global database instance
@@ -4,20 +4,25 @@ TabBacklog v1 - Web UI Main Application
 FastAPI application with HTMX-powered interface.
 """
 
+import asyncio
 import logging
 import os
+import tempfile
 from contextlib import asynccontextmanager
 from pathlib import Path
 
 from fastapi import FastAPI, Request
-from fastapi.responses import HTMLResponse
-from fastapi.staticfiles import StaticFiles
+from fastapi.responses import HTMLResponse, ORJSONResponse
 from fastapi.templating import Jinja2Templates
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, select_autoescape
 
 from . import __version__
+from .conditional import cache_headers, make_etag, not_modified
+from .config import DEFAULT_USER_ID, ENABLE_BATCH_API, STATS_REFRESH_SECONDS, get_user_id
 from .db import init_database, close_database, get_database
 from .models import HealthResponse
-from .routes import tabs_router, export_router, search_router
+from .static_files import STATIC_DIR, CachedStaticFiles, preload_styles, static_url
+from .routes import tabs_router, export_router, search_router, batch_router
 
 # Configure logging
 logging.basicConfig(
@@ -29,22 +34,53 @@ logger = logging.getLogger(__name__)
 # Paths
 BASE_DIR = Path(__file__).parent
 TEMPLATES_DIR = BASE_DIR / "templates"
-STATIC_DIR = BASE_DIR / "static"
+# Compiled template bytecode, shared by all workers on the host
+TEMPLATE_CACHE_DIR = Path(
+    os.environ.get("TEMPLATE_CACHE_DIR", Path(tempfile.gettempdir()) / "tabbacklog-jinja")
+)
+
+
+async def refresh_stats_periodically(interval: float) -> None:
+    """Keep the stats page's materialized views fresh."""
+    db = get_database()
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await db.refresh_stats()
+        except Exception as e:
+            logger.warning(f"Stats refresh failed: {e}")
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan handler."""
     logger.info("Web UI starting...")
+    if not DEFAULT_USER_ID:
+        logger.warning("DEFAULT_USER_ID is not set; tab pages will return errors")
+
+    # Compile every template up front so no request pays for it
+    for name in templates.env.list_templates():
+        templates.env.get_template(name)
 
     # Initialize database
     await init_database()
     logger.info("Database connected")
 
+    refresh_task = None
+    if STATS_REFRESH_SECONDS > 0:
+        refresh_task = asyncio.create_task(refresh_stats_periodically(STATS_REFRESH_SECONDS))
+
     yield
 
     # Cleanup
+    if refresh_task:
+        refresh_task.cancel()
     await close_database()
+    try:
+        from shared.search import close_embedding_generator
+        await close_embedding_generator()
+    except ImportError:
+        pass  # Semantic search not available in this deployment
     logger.info("Web UI shutting down")
 
 
@@ -53,24 +89,32 @@ app = FastAPI(
     description="Web interface for managing browser tabs",
     version=__version__,
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # Mount static files
-app.mount("/static", StaticFiles(directory=STATIC_DIR), name="static")
-
-# Setup templates
-templates = Jinja2Templates(directory=TEMPLATES_DIR)
+app.mount("/static", CachedStaticFiles(directory=STATIC_DIR), name="static")
+
+# Setup templates. Templates only change on deploy, so skip the per-render
+# mtime check unless TEMPLATES_AUTO_RELOAD is set for development.
+TEMPLATE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+templates = Jinja2Templates(env=Environment(
+    loader=FileSystemLoader(TEMPLATES_DIR),
+    # HTML pages are escaped; the Markdown export templates (.md.j2) are not
+    autoescape=select_autoescape(("html",), default_for_string=True, default=False),
+    auto_reload=os.environ.get("TEMPLATES_AUTO_RELOAD", "").lower() in ("1", "true"),
+    bytecode_cache=FileSystemBytecodeCache(str(TEMPLATE_CACHE_DIR)),
+    cache_size=-1,
+))
+templates.env.globals["static_url"] = static_url
 app.state.templates = templates
 
 # Include routers
 app.include_router(tabs_router)
 app.include_router(export_router)
 app.include_router(search_router)
-
-
-def get_user_id() -> str:
-    """Get the default user ID from environment"""
-    return os.environ.get("DEFAULT_USER_ID", "")
+if ENABLE_BATCH_API:
+    app.include_router(batch_router)
 
 
 @app.get("/", response_class=HTMLResponse)
@@ -82,13 +126,15 @@ async def index(request: Request):
     # Get filter options
     filter_options = await db.get_filter_options(user_id)
 
-    return templates.TemplateResponse(
+    response = templates.TemplateResponse(
         "index.html",
         {
             "request": request,
             "filter_options": filter_options,
         },
     )
+    response.headers.update(preload_styles("css/style.css"))
+    return response
 
 
 @app.get("/health", response_model=HealthResponse)
@@ -107,6 +153,7 @@ async def health_check():
         status="healthy" if db_status == "connected" else "degraded",
         version=__version__,
         database=db_status,
+        pool=db.stats(),
     )
 
 
@@ -116,49 +163,40 @@ async def stats_page(request: Request):
     user_id = get_user_id()
     db = get_database()
 
-    # Get stats
-    filter_options = await db.get_filter_options(user_id)
+    filter_options, stats = await asyncio.gather(
+        db.get_filter_options(user_id),
+        db.get_stats(user_id),
+    )
+
+    # Skip rendering when the client's copy is still current
+    etag = make_etag([filter_options, stats])
+    if (response := not_modified(request, etag)) is not None:
+        return response
 
-    # Get status breakdown
-    async with db.connection() as conn:
-        status_counts = await conn.fetch("""
-            SELECT status, COUNT(*) as count
-            FROM tab_item
-            WHERE user_id = $1 AND deleted_at IS NULL
-            GROUP BY status
-            ORDER BY count DESC
-        """, user_id)
-
-        content_type_counts = await conn.fetch("""
-            SELECT e.content_type, COUNT(*) as count
-            FROM tab_item t
-            JOIN tab_enrichment e ON t.id = e.tab_id
-            WHERE t.user_id = $1 AND t.deleted_at IS NULL AND e.content_type IS NOT NULL
-            GROUP BY e.content_type
-            ORDER BY count DESC
-        """, user_id)
-
-        recent_events = await conn.fetch("""
-            SELECT event_type, entity_type, created_at
-            FROM event_log
-            WHERE user_id = $1
-            ORDER BY created_at DESC
-            LIMIT 10
-        """, user_id)
-
-    return templates.TemplateResponse(
+    response = templates.TemplateResponse(
         "stats.html",
         {
             "request": request,
             "filter_options": filter_options,
-            "status_counts": [dict(r) for r in status_counts],
-            "content_type_counts": [dict(r) for r in content_type_counts],
-            "recent_events": [dict(r) for r in recent_events],
+            **stats,
         },
     )
+    response.headers.update(cache_headers(etag))
+    response.headers.update(preload_styles("css/style.css"))
+    return response
 
 
 # Run with: uvicorn web_ui.main:app --host 0.0.0.0 --port 8000
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    uvicorn.run(
+        "web_ui.main:app",
+        host="0.0.0.0",
+        port=8000,
+        # Same worker count the database pool is sized for
+        workers=int(os.environ.get("WEB_CONCURRENCY", "1")),
+        loop="uvloop",
+        http="httptools",
+        proxy_headers=True,
+        access_log=False,
+    )
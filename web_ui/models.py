@@ -4,6 +4,7 @@ TabBacklog v1 - Web UI Pydantic Models
 Models for API requests/responses and data display.
 """
 
+from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Literal, Optional
 from pydantic import BaseModel, Field
@@ -19,10 +20,39 @@ class TabFilters(BaseModel):
     search: Optional[str] = Field(None, description="Search text (fuzzy)")
     page: int = Field(default=1, ge=1, description="Page number")
     per_page: int = Field(default=50, ge=1, le=200, description="Items per page")
-
-
-class TabDisplay(BaseModel):
-    """Tab data for display in the UI"""
+    cursor_created_at: Optional[datetime] = Field(None, description="created_at of the last row on the previous page")
+    cursor_id: Optional[int] = Field(None, description="ID of the last row on the previous page")
+
+
+# CSS classes for the status and content type badges
+STATUS_BADGE_CLASSES = {
+    "new": "badge-new",
+    "fetch_pending": "badge-pending",
+    "parsed": "badge-parsed",
+    "llm_pending": "badge-pending",
+    "enriched": "badge-success",
+    "fetch_error": "badge-error",
+    "llm_error": "badge-error",
+}
+
+CONTENT_TYPE_BADGE_CLASSES = {
+    "article": "type-article",
+    "video": "type-video",
+    "paper": "type-paper",
+    "code_repo": "type-code",
+    "reference": "type-reference",
+    "misc": "type-misc",
+}
+
+
+@dataclass(slots=True)
+class TabDisplay:
+    """
+    Tab data for display in the UI.
+
+    A plain dataclass rather than a model: it is only ever built from
+    database rows, so there is nothing to validate.
+    """
     id: int
     url: str
     page_title: Optional[str]
@@ -42,8 +72,8 @@ class TabDisplay(BaseModel):
     content_type: Optional[str] = None
     est_read_min: Optional[int] = None
     priority: Optional[str] = None
-    tags: list[str] = Field(default_factory=list)
-    projects: list[str] = Field(default_factory=list)
+    tags: list[str] = field(default_factory=list)
+    projects: list[str] = field(default_factory=list)
 
     @property
     def display_title(self) -> str:
@@ -53,29 +83,12 @@ class TabDisplay(BaseModel):
     @property
     def status_badge_class(self) -> str:
         """CSS class for status badge"""
-        status_classes = {
-            "new": "badge-new",
-            "fetch_pending": "badge-pending",
-            "parsed": "badge-parsed",
-            "llm_pending": "badge-pending",
-            "enriched": "badge-success",
-            "fetch_error": "badge-error",
-            "llm_error": "badge-error",
-        }
-        return status_classes.get(self.status, "badge-default")
+        return STATUS_BADGE_CLASSES.get(self.status, "badge-default")
 
     @property
     def content_type_badge_class(self) -> str:
         """CSS class for content type badge"""
-        type_classes = {
-            "article": "type-article",
-            "video": "type-video",
-            "paper": "type-paper",
-            "code_repo": "type-code",
-            "reference": "type-reference",
-            "misc": "type-misc",
-        }
-        return type_classes.get(self.content_type or "", "type-default")
+        return CONTENT_TYPE_BADGE_CLASSES.get(self.content_type or "", "type-default")
 
     @property
     def read_time_display(self) -> str:
@@ -101,6 +114,13 @@ class TabListResponse(BaseModel):
     total_pages: int
     has_next: bool
     has_prev: bool
+    # (created_at, id) of the last row, for fetching the next page by keyset
+    next_cursor: Optional[tuple[datetime, int]] = None
+
+
+class BulkToggleRequest(BaseModel):
+    """Request for toggling the processed flag of several tabs"""
+    tab_ids: list[int] = Field(..., min_length=1, description="IDs of tabs to toggle")
 
 
 class ExportRequest(BaseModel):
@@ -153,8 +173,29 @@ class TabExport(BaseModel):
         return "\n".join(lines)
 
 
+class BatchRequestItem(BaseModel):
+    """One read-only request inside a batch request"""
+    path: str = Field(..., pattern=r"^/", description="Path (with optional query) on this server")
+    method: Literal["GET"] = "GET"
+
+
+class BatchResponseItem(BaseModel):
+    """Result of one request inside a batch request"""
+    path: str
+    status: int
+    content_type: Optional[str] = None
+
+
+class PoolStats(BaseModel):
+    """Database connection pool usage"""
+    size: int
+    idle: int
+    max: int
+
+
 class HealthResponse(BaseModel):
     """Health check response"""
     status: str
     version: str
     database: str
+    pool: Optional[PoolStats] = None
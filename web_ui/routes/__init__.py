@@ -5,5 +5,6 @@ TabBacklog v1 - Web UI Routes
 from .tabs import router as tabs_router
 from .export import router as export_router
 from .search import router as search_router
+from .batch import router as batch_router
 
-__all__ = ["tabs_router", "export_router", "search_router"]
+__all__ = ["tabs_router", "export_router", "search_router", "batch_router"]
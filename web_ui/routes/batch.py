@@ -0,0 +1,51 @@
+"""
+TabBacklog v1 - Batch Routes
+
+Route for running several read-only requests in one round trip.
+"""
+
+import asyncio
+import logging
+
+import httpx
+from fastapi import APIRouter, HTTPException, Request
+
+from ..models import BatchRequestItem, BatchResponseItem
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api", tags=["Batch"])
+
+# Most sub-requests accepted in one batch
+MAX_BATCH_REQUESTS = 50
+
+
+@router.post("/batch", response_model=list[BatchResponseItem])
+async def batch(request: Request, items: list[BatchRequestItem]):
+    """
+    Run several GET requests against this app concurrently.
+
+    Each sub-request is dispatched in-process through the ASGI app, so no
+    extra connections are opened. Returns the status and content type of
+    each sub-request, in request order; a sub-request that raises gets
+    status 500 without failing the rest of the batch.
+    """
+    if len(items) > MAX_BATCH_REQUESTS:
+        raise HTTPException(400, f"At most {MAX_BATCH_REQUESTS} requests per batch")
+
+    transport = httpx.ASGITransport(app=request.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://batch") as client:
+
+        async def run(item: BatchRequestItem) -> BatchResponseItem:
+            try:
+                response = await client.request(item.method, item.path)
+            except Exception as e:
+                logger.exception(f"Batch sub-request {item.method} {item.path} failed: {e}")
+                return BatchResponseItem(path=item.path, status=500)
+            return BatchResponseItem(
+                path=item.path,
+                status=response.status_code,
+                content_type=response.headers.get("content-type"),
+            )
+
+        return await asyncio.gather(*(run(item) for item in items))
@@ -4,24 +4,22 @@ TabBacklog v1 - Export Routes
 Routes for exporting tabs to various formats.
 """
 
-import os
 from datetime import datetime
+from functools import lru_cache
+from typing import AsyncIterator
 
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import JSONResponse, Response
+import orjson
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
 
+from ..config import get_user_id
 from ..db import get_database
-from ..models import ExportRequest
+from ..models import ExportRequest, TabExport
 
 router = APIRouter(prefix="/export", tags=["Export"])
 
-
-def get_user_id() -> str:
-    """Get the default user ID from environment"""
-    user_id = os.environ.get("DEFAULT_USER_ID")
-    if not user_id:
-        raise HTTPException(500, "DEFAULT_USER_ID not configured")
-    return user_id
+# Template output events joined into each streamed chunk
+EXPORT_RENDER_BUFFER = 64
 
 
 @router.post("/json")
@@ -29,29 +27,79 @@ async def export_json(request: ExportRequest):
     """
     Export selected tabs as JSON.
 
-    Returns JSON array of tab data.
+    Returns JSON array of tab data, streamed as rows come off the cursor.
     """
     user_id = get_user_id()
     db = get_database()
 
-    tabs = await db.get_tabs_for_export(user_id, request.tab_ids)
+    tabs = db.iter_tabs_for_export(user_id, request.tab_ids)
 
-    if not tabs:
+    # Pull the first tab before responding so an empty export can still 404
+    first = await anext(tabs, None)
+    if first is None:
         raise HTTPException(404, "No tabs found")
 
-    # Convert to JSON-serializable format
-    data = [tab.model_dump() for tab in tabs]
-
-    return JSONResponse(
-        content=data,
+    async def stream() -> AsyncIterator[bytes]:
+        try:
+            yield b"[" + orjson.dumps(first.model_dump())
+            async for tab in tabs:
+                yield b"," + orjson.dumps(tab.model_dump())
+            yield b"]"
+        finally:
+            # Release the cursor's connection even if the client goes away
+            await tabs.aclose()
+
+    return StreamingResponse(
+        stream(),
+        media_type="application/json",
         headers={
             "Content-Disposition": f'attachment; filename="tabs_export_{datetime.now().strftime("%Y%m%d_%H%M%S")}.json"'
         },
     )
 
 
+@lru_cache(maxsize=2048)
+def _clean_tag(tag: str) -> str:
+    """Turn a tag name into an Obsidian #tag (tags repeat across tabs)"""
+    return "#" + tag.lstrip("#").replace(" ", "-")
+
+
+def _inline_tags(tab: TabExport) -> str:
+    """Obsidian inline tags for a tab's type, priority and first five tags"""
+    parts = []
+    if tab.content_type:
+        parts.append(f"#type/{tab.content_type}")
+    if tab.priority:
+        parts.append(f"#priority/{tab.priority}")
+    parts.extend(_clean_tag(tag) for tag in tab.tags[:5])
+    return " ".join(parts)
+
+
+def _render_export(
+    request: Request,
+    template_name: str,
+    filename: str,
+    **context,
+) -> StreamingResponse:
+    """Stream a Markdown export template as a file download."""
+    template = request.app.state.templates.get_template(template_name)
+    chunks = template.stream(**context)
+    chunks.enable_buffering(EXPORT_RENDER_BUFFER)
+
+    async def stream() -> AsyncIterator[str]:
+        # Rendering is CPU-only, so iterate inline rather than in a thread
+        for chunk in chunks:
+            yield chunk
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/markdown",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
 @router.post("/markdown")
-async def export_markdown(request: ExportRequest):
+async def export_markdown(request: Request, export_request: ExportRequest):
     """
     Export selected tabs as Markdown.
 
@@ -60,38 +108,23 @@ async def export_markdown(request: ExportRequest):
     user_id = get_user_id()
     db = get_database()
 
-    tabs = await db.get_tabs_for_export(user_id, request.tab_ids)
+    tabs = await db.get_tabs_for_export(user_id, export_request.tab_ids)
 
     if not tabs:
         raise HTTPException(404, "No tabs found")
 
-    # Build markdown content
-    lines = [
-        "# TabBacklog Export",
-        "",
-        f"*Exported: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}*",
-        f"*Total: {len(tabs)} tabs*",
-        "",
-        "---",
-        "",
-    ]
-
-    for tab in tabs:
-        lines.append(tab.to_markdown())
-
-    content = "\n".join(lines)
-
-    return Response(
-        content=content,
-        media_type="text/markdown",
-        headers={
-            "Content-Disposition": f'attachment; filename="tabs_export_{datetime.now().strftime("%Y%m%d_%H%M%S")}.md"'
-        },
+    now = datetime.now()
+    return _render_export(
+        request,
+        "export/markdown.md.j2",
+        f"tabs_export_{now.strftime('%Y%m%d_%H%M%S')}.md",
+        tabs=tabs,
+        exported=now.strftime("%Y-%m-%d %H:%M:%S"),
     )
 
 
 @router.post("/obsidian")
-async def export_obsidian(request: ExportRequest):
+async def export_obsidian(request: Request, export_request: ExportRequest):
     """
     Export selected tabs in Obsidian-compatible format.
 
@@ -100,59 +133,17 @@ async def export_obsidian(request: ExportRequest):
     user_id = get_user_id()
     db = get_database()
 
-    tabs = await db.get_tabs_for_export(user_id, request.tab_ids)
+    tabs = await db.get_tabs_for_export(user_id, export_request.tab_ids)
 
     if not tabs:
         raise HTTPException(404, "No tabs found")
 
-    # Build Obsidian-style markdown with frontmatter
-    lines = [
-        "---",
-        "type: reading-list",
-        f"exported: {datetime.now().isoformat()}",
-        f"count: {len(tabs)}",
-        "---",
-        "",
-        "# Reading List Export",
-        "",
-    ]
-
-    for tab in tabs:
-        # Create individual note format
-        lines.append(f"## [{tab.title or 'Untitled'}]({tab.url})")
-        lines.append("")
-
-        if tab.summary:
-            lines.append(f"> {tab.summary}")
-            lines.append("")
-
-        # Metadata as inline tags
-        metadata_parts = []
-        if tab.content_type:
-            metadata_parts.append(f"#type/{tab.content_type}")
-        if tab.priority:
-            metadata_parts.append(f"#priority/{tab.priority}")
-        for tag in tab.tags[:5]:  # Limit tags
-            clean_tag = tag.lstrip("#").replace(" ", "-")
-            metadata_parts.append(f"#{clean_tag}")
-
-        if metadata_parts:
-            lines.append(" ".join(metadata_parts))
-            lines.append("")
-
-        if tab.est_read_min:
-            lines.append(f"⏱️ {tab.est_read_min} min")
-            lines.append("")
-
-        lines.append("---")
-        lines.append("")
-
-    content = "\n".join(lines)
-
-    return Response(
-        content=content,
-        media_type="text/markdown",
-        headers={
-            "Content-Disposition": f'attachment; filename="obsidian_export_{datetime.now().strftime("%Y%m%d_%H%M%S")}.md"'
-        },
+    now = datetime.now()
+    return _render_export(
+        request,
+        "export/obsidian.md.j2",
+        f"obsidian_export_{now.strftime('%Y%m%d_%H%M%S')}.md",
+        tabs=tabs,
+        exported=now.isoformat(),
+        inline_tags=_inline_tags,
     )
@@ -4,13 +4,14 @@ TabBacklog v1 - Search Routes
 Routes for fuzzy and semantic search functionality.
 """
 
-import os
+import asyncio
 import logging
 from typing import Optional
 
 from fastapi import APIRouter, Request, HTTPException, Query, BackgroundTasks
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.responses import HTMLResponse, ORJSONResponse
 
+from ..config import get_user_id
 from ..db import get_database
 from ..models import TabFilters
 
@@ -19,14 +20,6 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/search", tags=["Search"])
 
 
-def get_user_id() -> str:
-    """Get the default user ID from environment"""
-    user_id = os.environ.get("DEFAULT_USER_ID")
-    if not user_id:
-        raise HTTPException(500, "DEFAULT_USER_ID not configured")
-    return user_id
-
-
 @router.get("/semantic", response_class=HTMLResponse)
 async def semantic_search(
     request: Request,
@@ -43,14 +36,12 @@ async def semantic_search(
 
     try:
         # Import here to avoid circular imports
-        from shared.search import EmbeddingGenerator, SearchService
+        from shared.search import SearchService, get_embedding_generator
 
         # Generate query embedding
-        generator = EmbeddingGenerator()
-        search_service = SearchService(generator)
+        search_service = SearchService(get_embedding_generator())
 
         query_embedding = await search_service.generate_query_embedding(q)
-        await generator.close()
 
         # Search using vector similarity
         tabs = await db.semantic_search(user_id, query_embedding, limit)
@@ -92,7 +83,7 @@ async def generate_embeddings(
 
     background_tasks.add_task(generate_embeddings_task, user_id, batch_size)
 
-    return JSONResponse({
+    return ORJSONResponse({
         "status": "started",
         "message": f"Generating embeddings for up to {batch_size} tabs",
     })
@@ -101,10 +92,10 @@ async def generate_embeddings(
 async def generate_embeddings_task(user_id: str, batch_size: int):
     """Background task to generate embeddings"""
     try:
-        from shared.search import EmbeddingGenerator, SearchService
+        from shared.search import SearchService, get_embedding_generator
 
         db = get_database()
-        generator = EmbeddingGenerator()
+        generator = get_embedding_generator()
         search_service = SearchService(generator)
 
         # Get tabs without embeddings
@@ -116,28 +107,34 @@ async def generate_embeddings_task(user_id: str, batch_size: int):
 
         logger.info(f"Generating embeddings for {len(tabs)} tabs")
 
-        for tab in tabs:
-            try:
-                embedding = await search_service.generate_document_embedding(
+        # Request all embeddings at once so the generator batches them
+        embeddings = await asyncio.gather(
+            *(
+                search_service.generate_document_embedding(
                     title=tab.get("page_title"),
                     summary=tab.get("summary"),
                     text=tab.get("text_full"),
                 )
+                for tab in tabs
+            ),
+            return_exceptions=True,
+        )
 
-                await db.save_embedding(
-                    tab_id=tab["id"],
-                    embedding=embedding,
-                    model_name=generator.model_name,
-                )
-
-                logger.info(f"Generated embedding for tab {tab['id']}")
-
-            except Exception as e:
-                logger.warning(f"Failed to generate embedding for tab {tab['id']}: {e}")
+        generated = {}
+        for tab, embedding in zip(tabs, embeddings):
+            if isinstance(embedding, Exception):
+                logger.warning(f"Failed to generate embedding for tab {tab['id']}: {embedding}")
                 continue
+            generated[tab["id"]] = embedding
+
+        # Write them all in one round trip
+        try:
+            await db.save_embeddings(generated, generator.model_name)
+        except Exception as e:
+            logger.warning(f"Failed to save {len(generated)} embeddings: {e}")
+            return
 
-        await generator.close()
-        logger.info(f"Embedding generation complete for {len(tabs)} tabs")
+        logger.info(f"Embedding generation complete: saved {len(generated)} of {len(tabs)} tabs")
 
     except Exception as e:
         logger.exception(f"Embedding generation task failed: {e}")
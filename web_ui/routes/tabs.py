@@ -4,26 +4,20 @@ TabBacklog v1 - Tabs Routes
 Routes for tab listing, filtering, and management.
 """
 
-import os
+from datetime import datetime
 from typing import Optional
 
 from fastapi import APIRouter, Request, HTTPException, Query
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, ORJSONResponse
 
+from ..conditional import cache_headers, make_etag, not_modified
+from ..config import get_user_id
 from ..db import get_database
-from ..models import TabFilters
+from ..models import BulkToggleRequest, TabFilters
 
 router = APIRouter(tags=["Tabs"])
 
 
-def get_user_id() -> str:
-    """Get the default user ID from environment"""
-    user_id = os.environ.get("DEFAULT_USER_ID")
-    if not user_id:
-        raise HTTPException(500, "DEFAULT_USER_ID not configured")
-    return user_id
-
-
 @router.get("/tabs", response_class=HTMLResponse)
 async def get_tabs(
     request: Request,
@@ -35,11 +29,14 @@ async def get_tabs(
     search: Optional[str] = Query(None),
     page: int = Query(1, ge=1),
     per_page: int = Query(50, ge=1, le=200),
+    cursor_created_at: Optional[datetime] = Query(None),
+    cursor_id: Optional[int] = Query(None),
 ):
     """
     Get filtered tabs list as HTMX fragment.
 
-    Returns HTML tbody with tab rows for HTMX swap.
+    Returns HTML tbody with tab rows for HTMX swap. The Next button sends
+    the last row's created_at/id as a cursor so the page is found by keyset.
     """
     user_id = get_user_id()
     db = get_database()
@@ -53,6 +50,8 @@ async def get_tabs(
         search=search,
         page=page,
         per_page=per_page,
+        cursor_created_at=cursor_created_at,
+        cursor_id=cursor_id,
     )
 
     result = await db.get_tabs(user_id, filters)
@@ -68,6 +67,7 @@ async def get_tabs(
             "total_pages": result.total_pages,
             "has_next": result.has_next,
             "has_prev": result.has_prev,
+            "next_cursor": result.next_cursor,
             "filters": filters,
         },
     )
@@ -100,6 +100,33 @@ async def toggle_processed(
     )
 
 
+@router.post("/tabs/bulk_toggle", response_class=HTMLResponse)
+async def bulk_toggle_processed(
+    request: Request,
+    toggle_request: BulkToggleRequest,
+):
+    """
+    Toggle the processed status of several tabs in one round trip.
+
+    Returns the updated rows' HTML; the page swaps each in by ID.
+    """
+    user_id = get_user_id()
+    db = get_database()
+
+    tabs = await db.toggle_processed_many(user_id, toggle_request.tab_ids)
+    if not tabs:
+        raise HTTPException(404, "No tabs found")
+
+    templates = request.app.state.templates
+    return templates.TemplateResponse(
+        "fragments/tab_row_list.html",
+        {
+            "request": request,
+            "tabs": tabs,
+        },
+    )
+
+
 @router.get("/tabs/{tab_id}", response_class=HTMLResponse)
 async def get_tab_detail(
     request: Request,
@@ -127,15 +154,20 @@ async def get_tab_detail(
     )
 
 
-@router.get("/filters", response_class=HTMLResponse)
+@router.get("/filters")
 async def get_filter_options(request: Request):
     """
     Get available filter options.
 
-    Returns JSON with filter option values.
+    Returns JSON with filter option values, or 304 if the client's
+    ETag still matches.
     """
     user_id = get_user_id()
     db = get_database()
 
     options = await db.get_filter_options(user_id)
-    return options
+
+    etag = make_etag(options)
+    if (response := not_modified(request, etag)) is not None:
+        return response
+    return ORJSONResponse(options, headers=cache_headers(etag))
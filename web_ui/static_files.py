@@ -0,0 +1,54 @@
+"""
+TabBacklog v1 - Static Files
+
+Static assets are linked with a content hash in the query string
+(/static/css/style.css?v=1a2b3c4d), so a changed file gets a new URL and
+the versioned URL can be cached by browsers for good.
+"""
+
+import hashlib
+import os
+from functools import lru_cache
+from pathlib import Path
+
+from fastapi.staticfiles import StaticFiles
+from starlette.responses import Response
+from starlette.types import Scope
+
+STATIC_DIR = Path(__file__).resolve().parent / "static"
+
+# Versioned URLs never change content, so they can be cached for a year
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+# Unversioned URLs are revalidated with ETag / Last-Modified
+REVALIDATE_CACHE_CONTROL = "public, no-cache"
+
+
+@lru_cache(maxsize=None)
+def static_url(path: str) -> str:
+    """Get the versioned URL of a file under static/ (hashed once per process)."""
+    digest = hashlib.blake2b((STATIC_DIR / path).read_bytes(), digest_size=4).hexdigest()
+    return f"/static/{path}?v={digest}"
+
+
+class CachedStaticFiles(StaticFiles):
+    """StaticFiles that marks versioned URLs as immutable"""
+
+    def file_response(
+        self,
+        full_path: str | os.PathLike,
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        response = super().file_response(full_path, stat_result, scope, status_code)
+        versioned = b"v=" in scope.get("query_string", b"")
+        response.headers["Cache-Control"] = (
+            IMMUTABLE_CACHE_CONTROL if versioned else REVALIDATE_CACHE_CONTROL
+        )
+        return response
+
+
+def preload_styles(*paths: str) -> dict[str, str]:
+    """Link header asking the browser to fetch stylesheets early."""
+    links = ", ".join(f"<{static_url(path)}>; rel=preload; as=style" for path in paths)
+    return {"Link": links}